@@ -10,6 +10,7 @@ from datetime import timedelta  # ✅ добавляем для SIMPLE_JWT
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+
 # ======================================================
 # ⚙️ Основные настройки проекта
 # ======================================================
@@ -134,15 +135,36 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWT + процессный LRU-кэш пользователей вместо запроса в auth_user на каждый запрос
+        "accounts.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    # Keyset-пагинация по (created_at, id): без OFFSET и без COUNT(*)
+    "DEFAULT_PAGINATION_CLASS": "tasks.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": 50,
+    # Token bucket в разделяемой памяти (accounts/throttling.py): throttle_scope — все методы,
+    # write_throttle_scope — только POST/PUT/PATCH/DELETE; ключ — пользователь или IP
+    "DEFAULT_THROTTLE_CLASSES": [
+        "accounts.throttling.TokenBucketThrottle",
+        "accounts.throttling.WriteTokenBucketThrottle",
+    ],
+    "DEFAULT_THROTTLE_RATES": {
+        "login": "10/min",  # ёмкость ведра / пополнение за период
+        "register": "5/min",
+        "token_refresh": "30/min",
+        "tasks_write": "120/min",
+        "export": "10/hour",  # полная выгрузка базы (/api/export/)
+    },
 }
 
+# Таблица вёдер — файл во временном каталоге (manager_task_throttle.bin), общий для воркеров хоста;
+# ACCOUNTS_THROTTLE_FILE = None — своя таблица в памяти каждого процесса
+ACCOUNTS_THROTTLE_SLOTS = 65536  # вёдер в таблице (24 байта на ведро)
+
 # ======================================================
 # 🔐 SIMPLE_JWT — токены, ротация, blacklist
 # ======================================================
@@ -157,6 +179,19 @@ SIMPLE_JWT = {
     # "SIGNING_KEY": SECRET_KEY,  # можно явно указать, обычно не нужно
 }
 
+# Кэш пользователей для accounts.authentication.CachedJWTAuthentication
+ACCOUNTS_USER_CACHE_SIZE = 1024  # записей (user_id, token_version) на процесс
+ACCOUNTS_USER_CACHE_TTL = 300  # сек.; страховка поверх сброса сигналами
+ACCOUNTS_USER_CACHE = "default"  # общая версия кэша для нескольких воркеров
+ACCOUNTS_USER_CACHE_CHECK_INTERVAL = 1.0
+
+# Множество отозванных jti для /auth/refresh/ (accounts.blacklist.blacklist_registry)
+ACCOUNTS_BLACKLIST_SYNC_INTERVAL = 1.0  # сек. между дочитываниями новых строк BlacklistedToken
+ACCOUNTS_BLACKLIST_PRUNE_INTERVAL = 3600  # сек. между чистками истёкших jti из памяти
+
+# Потоков для PBKDF2 в AsyncLoginView (/api/auth/login/async/); None — по числу ядер
+ACCOUNTS_PASSWORD_HASH_WORKERS = None
+
 # ======================================================
 # 🍪 Настройки JWT Cookies
 # ======================================================
@@ -166,3 +201,60 @@ JWT_REFRESH_COOKIE = "refresh_token"
 JWT_COOKIE_SECURE = False
 JWT_COOKIE_SAMESITE = "Lax"
 JWT_COOKIE_HTTPONLY = True
+
+# ======================================================
+# 🗄 Кэши
+# ======================================================
+
+# Для нескольких воркеров замените locmem на общий бэкенд (Redis/Memcached):
+# тогда и поколения кэша ответов, и версия реестра статусов будут общими
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Ответы /api/tasks/, /api/subtasks/, /api/stats/ (tasks/response_cache.py)
+    "responses": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tasks-responses",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+TASKS_RESPONSE_CACHE = "responses"
+TASKS_RESPONSE_CACHE_TIMEOUT = 300  # списки: сбрасываются записью, TTL — страховка
+TASKS_STATS_CACHE_TIMEOUT = 30  # статистика: просроченные зависят от времени
+TASKS_TIMELINE_CACHE_TIMEOUT = 86400  # закрытые интервалы таймлайна: сбрасываются только записью в прошлое
+
+# ======================================================
+# 🗂 Реестр статусов (tasks/status_registry.py)
+# ======================================================
+
+# Версия реестра хранится в этом кэше: для нескольких воркеров он должен быть общим (Redis/Memcached),
+# иначе изменения Status увидит только процесс, который их сделал
+TASKS_STATUS_REGISTRY_CACHE = "default"
+# Как часто (в секундах) воркер сверяет свою версию реестра с общей
+TASKS_STATUS_REGISTRY_CHECK_INTERVAL = 1.0
+
+# ======================================================
+# ⏰ Планировщик дедлайнов (tasks/deadlines.py, python manage.py run_deadline_scheduler)
+# ======================================================
+
+TASKS_DEADLINE_REMINDER_LEAD = 3600  # напоминание в outbox DeadlineEvent за столько секунд до дедлайна
+TASKS_DEADLINE_POLL_INTERVAL = 5.0  # максимум сна воркера: с такой задержкой он видит новые дедлайны
+TASKS_DEADLINE_JOURNAL_MAX_ROWS = 100_000  # столько последних записей DeadlineChange хранится без воркера
+
+# ======================================================
+# 📘 OpenAPI-схема (tasks/openapi.py)
+# ======================================================
+
+# Схема генерируется при деплое: python manage.py generate_openapi_schema
+SWAGGER_SCHEMA_DIR = BASE_DIR / "openapi"
+SWAGGER_SCHEMA_MAX_AGE = 3600  # Cache-Control для /swagger.json, /swagger.yaml
+
+# Swagger UI/ReDoc забирают готовую схему, а не генерируют её через ?format=openapi
+SWAGGER_SETTINGS = {
+    "SPEC_URL": "/swagger.json",
+}
+REDOC_SETTINGS = {
+    "SPEC_URL": "/swagger.json",
+}
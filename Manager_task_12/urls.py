@@ -2,17 +2,13 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from django.http import HttpResponse
 
+from tasks.openapi import API_INFO, PrecomputedSchemaView
+
 # Swagger схема
 schema_view = get_schema_view(
-    openapi.Info(
-        title="Task Manager API",
-        default_version="v1",
-        description="Документация для проекта Менеджер задач",
-        contact=openapi.Contact(email="support@example.com"),
-    ),
+    API_INFO,
     public=True,
     permission_classes=[permissions.AllowAny],
 )
@@ -26,8 +22,12 @@ urlpatterns = [
     path("api/auth/", include("accounts.urls")),  # ✅ регистрация/логин/логаут
     path("ping/", ping),
 
-    # Swagger / Redoc
-    re_path(r"^swagger(?P<format>\.json|\.yaml)$", schema_view.without_ui(cache_timeout=0), name="schema-json"),
+    # Swagger / Redoc: схема — готовый файл (generate_openapi_schema), UI берёт её по SPEC_URL
+    re_path(
+        r"^swagger(?P<format>\.json|\.yaml)$",
+        PrecomputedSchemaView.as_view(live_view=schema_view.without_ui(cache_timeout=0)),
+        name="schema-json",
+    ),
     path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
     path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
 ]
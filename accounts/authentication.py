@@ -0,0 +1,126 @@
+# accounts/authentication.py
+"""
+JWT-аутентификация без запроса к auth_user на каждый запрос.
+
+Пользователь берётся из процессного LRU-кэша с TTL по ключу (user_id, token_version):
+в кэш он попадает после одной загрузки из БД, в которой заодно проверяется, что
+token_version токена совпадает с текущей (accounts/tokens.py) и пользователь активен.
+
+Смена пароля или деактивация меняют token_version — старые токены больше не совпадают
+с кэшем и не проходят проверку при загрузке. Сигнал post_save User (accounts/signals.py)
+вытесняет записи пользователя в этом процессе и увеличивает общую версию кэша
+(ACCOUNTS_USER_CACHE) — остальные воркеры сверяют её не чаще раза в
+ACCOUNTS_USER_CACHE_CHECK_INTERVAL секунд и очищают свой кэш целиком.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import TOKEN_VERSION_CLAIM, token_version
+
+VERSION_KEY = "accounts:user_cache:version"
+
+
+class UserCache:
+    """Потокобезопасный LRU с TTL: (user_id, token_version) → User."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._version = None
+        self._checked_at = 0.0
+
+    @property
+    def max_size(self):
+        return getattr(settings, "ACCOUNTS_USER_CACHE_SIZE", 1024)
+
+    @property
+    def ttl(self):
+        return getattr(settings, "ACCOUNTS_USER_CACHE_TTL", 300)
+
+    @property
+    def _shared(self):
+        return caches[getattr(settings, "ACCOUNTS_USER_CACHE", "default")]
+
+    def _sync_version(self):
+        # изменения пользователей в других воркерах: общая версия, сверка не чаще интервала
+        interval = getattr(settings, "ACCOUNTS_USER_CACHE_CHECK_INTERVAL", 1.0)
+        now = time.monotonic()
+        if now - self._checked_at < interval:
+            return
+        version = self._shared.get(VERSION_KEY, 0)
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._checked_at = now
+
+    def get(self, key):
+        self._sync_version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def set(self, key, user):
+        with self._lock:
+            self._entries[key] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def evict_user(self, user_id):
+        """Сброс записей пользователя локально + новая версия для остальных воркеров."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+        try:
+            self._shared.incr(VERSION_KEY)
+        except ValueError:
+            self._shared.set(VERSION_KEY, 1, timeout=None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, которая находит пользователя в user_cache.
+    Токены без token_version (выданные до его появления) обрабатываются как раньше — запросом в БД.
+    """
+
+    def get_user(self, validated_token):
+        version = validated_token.get(TOKEN_VERSION_CLAIM)
+        if version is None:
+            return super().get_user(validated_token)
+
+        key = (str(validated_token.get(api_settings.USER_ID_CLAIM)), version)
+        user = user_cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)  # 404/неактивный — исключения simplejwt
+            if token_version(user) != version:
+                raise AuthenticationFailed("Токен выдан до смены пароля или статуса пользователя.",
+                                           code="token_version_mismatch")
+            user_cache.set(key, user)
+        # копия: атрибуты, которые запрос вешает на request.user, не должны попасть в кэш
+        return copy.copy(user)
@@ -0,0 +1,151 @@
+# accounts/blacklist.py
+"""
+Проверка blacklist refresh-токенов без запроса к БД и дешёвая ротация в /auth/refresh/.
+
+blacklist_registry — процессное множество jti из BlacklistedToken (с временем истечения):
+загружается при первой проверке, затем дочитывает новые строки по id > последнего
+увиденного не чаще раза в ACCOUNTS_BLACKLIST_SYNC_INTERVAL секунд. Истёкшие jti
+выбрасываются раз в ACCOUNTS_BLACKLIST_PRUNE_INTERVAL — такие токены и так не пройдут
+проверку exp, а их строки удаляет команда purge_expired_tokens.
+
+Множество может отставать от БД на интервал синхронизации, поэтому при ротации токен
+попадает в blacklist вставкой в уникальный BlacklistedToken.token: повторное
+использование того же refresh (в том числе параллельно, из другого воркера)
+упирается в конфликт вставки и отклоняется.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .authentication import CachedJWTAuthentication
+from .tokens import VersionedRefreshToken
+
+
+class BlacklistRegistry:
+    """Потокобезопасное множество отозванных jti: jti → expires_at."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jtis = None  # None — ещё не загружено
+        self._last_id = 0
+        self._synced_at = 0.0
+        self._pruned_at = 0.0
+
+    def _sync(self):
+        now = time.monotonic()
+        interval = getattr(settings, "ACCOUNTS_BLACKLIST_SYNC_INTERVAL", 1.0)
+        if self._jtis is not None and now - self._synced_at < interval:
+            return
+        with self._lock:
+            if self._jtis is None:
+                self._jtis = {}
+                rows = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            else:
+                rows = BlacklistedToken.objects.filter(id__gt=self._last_id)
+            for pk, jti, expires_at in rows.order_by("id").values_list("id", "token__jti", "token__expires_at"):
+                self._jtis[jti] = expires_at
+                self._last_id = max(self._last_id, pk)
+            self._synced_at = now
+            if now - self._pruned_at >= getattr(settings, "ACCOUNTS_BLACKLIST_PRUNE_INTERVAL", 3600):
+                current = timezone.now()
+                self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > current}
+                self._pruned_at = now
+
+    def contains(self, jti):
+        self._sync()
+        return jti in self._jtis
+
+    def add(self, jti, expires_at):
+        """Токен отозван в этом процессе — виден сразу, не дожидаясь синхронизации."""
+        with self._lock:
+            if self._jtis is not None:
+                self._jtis[jti] = expires_at
+
+    def clear(self):
+        with self._lock:
+            self._jtis = None
+            self._last_id = 0
+            self._synced_at = self._pruned_at = 0.0
+
+    def __len__(self):
+        return len(self._jtis or ())
+
+
+blacklist_registry = BlacklistRegistry()
+
+
+class RotatingRefreshToken(VersionedRefreshToken):
+    """
+    Refresh-токен для /auth/refresh/: членство в blacklist — по blacklist_registry,
+    запись в OutstandingToken/BlacklistedToken — по user_id и jti, без повторной загрузки
+    пользователя и (в обычном случае) без get_or_create.
+    """
+
+    def check_blacklist(self):
+        if blacklist_registry.contains(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def _outstanding_fields(self, user):
+        return {
+            "user_id": user.pk if user is not None else None,
+            "token": str(self),
+            "created_at": self.current_time,
+            "expires_at": datetime_from_epoch(self.payload["exp"]),
+        }
+
+    def blacklist(self, user=None):
+        """Отзывает токен; если он уже отозван (повторная ротация) — TokenError."""
+        jti = self.payload[api_settings.JTI_CLAIM]
+        expires_at = datetime_from_epoch(self.payload["exp"])
+        token_id = (
+            OutstandingToken.objects.filter(jti=jti).order_by().values_list("id", flat=True).first()
+        )
+        if token_id is None:  # токен выдан до blacklist-приложения или его строку уже вычистили
+            token_id = OutstandingToken.objects.get_or_create(jti=jti, defaults=self._outstanding_fields(user))[0].pk
+        try:
+            with transaction.atomic():
+                blacklisted = BlacklistedToken.objects.create(token_id=token_id)
+        except IntegrityError:
+            blacklist_registry.add(jti, expires_at)
+            raise TokenError(_("Token is blacklisted"))
+        transaction.on_commit(lambda: blacklist_registry.add(jti, expires_at))
+        return blacklisted
+
+    def outstand(self, user=None):
+        """Новый jti уникален — сразу INSERT, без get_or_create."""
+        return OutstandingToken.objects.create(
+            jti=self.payload[api_settings.JTI_CLAIM], **self._outstanding_fields(user)
+        )
+
+
+class RotatingTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    TokenRefreshSerializer с RotatingRefreshToken: пользователь берётся через user_cache
+    (та же проверка token_version, что у access-токенов), ротация — в одной транзакции.
+    """
+    token_class = RotatingRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = CachedJWTAuthentication().get_user(refresh)  # неактивный/удалённый — AuthenticationFailed
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            with transaction.atomic():
+                if api_settings.BLACKLIST_AFTER_ROTATION:
+                    refresh.blacklist(user)
+                refresh.set_jti()
+                refresh.set_exp()
+                refresh.set_iat()
+                refresh.outstand(user)
+            data["refresh"] = str(refresh)
+        return data
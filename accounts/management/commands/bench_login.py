@@ -0,0 +1,120 @@
+# accounts/management/commands/bench_login.py
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+
+from accounts.serializers import User, users_by_email
+
+PASSWORD = "bench-Pass-123"
+EMAIL = "bench-login-{}@example.com"
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def cores():
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Пропускная способность логина по email: поиск пользователя до (email__iexact, скан) и после '
+        '(LOWER(email) по индексу), логинов в секунду на ядро для POST /api/auth/login/ (WSGI, поток '
+        'на запрос) и /api/auth/login/async/ (ASGI, PBKDF2 в пуле потоков)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Сколько bench-пользователей должно быть в БД')
+        parser.add_argument('--requests', type=int, default=200, help='Логинов на режим')
+        parser.add_argument('--concurrency', type=int, default=8, help='Одновременных логинов')
+        parser.add_argument('--lookups', type=int, default=500, help='Запросов на вариант поиска пользователя')
+
+    def handle(self, *args, **options):
+        self.seed(options['users'])
+        emails = [EMAIL.format(i) for i in range(options['users'])]
+
+        self.stdout.write(f"{'lookup':<24} {'µs/query':>9}")
+        for name, lookup in (
+            # срез без сортировки — как .get() в LoginSerializer (first() добавил бы ORDER BY id)
+            ('email__iexact (до)', lambda email: list(User.objects.filter(email__iexact=email)[:1])),
+            ('LOWER(email) (после)', lambda email: list(users_by_email(email)[:1])),
+        ):
+            started = time.perf_counter()
+            for i in range(options['lookups']):
+                lookup(emails[-1 - i % len(emails)].upper())
+            self.stdout.write(f"{name:<24} {(time.perf_counter() - started) / options['lookups'] * 1e6:>9.1f}")
+
+        self.stdout.write(
+            f"{'mode':<6} {'logins/s':>9} {'per core':>9} {'p50, ms':>9} {'p99, ms':>9} {'errors':>7}"
+        )
+        overrides = {
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+            # все логины идут с одного адреса — лимит "login" (accounts/throttling.py) мерить не даст
+            'REST_FRAMEWORK': {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}},
+        }
+        with override_settings(**overrides):
+            self.report('wsgi', self.run_threads(emails, options))
+            self.report('asgi', asyncio.run(self.run_async(emails, options)))
+
+    def seed(self, count):
+        existing = User.objects.filter(username__startswith='bench-login-').count()
+        if existing >= count:
+            return
+        password = make_password(PASSWORD)  # один хэш на всех — засев не упирается в PBKDF2
+        User.objects.bulk_create([
+            User(username=f'bench-login-{i}', email=EMAIL.format(i), password=password)
+            for i in range(existing, count)
+        ], batch_size=500)
+        self.stdout.write(f'Создано пользователей: {count - existing}')
+
+    @staticmethod
+    def body(emails, i):
+        return {'email': emails[i % len(emails)], 'password': PASSWORD}
+
+    def run_threads(self, emails, options):
+        client = Client()
+
+        def request(i):
+            started = time.perf_counter()
+            code = client.post('/api/auth/login/', self.body(emails, i), content_type='application/json').status_code
+            return time.perf_counter() - started, code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(request, range(options['requests'])))
+        return time.perf_counter() - started, results
+
+    async def run_async(self, emails, options):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(options['concurrency'])
+
+        async def request(i):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    '/api/auth/login/async/', self.body(emails, i), content_type='application/json',
+                )
+                return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(request(i) for i in range(options['requests'])))
+        return time.perf_counter() - started, results
+
+    def report(self, mode, result):
+        elapsed, results = result
+        latencies = [latency * 1000 for latency, _ in results]
+        errors = sum(1 for _, code in results if code >= 400)
+        rate = len(results) / elapsed
+        self.stdout.write(
+            f"{mode:<6} {rate:>9.1f} {rate / cores():>9.1f} "
+            f"{statistics.median(latencies):>9.2f} {percentile(latencies, 99):>9.2f} {errors:>7}"
+        )
@@ -0,0 +1,43 @@
+# accounts/management/commands/purge_expired_tokens.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет истёкшие OutstandingToken и их BlacklistedToken пачками по id — короткие транзакции '
+        'не блокируют /auth/refresh/ (в отличие от flushexpiredtokens, удаляющей всё одним запросом)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Токенов в одной транзакции')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Пауза между пачками, сек.')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        last_id = outstanding = blacklisted = 0
+        while True:
+            # проход по первичному ключу: индекса по expires_at нет, а каждая строка читается один раз
+            ids = list(
+                OutstandingToken.objects.filter(id__gt=last_id, expires_at__lte=now)
+                .order_by('id').values_list('id', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                # сначала зависимые строки; сигналов на моделях blacklist нет — поштучная выборка не нужна
+                queryset = BlacklistedToken.objects.filter(token_id__in=ids)
+                blacklisted += queryset._raw_delete(queryset.db)
+                queryset = OutstandingToken.objects.filter(id__in=ids)
+                outstanding += queryset._raw_delete(queryset.db)
+            last_id = ids[-1]
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Удалено токенов: {outstanding}, из них в blacklist: {blacklisted}'
+        ))
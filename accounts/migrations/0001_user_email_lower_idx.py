@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:02
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+INDEX_NAME = 'user_email_lower_idx'
+
+
+def _user_model(apps):
+    return apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+
+
+def add_index(apps, schema_editor):
+    # модель пользователя принадлежит auth — индекс создаётся только в БД, состояние моделей не меняется
+    schema_editor.add_index(_user_model(apps), models.Index(Lower('email'), name=INDEX_NAME))
+
+
+def remove_index(apps, schema_editor):
+    schema_editor.remove_index(_user_model(apps), models.Index(Lower('email'), name=INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        # после последней миграции auth: на SQLite AlterField пересоздаёт auth_user без этого индекса
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_index, remove_index),
+    ]
@@ -2,10 +2,21 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.validators import validate_email
+from django.db.models.functions import Lower
 from rest_framework import serializers
 
 User = get_user_model()
 
+
+def users_by_email(email):
+    """Поиск по LOWER(email) = email — читается по индексу user_email_lower_idx (email__iexact — скан)."""
+    return User.objects.annotate(email_lower=Lower("email")).filter(email_lower=email.lower())
+
+
+def login_queryset(username, email):
+    """Пользователь для логина: по email, если он указан, иначе по username."""
+    return users_by_email(email) if email else User.objects.filter(username=username)
+
 class RegisterSerializer(serializers.ModelSerializer):
     """
     Регистрация нового пользователя.
@@ -23,7 +34,7 @@ class RegisterSerializer(serializers.ModelSerializer):
     def validate_email(self, value):
         value = (value or "").strip().lower()
         validate_email(value)
-        if User.objects.filter(email__iexact=value).exists():
+        if users_by_email(value).exists():
             raise serializers.ValidationError("Пользователь с таким email уже существует.")
         return value
 
@@ -51,19 +62,20 @@ class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField(required=False, allow_blank=True)
     password = serializers.CharField(write_only=True)
 
-    def validate(self, attrs):
+    @staticmethod
+    def credentials(attrs):
+        """(username, email, password) из провалидированных полей; общий код с AsyncLoginView."""
         username = (attrs.get("username") or "").strip()
         email = (attrs.get("email") or "").strip().lower()
-        password = attrs.get("password")
-
         if not username and not email:
             raise serializers.ValidationError("Укажите username или email.")
+        return username, email, attrs.get("password")
+
+    def validate(self, attrs):
+        username, email, password = self.credentials(attrs)
 
         try:
-            if email:
-                user = User.objects.get(email__iexact=email)
-            else:
-                user = User.objects.get(username=username)
+            user = login_queryset(username, email).get()
         except User.DoesNotExist:
             raise serializers.ValidationError("Пользователь не найден.")
 
@@ -0,0 +1,16 @@
+# accounts/signals.py
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_cache
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def evict_cached_user(sender, instance, **kwargs):
+    # смена пароля, деактивация, удаление — закэшированный пользователь больше не годится
+    user_cache.evict_user(str(instance.pk))
+    # повторно после коммита: другой воркер мог успеть закэшировать старую строку
+    transaction.on_commit(lambda: user_cache.evict_user(str(instance.pk)))
@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.authentication import CachedJWTAuthentication, user_cache
+from accounts.tests.utils import without_throttling
+from accounts.tokens import TOKEN_VERSION_CLAIM, VersionedRefreshToken
+
+User = get_user_model()
+
+
+@without_throttling
+class CachedJWTAuthenticationTest(TestCase):
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user("alice", "alice@example.com", "Str0ng-pass!")
+        resp = self.client.post(
+            "/api/auth/login/", {"username": "alice", "password": "Str0ng-pass!"}, content_type="application/json"
+        )
+        self.access = resp.json()["access"]
+        self.refresh = resp.json()["refresh"]
+
+    def authenticate(self, access=None):
+        request = APIRequestFactory().get("/api/tasks/", HTTP_AUTHORIZATION=f"Bearer {access or self.access}")
+        return CachedJWTAuthentication().authenticate(request)[0]
+
+    def test_login_tokens_carry_token_version(self):
+        self.assertIn(TOKEN_VERSION_CLAIM, RefreshToken(self.refresh).payload)
+
+    def test_user_is_loaded_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate().pk, self.user.pk)
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertEqual(user.username, "alice")
+        self.assertIsNot(user, self.authenticate())  # каждому запросу — своя копия
+
+    def test_password_change_revokes_tokens(self):
+        self.authenticate()
+        self.user.set_password("An0ther-pass!")
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deactivation_revokes_tokens(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_tokens_without_version_fall_back_to_database(self):
+        legacy = str(RefreshToken.for_user(self.user).access_token)
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.assertEqual(self.authenticate(legacy).pk, self.user.pk)
+
+    @override_settings(ACCOUNTS_USER_CACHE_SIZE=1)
+    def test_cache_is_bounded(self):
+        other = User.objects.create_user("bob", "bob@example.com", "Str0ng-pass!")
+        other_access = str(VersionedRefreshToken.for_user(other).access_token)
+        self.authenticate()
+        self.authenticate(other_access)
+        self.assertEqual(len(user_cache), 1)
+        with self.assertNumQueries(1):
+            self.authenticate()  # alice вытеснена
+
+    def test_refresh_keeps_token_version(self):
+        resp = self.client.post("/api/auth/refresh/", {"refresh": self.refresh}, content_type="application/json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.authenticate(resp.json()["access"]).pk, self.user.pk)
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.authentication import user_cache
+from accounts.blacklist import blacklist_registry
+from accounts.tests.utils import without_throttling
+from accounts.tokens import VersionedRefreshToken
+
+User = get_user_model()
+
+
+@without_throttling
+@override_settings(ACCOUNTS_BLACKLIST_SYNC_INTERVAL=3600)
+class RefreshRotationTest(TestCase):
+
+    def setUp(self):
+        user_cache.clear()
+        blacklist_registry.clear()
+        self.user = User.objects.create_user("alice", "alice@example.com", "Str0ng-pass!")
+        resp = self.client.post(
+            "/api/auth/login/", {"username": "alice", "password": "Str0ng-pass!"}, content_type="application/json"
+        )
+        self.refresh = resp.json()["refresh"]
+
+    def rotate(self, refresh=None):
+        return self.client.post(
+            "/api/auth/refresh/", {"refresh": refresh or self.refresh}, content_type="application/json"
+        )
+
+    def test_rotation_blacklists_old_token(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.rotate()
+        self.assertEqual(resp.status_code, 200)
+        new_refresh = resp.json()["refresh"]
+        jti = RefreshToken(self.refresh, verify=False)["jti"]
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=jti).exists())
+        self.assertTrue(OutstandingToken.objects.filter(jti=RefreshToken(new_refresh, verify=False)["jti"]).exists())
+
+        # повторное использование отклоняется по множеству в памяти, без запросов
+        with self.assertNumQueries(0):
+            self.assertEqual(self.rotate().status_code, 401)
+        self.assertEqual(self.rotate(new_refresh).status_code, 200)
+
+    def test_rotation_query_count(self):
+        self.rotate(str(VersionedRefreshToken.for_user(self.user)))  # прогрев реестра и кэша пользователя
+        # SELECT id токена + SAVEPOINT/INSERT/RELEASE в blacklist + INSERT нового токена (+ внешний savepoint)
+        with self.assertNumQueries(7):
+            self.assertEqual(self.rotate().status_code, 200)
+
+    def test_stale_registry_still_rejects_reuse(self):
+        self.assertEqual(len(blacklist_registry), 0)
+        self.rotate(str(RefreshToken.for_user(self.user)))  # реестр загружен и не синхронизируется
+        # токен отозван «другим воркером» — в локальном множестве его нет
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=RefreshToken(self.refresh)["jti"]))
+        self.assertEqual(self.rotate().status_code, 401)
+
+    def test_registry_syncs_new_rows(self):
+        blacklist_registry.contains("warm-up")
+        token = OutstandingToken.objects.get(jti=RefreshToken(self.refresh)["jti"])
+        BlacklistedToken.objects.create(token=token)
+        self.assertFalse(blacklist_registry.contains(token.jti))
+        with override_settings(ACCOUNTS_BLACKLIST_SYNC_INTERVAL=0):
+            self.assertTrue(blacklist_registry.contains(token.jti))
+
+    def test_password_change_rejects_refresh(self):
+        self.user.set_password("An0ther-pass!")
+        self.user.save()
+        self.assertEqual(self.rotate().status_code, 401)
+
+
+class PurgeExpiredTokensTest(TestCase):
+
+    def test_purges_expired_in_batches(self):
+        user = User.objects.create_user("bob", "bob@example.com", "Str0ng-pass!")
+        now = timezone.now()
+        for i in range(5):
+            token = OutstandingToken.objects.create(
+                user=user, jti=f"old-{i}", token="t", created_at=now, expires_at=now - timedelta(hours=1),
+            )
+            if i % 2:
+                BlacklistedToken.objects.create(token=token)
+        live = OutstandingToken.objects.create(
+            user=user, jti="live", token="t", created_at=now, expires_at=now + timedelta(days=1),
+        )
+        BlacklistedToken.objects.create(token=live)
+
+        out = StringIO()
+        call_command("purge_expired_tokens", "--batch-size", "2", stdout=out)
+        self.assertIn("Удалено токенов: 5, из них в blacklist: 2", out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.values_list("jti", flat=True)), ["live"])
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
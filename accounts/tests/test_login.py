@@ -0,0 +1,91 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from accounts.serializers import users_by_email
+from accounts.tests.utils import without_throttling
+
+User = get_user_model()
+
+
+@without_throttling
+class EmailLookupTest(TestCase):
+
+    def test_email_lookup_uses_lower_index(self):
+        User.objects.create_user("alice", "alice@example.com", "Str0ng-pass!")
+        self.assertEqual(users_by_email("ALICE@Example.com").get().username, "alice")
+        if connection.vendor == "sqlite":
+            sql, params = users_by_email("alice@example.com").query.sql_with_params()
+            with connection.cursor() as cursor:
+                plan = " ".join(row[-1] for row in cursor.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall())
+            self.assertIn("user_email_lower_idx", plan)
+
+    def test_register_rejects_duplicate_email_case_insensitively(self):
+        User.objects.create_user("alice", "alice@example.com", "Str0ng-pass!")
+        resp = self.client.post("/api/auth/register/", {
+            "username": "alice2", "email": "Alice@Example.com", "password": "An0ther-pass!", "password2": "An0ther-pass!",
+        }, content_type="application/json")
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("email", resp.json())
+
+
+@without_throttling
+class AsyncLoginViewTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("alice", "alice@example.com", "Str0ng-pass!")
+
+    async def login(self, url, **body):
+        return await self.async_client.post(url, body, content_type="application/json")
+
+    async def test_matches_sync_login(self):
+        for body in ({"email": "Alice@example.com", "password": "Str0ng-pass!"},
+                     {"username": "alice", "password": "Str0ng-pass!"}):
+            resp = await self.login("/api/auth/login/async/", **body)
+            self.assertEqual(resp.status_code, 200)
+            data = resp.json()
+            self.assertEqual(data["user"]["username"], "alice")
+            self.assertEqual(resp.cookies["access_token"].value, data["access"])
+            self.assertEqual(resp.cookies["refresh_token"].value, data["refresh"])
+            resp = await self.async_client.get("/api/tasks/", headers={"Authorization": f"Bearer {data['access']}"})
+            self.assertEqual(resp.status_code, 200)
+
+    async def test_errors_match_sync_login(self):
+        for body in ({"email": "alice@example.com", "password": "wrong"},
+                     {"email": "nobody@example.com", "password": "x"},
+                     {"password": "x"},
+                     {"email": "not-an-email", "password": "x"}):
+            resp = await self.login("/api/auth/login/async/", **body)
+            sync_resp = await self.login("/api/auth/login/", **body)
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(resp.json(), sync_resp.json())
+
+    @override_settings(PASSWORD_HASHERS=[
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher", "django.contrib.auth.hashers.MD5PasswordHasher",
+    ])
+    async def test_outdated_hash_is_upgraded(self):
+        self.user.password = make_password("Str0ng-pass!", hasher="md5")
+        await self.user.asave()
+        resp = await self.login("/api/auth/login/async/", username="alice", password="Str0ng-pass!")
+        self.assertEqual(resp.status_code, 200)
+        await self.user.arefresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BenchLoginCommandTest(TransactionTestCase):
+    # логины идут из других потоков — им нужны закоммиченные пользователи
+
+    def test_reports_lookups_and_both_modes(self):
+        out = StringIO()
+        call_command("bench_login", "--users", "3", "--requests", "4", "--concurrency", "2", "--lookups", "2",
+                     stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(User.objects.count(), 3)
+        modes = [line.split() for line in lines if line.split()[0] in ("wsgi", "asgi")]
+        self.assertEqual([row[0] for row in modes], ["wsgi", "asgi"])
+        self.assertEqual([row[-1] for row in modes], ["0", "0"])
@@ -0,0 +1,129 @@
+import multiprocessing
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock, skipIf
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from accounts import throttling
+from accounts.throttling import BucketTable, bucket_table
+from tasks.models import Status
+
+User = get_user_model()
+
+
+def rates(**scopes):
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": scopes})
+
+
+def _take_many(path, count, queue):
+    with override_settings(ACCOUNTS_THROTTLE_FILE=path):
+        table = BucketTable()
+        queue.put(sum(table.take("shared", 10, 60)[0] for _ in range(count)))
+
+
+@override_settings(ACCOUNTS_THROTTLE_FILE=None)  # своя таблица в памяти на каждый BucketTable()
+class BucketTableTest(SimpleTestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(throttling.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bucket_empties_and_refills(self):
+        table = BucketTable()
+        self.assertEqual([table.take("a", 3, 60)[0] for _ in range(4)], [True, True, True, False])
+        allowed, wait = table.take("a", 3, 60)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 20.0)
+        self.assertTrue(table.take("b", 3, 60)[0])  # у другого ключа своё ведро
+        self.now += 20
+        self.assertEqual([table.take("a", 3, 60)[0] for _ in range(2)], [True, False])
+
+    @override_settings(ACCOUNTS_THROTTLE_SLOTS=8)
+    def test_full_set_evicts_least_recently_used(self):
+        table = BucketTable()  # один набор из 8 слотов
+        for i in range(8):
+            table.take(f"key{i}", 1, 60)
+            self.now += 1
+        self.assertFalse(table.take("key7", 1, 60)[0])
+        self.assertTrue(table.take("key8", 1, 60)[0])  # вытеснил key0
+        self.assertTrue(table.take("key0", 1, 60)[0])  # и key0 начинает с полного ведра
+        self.assertFalse(table.take("key7", 1, 60)[0])
+
+    def test_reset(self):
+        table = BucketTable()
+        table.take("a", 1, 60)
+        table.reset()
+        self.assertTrue(table.take("a", 1, 60)[0])
+
+
+@skipIf(throttling.fcntl is None, "нужен fcntl")
+class SharedBucketTableTest(SimpleTestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "throttle.bin")
+        self.addCleanup(lambda: os.path.exists(self.path) and os.remove(self.path))
+
+    def test_table_is_shared_between_processes(self):
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        workers = [context.Process(target=_take_many, args=(self.path, 8, queue)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        # 24 попытки из трёх процессов, ёмкость ведра 10 — пропущено ровно 10
+        self.assertEqual(sum(queue.get() for _ in workers), 10)
+
+    def test_format_change_recreates_table(self):
+        with override_settings(ACCOUNTS_THROTTLE_FILE=self.path):
+            BucketTable().take("a", 1, 60)
+            with override_settings(ACCOUNTS_THROTTLE_SLOTS=16):
+                self.assertTrue(BucketTable().take("a", 1, 60)[0])
+            self.assertEqual(os.path.getsize(self.path), throttling.HEADER.size + 16 * throttling.SLOT.size)
+
+    @override_settings(ACCOUNTS_THROTTLE_FILE=None)
+    def test_settings_change_reopens_shared_table(self):
+        with override_settings(ACCOUNTS_THROTTLE_FILE=self.path):
+            bucket_table.take("reopen", 1, 60)
+            self.assertFalse(BucketTable().take("reopen", 1, 60)[0])  # тот же файл
+        self.assertTrue(bucket_table.take("reopen", 1, 60)[0])  # снова своя таблица в памяти
+
+
+@override_settings(ACCOUNTS_THROTTLE_FILE=None)  # reset() не должен обнулять общий файл dev-сервера
+class ThrottledViewsTest(TestCase):
+
+    def setUp(self):
+        bucket_table.reset()
+        self.addCleanup(bucket_table.reset)
+        User.objects.create_user("alice", "alice@example.com", "Str0ng-pass!")
+        self.credentials = {"username": "alice", "password": "Str0ng-pass!"}
+
+    def login(self, **extra):
+        self.client.cookies.clear()  # с access-cookie ключом ведра был бы пользователь, а не IP
+        return self.client.post("/api/auth/login/", self.credentials, content_type="application/json", **extra)
+
+    @rates(login="2/min")
+    def test_login_is_limited_per_ip(self):
+        self.assertEqual([self.login().status_code for _ in range(3)], [200, 200, 429])
+        resp = self.client.post("/api/auth/login/async/", self.credentials, content_type="application/json")
+        self.assertEqual(resp.status_code, 429)  # async-логин — то же ведро
+        self.assertGreater(int(resp["Retry-After"]), 0)
+        self.assertEqual(self.login(REMOTE_ADDR="10.0.0.2").status_code, 200)
+
+    @rates(tasks_write="1/min")
+    def test_write_scope_limits_only_unsafe_methods(self):
+        Status.objects.create(name="To Do")
+        body = {"title": "T", "deadline": (timezone.now() + timedelta(days=1)).isoformat()}
+        self.assertEqual(self.client.post("/api/tasks/", body, content_type="application/json").status_code, 201)
+        self.assertEqual(self.client.post("/api/tasks/", body, content_type="application/json").status_code, 429)
+        self.assertEqual(self.client.get("/api/tasks/").status_code, 200)
+
+    def test_scopes_without_rate_are_not_limited(self):
+        self.assertEqual([self.login().status_code for _ in range(3)], [200, 200, 200])
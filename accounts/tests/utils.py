@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.test import override_settings
+
+
+def without_throttling(target):
+    """
+    Для тестов, которые не проверяют лимиты: все их запросы идут с 127.0.0.1 и копили бы
+    общие вёдра (а файл таблицы по умолчанию — общий с dev-сервером).
+    """
+    return override_settings(
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}},
+        ACCOUNTS_THROTTLE_FILE=None,
+    )(target)
@@ -0,0 +1,200 @@
+# accounts/throttling.py
+"""
+Token bucket-троттлинг DRF без запросов к БД и кэшу.
+
+Вёдра лежат в таблице в разделяемой памяти (mmap файла ACCOUNTS_THROTTLE_FILE),
+общей для всех воркеров на хосте. Таблица множественно-ассоциативная: ключ
+(scope + пользователь или IP) хэшируется в набор из WAYS слотов, решение — чтение
+и запись одного набора под блокировкой его байтового диапазона (fcntl.lockf), O(1).
+Если в наборе нет места, вытесняется дольше всех не использовавшееся ведро —
+такой клиент просто начинает с полного ведра.
+
+Лимиты — REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] по scope вьюхи ("10/min": ёмкость
+ведра 10, пополнение 10 токенов в минуту); scope без лимита не ограничивается.
+Без fcntl (Windows) или с ACCOUNTS_THROTTLE_FILE = None таблица своя у каждого процесса.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import ScopedRateThrottle
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MAGIC = b"TBKT"
+HEADER = struct.Struct("<4sIQ")  # магия, версия формата, число слотов
+SLOT = struct.Struct("<Qdd")  # хэш ключа (0 — пусто), токены, время обновления (monotonic)
+VERSION = 1
+WAYS = 8
+LOCK_STRIPES = 64
+
+
+class BucketTable:
+    """Таблица вёдер: take(key, capacity, period) → (разрешено, сколько ждать, сек.)."""
+
+    def __init__(self):
+        self._init_lock = threading.Lock()
+        # fcntl-блокировки принадлежат процессу — потоки одного процесса разводятся своими замками
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._mm = None
+        self._fd = None
+        self._sets = 0
+
+    @property
+    def path(self):
+        default = os.path.join(tempfile.gettempdir(), "manager_task_throttle.bin")
+        return getattr(settings, "ACCOUNTS_THROTTLE_FILE", default)
+
+    @property
+    def slots(self):
+        return getattr(settings, "ACCOUNTS_THROTTLE_SLOTS", 65536) // WAYS * WAYS
+
+    def _open(self):
+        with self._init_lock:
+            if self._mm is not None:
+                return
+            slots = self.slots
+            size = HEADER.size + slots * SLOT.size
+            path = self.path
+            if fcntl is None or path is None:
+                mm, fd = mmap.mmap(-1, size), None
+                HEADER.pack_into(mm, 0, MAGIC, VERSION, slots)
+            else:
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+                fcntl.lockf(fd, fcntl.LOCK_EX)
+                try:
+                    header = os.pread(fd, HEADER.size, 0)
+                    if len(header) < HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION, slots):
+                        # новый файл или другой формат/размер — пересоздаём пустую таблицу
+                        os.ftruncate(fd, 0)
+                        os.ftruncate(fd, size)
+                        os.pwrite(fd, HEADER.pack(MAGIC, VERSION, slots), 0)
+                    mm = mmap.mmap(fd, size)
+                finally:
+                    fcntl.lockf(fd, fcntl.LOCK_UN)
+            self._sets = slots // WAYS
+            self._fd, self._mm = fd, mm
+
+    @contextmanager
+    def _locked(self, index):
+        """Монопольный доступ к набору index; отдаёт смещение его первого слота."""
+        start, length = HEADER.size + index * WAYS * SLOT.size, WAYS * SLOT.size
+        with self._stripes[index % LOCK_STRIPES]:
+            if self._fd is None:
+                yield start
+                return
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+            try:
+                yield start
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+    def take(self, key, capacity, period):
+        """Забирает токен из ведра key; пустое ведро — (False, время до следующего токена)."""
+        self._open()
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") | 1
+        refill = capacity / period
+        mm = self._mm
+        with self._locked(digest % self._sets) as start:
+            now = time.monotonic()
+            target = empty = oldest = None
+            for offset in range(start, start + WAYS * SLOT.size, SLOT.size):
+                slot_key, tokens, updated = SLOT.unpack_from(mm, offset)
+                if slot_key == digest:
+                    target = offset
+                    break
+                if slot_key == 0:
+                    empty = empty or offset
+                elif oldest is None or updated < oldest[1]:
+                    oldest = (offset, updated)
+            if target is None:
+                target, tokens, updated = empty or oldest[0], capacity, now
+            # время из старого monotonic (файл пережил перезагрузку) не даёт отрицательного пополнения
+            tokens = min(capacity, tokens + max(now - updated, 0) * refill)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            SLOT.pack_into(mm, target, digest, tokens, now)
+        return allowed, 0.0 if allowed else (1 - tokens) / refill
+
+    def close(self):
+        """Отпускает mmap и файл; следующий take() откроет таблицу заново по текущим настройкам."""
+        with self._init_lock:
+            if self._mm is not None:
+                self._mm.close()
+            if self._fd is not None:
+                os.close(self._fd)
+            self._mm = self._fd = None
+
+    def reset(self):
+        """Обнуляет все вёдра (для тестов)."""
+        self._open()
+        for index in range(self._sets):
+            with self._locked(index) as start:
+                self._mm[start:start + WAYS * SLOT.size] = bytes(WAYS * SLOT.size)
+
+
+bucket_table = BucketTable()
+
+
+@receiver(setting_changed)
+def reopen_bucket_table(setting, **kwargs):
+    # override_settings в тестах: таблица должна переключиться на новый файл/размер
+    if setting in ("ACCOUNTS_THROTTLE_FILE", "ACCOUNTS_THROTTLE_SLOTS"):
+        bucket_table.close()
+
+
+class TokenBucketThrottle(ScopedRateThrottle):
+    """
+    ScopedRateThrottle на bucket_table: view.throttle_scope → лимит из DEFAULT_THROTTLE_RATES,
+    ключ — scope + id пользователя или IP (как у ScopedRateThrottle).
+    """
+
+    def get_rate(self):
+        # читается при каждом запросе: THROTTLE_RATES ScopedRateThrottle не видит override_settings
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        return self.take(self.get_cache_key(request, view))
+
+    def allow_anonymous(self, request, scope):
+        """Проверка по IP для вьюх вне DRF (AsyncLoginView); request — обычный HttpRequest."""
+        self.scope = scope
+        return self.take(self.cache_format % {"scope": scope, "ident": self.get_ident(request)})
+
+    def take(self, key):
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        allowed, self._wait = bucket_table.take(key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class WriteTokenBucketThrottle(TokenBucketThrottle):
+    """Лимит по view.write_throttle_scope только для изменяющих методов (POST/PUT/PATCH/DELETE)."""
+    scope_attr = "write_throttle_scope"
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        return super().allow_request(request, view)
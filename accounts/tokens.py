@@ -0,0 +1,25 @@
+# accounts/tokens.py
+from django.utils.crypto import salted_hmac
+from rest_framework_simplejwt.tokens import RefreshToken
+
+TOKEN_VERSION_CLAIM = "token_version"
+
+
+def token_version(user):
+    """
+    Версия учётных данных пользователя: меняется при смене пароля и при (де)активации.
+    Попадает в токены при логине — токены, выданные до изменения, перестают приниматься.
+    """
+    return salted_hmac(
+        "accounts.token_version", f"{user.password}:{user.is_active}"
+    ).hexdigest()[:16]
+
+
+class VersionedRefreshToken(RefreshToken):
+    """RefreshToken с claim token_version; access-токены и ротация (/auth/refresh/) копируют его."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = token_version(user)
+        return token
@@ -1,9 +1,11 @@
 from django.urls import path
 from .views import RegisterView, LoginView, CookieTokenRefreshView, LogoutView
+from .views_async import AsyncLoginView
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
     path("login/", LoginView.as_view(), name="login"),
+    path("login/async/", AsyncLoginView.as_view(), name="login_async"),
     path("refresh/", CookieTokenRefreshView.as_view(), name="token_refresh"),
     path("logout/", LogoutView.as_view(), name="logout"),
 ]
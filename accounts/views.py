@@ -7,10 +7,11 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from .blacklist import RotatingTokenRefreshSerializer
 from .serializers import RegisterSerializer, LoginSerializer
+from .tokens import VersionedRefreshToken
 
 ACCESS_COOKIE = getattr(settings, "JWT_ACCESS_COOKIE", "access_token")
 REFRESH_COOKIE = getattr(settings, "JWT_REFRESH_COOKIE", "refresh_token")
@@ -38,6 +39,22 @@ def set_token_cookies(response: Response, access: str, refresh: str):
     return response
 
 
+def login_payload(user):
+    """Новая пара токенов и профиль — тело ответа логина (LoginView и AsyncLoginView)."""
+    refresh = VersionedRefreshToken.for_user(user)
+    return {
+        "access": str(refresh.access_token),
+        "refresh": str(refresh),
+        "user": {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+        }
+    }
+
+
 def clear_token_cookies(response: Response):
     response.delete_cookie(ACCESS_COOKIE, path="/")
     response.delete_cookie(REFRESH_COOKIE, path="/auth/")
@@ -51,6 +68,7 @@ class RegisterView(generics.CreateAPIView):
     """
     permission_classes = [AllowAny]
     serializer_class = RegisterSerializer
+    throttle_scope = "register"
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -62,28 +80,16 @@ class LoginView(generics.GenericAPIView):
     """
     permission_classes = [AllowAny]
     serializer_class = LoginSerializer
+    throttle_scope = "login"
 
     def post(self, request, *args, **kwargs):
         ser = self.get_serializer(data=request.data)
         ser.is_valid(raise_exception=True)
         user = ser.validated_data["user"]
 
-        refresh = RefreshToken.for_user(user)
-        access = str(refresh.access_token)
-
-        data = {
-            "access": access,
-            "refresh": str(refresh),
-            "user": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-            }
-        }
+        data = login_payload(user)
         resp = Response(data, status=status.HTTP_200_OK)
-        return set_token_cookies(resp, access, str(refresh))
+        return set_token_cookies(resp, data["access"], data["refresh"])
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -91,10 +97,12 @@ class CookieTokenRefreshView(TokenRefreshView):
     """
     POST /auth/refresh/
     - Берёт refresh токен из cookie, если не передан в теле
-    - Ротирует refresh (см. SIMPLE_JWT), старый — в blacklist
+    - Ротирует refresh (см. SIMPLE_JWT), старый — в blacklist (проверка — accounts/blacklist.py)
     - Возвращает новый access (+обновлённый refresh) и обновляет cookies
     """
     permission_classes = [AllowAny]
+    serializer_class = RotatingTokenRefreshSerializer
+    throttle_scope = "token_refresh"
 
     def post(self, request, *args, **kwargs):
         # Если в body нет refresh — берём из cookie
@@ -135,7 +143,7 @@ class LogoutView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
 
-        refresh = RefreshToken.for_user(user)
+        refresh = VersionedRefreshToken.for_user(user)
         access = str(refresh.access_token)
 
         response = Response({
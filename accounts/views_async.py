@@ -0,0 +1,98 @@
+# accounts/views_async.py
+"""
+Async-логин для запуска под ASGI: поиск пользователя идёт через async-ORM,
+а PBKDF2 (check_password) — в ограниченном пуле потоков ACCOUNTS_PASSWORD_HASH_WORKERS,
+так что event loop продолжает обслуживать другие запросы, а одновременных
+хэширований не больше, чем потоков в пуле.
+
+Формат запроса и ответа тот же, что у POST /api/auth/login/.
+"""
+import asyncio
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import serializers
+
+from .serializers import LoginSerializer, User, login_queryset
+from .throttling import TokenBucketThrottle
+from .views import login_payload, set_token_cookies
+
+_hash_pool = None
+
+
+def hash_pool():
+    """Пул для хэширования паролей; создаётся при первом логине."""
+    global _hash_pool
+    if _hash_pool is None:
+        workers = getattr(settings, "ACCOUNTS_PASSWORD_HASH_WORKERS", None) or os.cpu_count() or 1
+        _hash_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+    return _hash_pool
+
+
+async def run_in_hash_pool(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(hash_pool(), func, *args)
+
+
+def _verify_password(password, encoded):
+    """(верен ли пароль, новый хэш или None) — пересчёт, если алгоритм или параметры хэша устарели."""
+    outdated = []
+    is_correct = check_password(password, encoded, setter=outdated.append)
+    return is_correct, make_password(password) if outdated else None
+
+
+async def acheck_password(user, password):
+    """Как User.check_password, но хэширование — в hash_pool(); обновлённый хэш сохраняется одним UPDATE."""
+    is_correct, new_encoded = await run_in_hash_pool(_verify_password, password, user.password)
+    if new_encoded:
+        user.password = new_encoded
+        await user.asave(update_fields=["password"])
+    return is_correct
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params={'ensure_ascii': False})
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncLoginView(View):
+    """POST /api/auth/login/async/ — как LoginView (username или email + password), cookies те же."""
+    throttle_scope = "login"  # то же ведро, что у LoginView (по IP)
+
+    async def post(self, request, *args, **kwargs):
+        throttle = TokenBucketThrottle()
+        if not throttle.allow_anonymous(request, self.throttle_scope):
+            response = _json({"detail": "Слишком много попыток входа, повторите позже."}, status=429)
+            response["Retry-After"] = str(math.ceil(throttle.wait()))
+            return response
+
+        if request.content_type == "application/json":
+            try:
+                body = json.loads(request.body or b"{}")
+            except ValueError:
+                return _json({"detail": "Некорректный JSON."}, status=400)
+        else:
+            body = request.POST
+
+        serializer = LoginSerializer()
+        try:
+            username, email, password = serializer.credentials(serializer.to_internal_value(body))
+            try:
+                user = await login_queryset(username, email).aget()
+            except User.DoesNotExist:
+                raise serializers.ValidationError("Пользователь не найден.")
+            if not await acheck_password(user, password):
+                raise serializers.ValidationError("Неверный пароль.")
+        except serializers.ValidationError as exc:
+            return _json(serializers.as_serializer_error(exc), status=400)
+
+        data = await sync_to_async(login_payload)(user)  # INSERT в OutstandingToken
+        return set_token_cookies(_json(data), data["access"], data["refresh"])
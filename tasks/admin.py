@@ -4,10 +4,13 @@ import json
 
 from django import forms
 from django.contrib import admin
+from django.db.models import Count
 from django.utils import timezone
 from django.utils.html import format_html
 from django.urls import reverse
-from django.test import Client
+
+from .bulk import bulk_delete_subtasks, bulk_update_subtasks
+from .querysets import title_prefix_queryset
 
 # безопасный импорт Category
 try:
@@ -19,6 +22,11 @@ except Exception:
     HAS_CATEGORY = False
 
 
+def _is_autocomplete(request):
+    match = getattr(request, 'resolver_match', None)
+    return match is not None and match.url_name == 'autocomplete'
+
+
 # --- Фильтры "вчера" ---
 
 class YesterdayDeadlineFilter(admin.SimpleListFilter):
@@ -71,7 +79,7 @@ class TaskAdminForm(forms.ModelForm):
 class TaskAdmin(admin.ModelAdmin):
     form = TaskAdminForm
     list_display = ['short_title', 'status', 'deadline', 'is_overdue_badge', 'subtasks_count']
-    list_filter = ['status', 'deadline', YesterdayDeadlineFilter]
+    list_filter = ['status', 'deadline', 'is_overdue', YesterdayDeadlineFilter]
     search_fields = ['title', 'description']
     date_hierarchy = 'deadline'
     inlines = [SubTaskInline]
@@ -86,11 +94,27 @@ class TaskAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if _is_autocomplete(request):
+            return queryset  # виджету автодополнения нужны только id и __str__
+        # статус JOIN-ом и число подзадач аннотацией — без запросов на каждую строку списка
+        return queryset.select_related('status').annotate(subtasks_total=Count('subtasks'))
+
+    def get_search_results(self, request, queryset, search_term):
+        # autocomplete_fields у SubTaskAdmin: поиск по началу названия через индекс LOWER(title),
+        # а не icontains по title/description. Поиск в списке задач — как раньше.
+        if _is_autocomplete(request) and search_term.strip():
+            return title_prefix_queryset(queryset, search_term.strip()), False
+        return super().get_search_results(request, queryset, search_term)
+
     def short_title(self, obj): return obj.short_title()
     short_title.short_description = 'Title'
+    short_title.admin_order_field = 'title'
 
-    def subtasks_count(self, obj): return obj.subtasks.count()
+    def subtasks_count(self, obj): return obj.subtasks_total
     subtasks_count.short_description = "Подзадач"
+    subtasks_count.admin_order_field = 'subtasks_total'
 
     def is_overdue_badge(self, obj):
         if not obj.deadline:
@@ -105,7 +129,10 @@ class TaskAdmin(admin.ModelAdmin):
 
     def api_detail_preview(self, obj):
         try:
+            from django.db.models import prefetch_related_objects
+            from .querysets import subtasks_prefetch
             from .serializers import TaskDetailSerializer
+            prefetch_related_objects([obj], subtasks_prefetch())
             pretty = json.dumps(TaskDetailSerializer(obj).data, ensure_ascii=False, indent=2)
             return format_html(
                 '<details><summary style="cursor:pointer">Показать JSON</summary>'
@@ -123,9 +150,11 @@ class TaskAdmin(admin.ModelAdmin):
 @admin.register(SubTask)
 class SubTaskAdmin(admin.ModelAdmin):
     list_display = ['short_title', 'task', 'status', 'deadline', 'created_at', 'cbv_link']
-    list_filter = ['status', 'deadline', 'created_at', YesterdayDeadlineFilter, YesterdayCreatedFilter]
+    list_filter = ['status', 'deadline', 'is_overdue', 'created_at', YesterdayDeadlineFilter, YesterdayCreatedFilter]
     search_fields = ['title', 'description', 'task__title']
     date_hierarchy = 'created_at'
+    list_select_related = ('task', 'status')
+    autocomplete_fields = ['task']  # вместо <select> со всеми задачами — поиск по /admin/autocomplete/
     readonly_fields = ('created_at', 'cbv_api_endpoints')
     actions = ['cbv_smoke_test_patch', 'cbv_delete_via_api']
 
@@ -137,6 +166,7 @@ class SubTaskAdmin(admin.ModelAdmin):
 
     def short_title(self, obj): return obj.short_title()
     short_title.short_description = 'Title'
+    short_title.admin_order_field = 'title'
 
     def cbv_link(self, obj):
         url = reverse('subtask-detail-update-delete', kwargs={'pk': obj.pk})
@@ -147,38 +177,24 @@ class SubTaskAdmin(admin.ModelAdmin):
         url = reverse('subtask-detail-update-delete', kwargs={'pk': obj.pk})
         return format_html(
             '<div><p><b>Эндпоинт:</b> <code>{}</code></p>'
-            '<p>Открой ссылку — JSON из CBV. Для PATCH/DELETE используй actions ниже.</p></div>',
+            '<p>Открой ссылку — JSON из CBV. Массовые PATCH/DELETE — actions списка (/api/subtasks/bulk/).</p></div>',
             url
         )
     cbv_api_endpoints.short_description = "CBV эндпоинты"
 
     def cbv_smoke_test_patch(self, request, queryset):
-        client = Client(enforce_csrf_checks=False)
-        ok = 0
-        msgs = []
-        for obj in queryset:
-            url = reverse('subtask-detail-update-delete', kwargs={'pk': obj.pk})
-            resp_opt = client.options(url)
-            payload = {"description": "Обновлено через admin CBV-smoke"}
-            resp_pat = client.patch(url, data=json.dumps(payload), content_type="application/json")
-            msgs.append(f"#{obj.pk} OPTIONS:{resp_opt.status_code} PATCH:{resp_pat.status_code}")
-            if 200 <= resp_pat.status_code < 300:
-                ok += 1
-        self.message_user(request, f"CBV smoke-test: PATCH ok {ok}/{queryset.count()}. Детали: {', '.join(msgs)}")
-    cbv_smoke_test_patch.short_description = "CBV smoke-test: OPTIONS + PATCH"
+        # Тот же путь, что и PATCH /api/subtasks/bulk/: один UPDATE на все выбранные строки
+        ids = list(queryset.values_list('pk', flat=True))
+        updated = bulk_update_subtasks(ids, {"description": "Обновлено через admin CBV-smoke"})
+        self.message_user(request, f"Bulk PATCH: обновлено {updated}/{len(ids)} одним UPDATE.")
+    cbv_smoke_test_patch.short_description = "Bulk PATCH: обновить описание (/api/subtasks/bulk/)"
 
     def cbv_delete_via_api(self, request, queryset):
-        client = Client(enforce_csrf_checks=False)
-        deleted = 0
-        msgs = []
-        for obj in queryset:
-            url = reverse('subtask-detail-update-delete', kwargs={'pk': obj.pk})
-            resp = client.delete(url)
-            msgs.append(f"#{obj.pk} DEL:{resp.status_code}")
-            if resp.status_code == 204:
-                deleted += 1
-        self.message_user(request, f"Удалено через CBV: {deleted}/{queryset.count()}. Статусы: {', '.join(msgs)}")
-    cbv_delete_via_api.short_description = "CBV: Удалить через API (осторожно)"
+        # Тот же путь, что и DELETE /api/subtasks/bulk/: один DELETE на все выбранные строки
+        ids = list(queryset.values_list('pk', flat=True))
+        deleted = bulk_delete_subtasks(ids)
+        self.message_user(request, f"Bulk DELETE: удалено {deleted}/{len(ids)} одним DELETE.")
+    cbv_delete_via_api.short_description = "Bulk DELETE: удалить через /api/subtasks/bulk/ (осторожно)"
 
 
 @admin.register(Status)
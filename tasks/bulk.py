@@ -0,0 +1,106 @@
+# tasks/bulk.py
+"""
+Массовые операции над задачами/подзадачами.
+bulk_create/update()/delete без сигналов быстрее поштучных save(), поэтому всё,
+что обычно делают сигналы (счётчики TaskStatsSnapshot, updated_at родительских задач,
+журнал дедлайнов для планировщика),
+здесь делается явно — одним запросом на пачку; поколение кэша ответов
+(tasks/response_cache.py) увеличивается один раз на пачку.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import response_cache
+from .deadlines import deadline_value, record_changes
+from .models import Task, SubTask
+from .stats import apply_delta
+
+BULK_BATCH_SIZE = 500
+
+
+def bulk_create_objects(model, objs, batch_size=BULK_BATCH_SIZE):
+    """Вставка пачки Task/SubTask в одной транзакции + обновление счётчиков статистики."""
+    if not objs:
+        return []
+    now = timezone.now()
+    for obj in objs:
+        obj.deadline = deadline_value(model, obj.deadline)  # то же, что сигнал pre_save
+        obj.is_overdue = obj.deadline is not None and obj.deadline <= now
+        if model is Task:
+            obj.title_folded = obj.title.casefold()  # то же, что Task.save()
+    with transaction.atomic():
+        created = model.objects.bulk_create(objs, batch_size=batch_size)
+        record_changes(model, [(obj.pk, obj.deadline) for obj in created])  # журнал планировщика дедлайнов
+        apply_delta(
+            model,
+            Counter(obj.status_id for obj in created),
+            sum(1 for obj in created if obj.description == ""),
+        )
+        if model is SubTask:
+            _touch_tasks({obj.task_id for obj in created})
+        response_cache.bump(model)
+        if model is Task and any(obj.deadline < now for obj in created):
+            response_cache.bump(response_cache.PAST_TASK_DEADLINES)  # закрытые интервалы таймлайна
+    return created
+
+
+def _touch_tasks(task_ids):
+    """Один UPDATE updated_at для задач (task_ids — набор id или подзапрос .values("task_id"))."""
+    Task.objects.filter(pk__in=task_ids).update(updated_at=timezone.now())
+
+
+def _status_counts(queryset):
+    """{status_id: (кол-во, кол-во без описания)} для выбранных строк — один GROUP BY."""
+    rows = queryset.values("status_id").annotate(
+        total=Count("id"), without_description=Count("id", filter=Q(description="")),
+    ).order_by()
+    return {row["status_id"]: (row["total"], row["without_description"]) for row in rows}
+
+
+def bulk_update_subtasks(ids, fields):
+    """
+    Один UPDATE для всех подзадач из ids. fields — {"status": Status, "description": str, "title": str}.
+    Возвращает число обновлённых строк.
+    """
+    with transaction.atomic():
+        queryset = SubTask.objects.filter(pk__in=ids)
+        before = _status_counts(queryset) if "status" in fields or "description" in fields else {}
+        updated = queryset.update(updated_at=timezone.now(), **fields)
+        _touch_tasks(queryset.values("task_id"))
+
+        if before:
+            total = sum(count for count, _ in before.values())
+            status_deltas = Counter()
+            if "status" in fields:
+                for status_id, (count, _) in before.items():
+                    status_deltas[status_id] -= count
+                status_deltas[fields["status"].pk] += total
+            description_delta = 0
+            if "description" in fields:
+                was_empty = sum(empty for _, empty in before.values())
+                description_delta = (total if fields["description"] == "" else 0) - was_empty
+            apply_delta(SubTask, status_deltas, description_delta)
+        response_cache.bump(SubTask)
+    return updated
+
+
+def bulk_delete_subtasks(ids):
+    """Один DELETE для всех подзадач из ids. Возвращает число удалённых строк."""
+    with transaction.atomic():
+        queryset = SubTask.objects.filter(pk__in=ids)
+        before = _status_counts(queryset)
+        _touch_tasks(queryset.values("task_id"))
+        # QuerySet.delete() при подключённых сигналах выбирает и удаляет строки поштучно;
+        # на SubTask никто не ссылается (каскадов нет), а сигналы заменяет одна дельта счётчиков
+        deleted = queryset._raw_delete(queryset.db)
+        record_changes(SubTask, [(pk, None) for pk in ids])
+        apply_delta(
+            SubTask,
+            {status_id: -count for status_id, (count, _) in before.items()},
+            -sum(empty for _, empty in before.values()),
+        )
+        response_cache.bump(SubTask)
+    return deleted
@@ -0,0 +1,196 @@
+# tasks/deadlines.py
+"""
+Планировщик дедлайнов для команды run_deadline_scheduler.
+
+Ближайшие события (напоминание за TASKS_DEADLINE_REMINDER_LEAD секунд до дедлайна
+и переход в просроченные) лежат в min-куче; воркер спит до вершины кучи, затем
+одним UPDATE на пачку выставляет is_overdue и пишет события в outbox (DeadlineEvent)
+только для объектов, дедлайн которых в БД всё ещё совпадает с запланированным.
+
+Полный скан делается один раз при старте. Дальше новые и изменённые дедлайны
+приходят через журнал DeadlineChange, который пишут сигналы (tasks/signals.py)
+и bulk-операции (tasks/bulk.py) в той же транзакции, что и сама запись.
+Воркер удаляет ровно прочитанные строки; без воркера журнал ограничен последними
+TASKS_DEADLINE_JOURNAL_MAX_ROWS записями (старые всё равно покрывает скан при старте).
+Устаревшие записи кучи не удаляются, а пропускаются при извлечении (ленивое удаление).
+"""
+import datetime
+import heapq
+import itertools
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import DeadlineChange, DeadlineEvent, SubTask, Task
+
+MODELS = {"task": Task, "subtask": SubTask}
+LABELS = {model: label for label, model in MODELS.items()}
+
+UPDATE_BATCH_SIZE = 500
+JOURNAL_POLL_SIZE = 2000
+JOURNAL_PRUNE_EVERY = 1000  # обрезка журнала — когда id переходит очередную тысячу
+
+
+def reminder_lead():
+    return datetime.timedelta(seconds=getattr(settings, "TASKS_DEADLINE_REMINDER_LEAD", 3600))
+
+
+def deadline_value(model, value):
+    """
+    Значение, присвоенное deadline, в том виде, в каком его запишет поле: строка разбирается
+    (DateTimeField.to_python), naive-время считается временем зоны по умолчанию.
+    Сравнивать с timezone.now() можно только результат.
+    """
+    value = model._meta.get_field("deadline").to_python(value)
+    if value is not None and settings.USE_TZ and timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.get_default_timezone())
+    return value
+
+
+def record_changes(model, pairs):
+    """Журнал для планировщика: pairs — [(pk, deadline или None для удалённых)], один INSERT на пачку."""
+    label = LABELS[model]
+    created = DeadlineChange.objects.bulk_create([
+        DeadlineChange(model=label, object_id=pk, deadline=deadline) for pk, deadline in pairs
+    ])
+    if created and created[-1].pk is not None:
+        first, last = created[0].pk, created[-1].pk
+        if (first - 1) // JOURNAL_PRUNE_EVERY != last // JOURNAL_PRUNE_EVERY:
+            prune_journal(last)
+
+
+def prune_journal(last_id):
+    """
+    Удаляет записи старше последних TASKS_DEADLINE_JOURNAL_MAX_ROWS — журнал не растёт,
+    пока воркер не запущен. Потерять можно только события по объектам, уже просроченным
+    при записи: ожидающие дедлайны воркер найдёт полным сканом при старте.
+    """
+    max_rows = getattr(settings, "TASKS_DEADLINE_JOURNAL_MAX_ROWS", 100_000)
+    DeadlineChange.objects.filter(id__lte=last_id - max_rows).delete()
+
+
+class DeadlineScheduler:
+    """
+    Состояние воркера: куча (время, порядковый номер, вид, модель, pk, дедлайн)
+    и текущий дедлайн каждого ожидающего объекта — по нему отсеиваются устаревшие записи.
+    """
+
+    def __init__(self, batch_size=UPDATE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.heap = []
+        self.deadlines = {}
+        self._seq = itertools.count()
+
+    # ---------- наполнение кучи ----------
+
+    def schedule(self, label, pk, deadline):
+        key = (label, pk)
+        if deadline is None:
+            self.deadlines.pop(key, None)
+            return
+        if self.deadlines.get(key) == deadline:
+            return
+        self.deadlines[key] = deadline
+        heapq.heappush(self.heap, (deadline - reminder_lead(), next(self._seq), DeadlineEvent.REMINDER, label, pk, deadline))
+        heapq.heappush(self.heap, (deadline, next(self._seq), DeadlineEvent.OVERDUE, label, pk, deadline))
+
+    def load(self):
+        """
+        Стартовая загрузка: все ещё не просроченные объекты (частичные индексы *_pending_deadline_idx).
+        Непрочитанный журнал не пропускается — в нём, например, задачи, созданные сразу просроченными,
+        пока воркер не работал; повторное применение записей безопасно.
+        """
+        for label, model in MODELS.items():
+            rows = model.objects.filter(is_overdue=False).values_list("id", "deadline")
+            for pk, deadline in rows.iterator(chunk_size=2000):
+                self.schedule(label, pk, deadline)
+
+    def poll_changes(self):
+        """
+        Применяет записи журнала и удаляет именно прочитанные. Возвращает их число.
+        Не «id > последнего прочитанного»: на PostgreSQL транзакция с меньшим id может
+        закоммититься позже — такая строка просто попадёт в следующий опрос.
+        """
+        total = 0
+        while True:
+            changes = list(
+                DeadlineChange.objects.order_by("id")
+                .values_list("id", "model", "object_id", "deadline")[:JOURNAL_POLL_SIZE]
+            )
+            for _, label, pk, deadline in changes:
+                self.schedule(label, pk, deadline)
+            if changes:
+                DeadlineChange.objects.filter(id__in=[change[0] for change in changes]).delete()
+            total += len(changes)
+            if len(changes) < JOURNAL_POLL_SIZE:
+                return total
+
+    # ---------- обработка наступивших событий ----------
+
+    def next_run_at(self):
+        """Время ближайшего актуального события или None."""
+        while self.heap:
+            _, _, _, label, pk, deadline = self.heap[0]
+            if self.deadlines.get((label, pk)) == deadline:
+                return self.heap[0][0]
+            heapq.heappop(self.heap)
+        return None
+
+    def pop_due(self, now):
+        """Снимает с кучи все наступившие актуальные события: {(вид, модель): [(pk, дедлайн)]}."""
+        due = {}
+        while self.heap and self.heap[0][0] <= now:
+            _, _, kind, label, pk, deadline = heapq.heappop(self.heap)
+            if self.deadlines.get((label, pk)) != deadline:
+                continue
+            if kind == DeadlineEvent.OVERDUE:
+                del self.deadlines[(label, pk)]
+            elif deadline <= now:
+                continue  # напоминание опоздало — дедлайн уже наступил, будет только «просрочена»
+            due.setdefault((kind, label), []).append((pk, deadline))
+        return due
+
+    def run_due(self, now=None):
+        """Обрабатывает наступившие события пачками. Возвращает {"reminder": n, "overdue": n}."""
+        now = now or timezone.now()
+        counts = {DeadlineEvent.REMINDER: 0, DeadlineEvent.OVERDUE: 0}
+        for (kind, label), items in self.pop_due(now).items():
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start:start + self.batch_size]
+                with transaction.atomic():
+                    # правки и удаления, ещё не дошедшие до журнала: событие — только если у объекта
+                    # всё ещё тот дедлайн, по которому оно запланировано
+                    current = dict(
+                        MODELS[label].objects.filter(pk__in=[pk for pk, _ in batch]).values_list("id", "deadline")
+                    )
+                    batch = [(pk, deadline) for pk, deadline in batch if current.get(pk) == deadline]
+                    if not batch:
+                        continue
+                    if kind == DeadlineEvent.OVERDUE:
+                        MODELS[label].objects.filter(
+                            pk__in=[pk for pk, _ in batch], is_overdue=False,
+                        ).update(is_overdue=True)
+                    DeadlineEvent.objects.bulk_create(
+                        [DeadlineEvent(kind=kind, model=label, object_id=pk, deadline=deadline, created_at=now)
+                         for pk, deadline in batch],
+                        ignore_conflicts=True,
+                    )
+                counts[kind] += len(batch)
+        return counts
+
+    # ---------- цикл воркера ----------
+
+    def run_forever(self, poll_interval, on_batch=None, should_stop=lambda: False):
+        """Спит до ближайшего события, но не дольше poll_interval — чтобы вовремя увидеть журнал."""
+        while not should_stop():
+            self.poll_changes()
+            counts = self.run_due()
+            if on_batch and any(counts.values()):
+                on_batch(counts)
+            next_at = self.next_run_at()
+            delay = poll_interval
+            if next_at is not None:
+                delay = min(delay, max((next_at - timezone.now()).total_seconds(), 0))
+            time.sleep(delay)
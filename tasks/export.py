@@ -0,0 +1,187 @@
+# tasks/export.py
+"""
+Потоковая выгрузка всех задач с подзадачами: NDJSON (задача на строку, подзадачи вложены
+в "subtasks") или CSV (строка на подзадачу, поля задачи повторяются; задача без подзадач —
+одна строка с пустыми колонками подзадачи).
+
+Всё читается в одной транзакции — согласованный снимок даже при параллельной записи
+(на PostgreSQL — REPEATABLE READ; на SQLite снимок даёт сама транзакция, но без WAL
+она держит блокировку чтения и запись ждёт её конца). Задачи идут через
+iterator(chunk_size) с prefetch подзадач на каждую пачку, вывод отдаётся кусками по пачке —
+память не зависит от размера таблиц. Сжатие gzip — потоково, тем же проходом.
+
+HTTP-выгрузка не держит транзакцию, пока клиент качает: spool_export() пишет поток
+во временный файл (до EXPORT_SPOOL_MEMORY в памяти, дальше на диске) и закрывает
+транзакцию, а клиенту отдаётся уже файл — iter_file() под WSGI, aiter_file() под ASGI
+(синхронный итератор Django под ASGI сначала целиком читает в память).
+
+Формат NDJSON читает команда import_tasks.
+"""
+import csv
+import io
+import json
+import tempfile
+import zlib
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from .models import Status, SubTask, Task
+
+EXPORT_CHUNK_SIZE = 500
+EXPORT_SPOOL_MEMORY = 1024 * 1024  # байт выгрузки в памяти, дальше — временный файл на диске
+EXPORT_BLOCK_SIZE = 64 * 1024  # размер куска при отдаче клиенту
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+FIELDS = ("id", "title", "description", "status", "deadline", "created_at", "updated_at", "is_overdue")
+CSV_COLUMNS = [f"task_{name}" for name in FIELDS] + [f"subtask_{name}" for name in FIELDS]
+
+
+@contextmanager
+def snapshot():
+    """Транзакция только для чтения, все запросы которой видят одно состояние БД."""
+    outermost = connection.get_autocommit()
+    with transaction.atomic():
+        if outermost and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        yield
+
+
+def export_queryset():
+    subtasks = SubTask.objects.order_by("created_at", "id")
+    return Task.objects.order_by("id").prefetch_related(Prefetch("subtasks", queryset=subtasks))
+
+
+class RecordBuilder:
+    """Задача/подзадача → dict полей FIELDS; имена статусов — из того же снимка."""
+
+    def __init__(self):
+        self.status_names = dict(Status.objects.values_list("id", "name"))
+        self._datetime = serializers.DateTimeField()  # формат дат как в API
+
+    def row(self, obj):
+        return {
+            "id": obj.id,
+            "title": obj.title,
+            "description": obj.description,
+            "status": self.status_names.get(obj.status_id),
+            "deadline": self._datetime.to_representation(obj.deadline),
+            "created_at": self._datetime.to_representation(obj.created_at),
+            "updated_at": self._datetime.to_representation(obj.updated_at),
+            "is_overdue": obj.is_overdue,
+        }
+
+
+def iter_chunks(chunk_size=EXPORT_CHUNK_SIZE):
+    """Пачки задач с уже подгруженными подзадачами (один запрос подзадач на пачку)."""
+    chunk = []
+    for task in export_queryset().iterator(chunk_size=chunk_size):
+        chunk.append(task)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def render_ndjson(builder, tasks):
+    lines = []
+    for task in tasks:
+        record = builder.row(task)
+        record["subtasks"] = [builder.row(subtask) for subtask in task.subtasks.all()]
+        lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+    return "".join(lines)
+
+
+class CsvRenderer:
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def header(self):
+        self._writer.writerow(CSV_COLUMNS)
+        return self._drain()
+
+    def __call__(self, builder, tasks):
+        empty = [""] * len(FIELDS)
+        for task in tasks:
+            task_row = list(builder.row(task).values())
+            subtasks = task.subtasks.all()
+            for subtask in subtasks:
+                self._writer.writerow(task_row + list(builder.row(subtask).values()))
+            if not subtasks:
+                self._writer.writerow(task_row + empty)
+        return self._drain()
+
+    def _drain(self):
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+
+def export_stream(fmt="ndjson", compress=False, chunk_size=EXPORT_CHUNK_SIZE, stats=None):
+    """
+    Генератор кусков bytes (по одному на пачку задач). stats — dict, в который
+    по ходу пишутся счётчики "tasks" и "subtasks".
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    stats = {} if stats is None else stats
+    stats.update(tasks=0, subtasks=0)
+    # wbits=31 — gzip-контейнер (заголовок и CRC), а не «голый» zlib
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def encode(text):
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    with snapshot():
+        builder = RecordBuilder()
+        render = render_ndjson
+        if fmt == "csv":
+            render = CsvRenderer()
+            yield encode(render.header())
+        for tasks in iter_chunks(chunk_size):
+            stats["tasks"] += len(tasks)
+            stats["subtasks"] += sum(len(task.subtasks.all()) for task in tasks)
+            data = encode(render(builder, tasks))
+            if data:
+                yield data
+    if compressor:
+        yield compressor.flush()
+
+
+def spool_export(fmt="ndjson", compress=False, chunk_size=EXPORT_CHUNK_SIZE, stats=None):
+    """Вся выгрузка во временном файле (позиция — в начале); транзакция снимка к возврату закрыта."""
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MEMORY)
+    try:
+        for data in export_stream(fmt, compress=compress, chunk_size=chunk_size, stats=stats):
+            spool.write(data)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def iter_file(spool, block_size=EXPORT_BLOCK_SIZE):
+    with spool:
+        while data := spool.read(block_size):
+            yield data
+
+
+async def aiter_file(spool, block_size=EXPORT_BLOCK_SIZE):
+    # чтение с диска — в пуле потоков, не в event loop
+    read = sync_to_async(spool.read, thread_sensitive=False)
+    try:
+        while data := await read(block_size):
+            yield data
+    finally:
+        spool.close()
@@ -0,0 +1,119 @@
+# tasks/filters.py
+import django_filters
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+from .models import Task, SubTask
+from .status_registry import status_registry
+
+
+class StatusNameFilterSet(django_filters.FilterSet):
+    """
+    ?status__name=To Do превращается в status_id через реестр статусов —
+    фильтр идёт по индексированной колонке без JOIN со Status.
+    """
+    status__name = django_filters.CharFilter(method="filter_status_name")
+
+    def filter_status_name(self, queryset, name, value):
+        status_id = status_registry.id_for_name(value)
+        if status_id is None:
+            return queryset.none()
+        return queryset.filter(status_id=status_id)
+
+
+class TaskFilter(StatusNameFilterSet):
+    class Meta:
+        model = Task
+        fields = {
+            "status": ["exact"],  # фильтр по id (например ?status=1)
+            "deadline": ["exact", "lte", "gte"],
+        }
+
+
+class SubTaskFilter(StatusNameFilterSet):
+    class Meta:
+        model = SubTask
+        fields = ["status_id", "deadline", "task_id"]
+
+
+# ---------- Полнотекстовый поиск: ?search= ----------
+
+FTS_TABLES = {Task: "tasks_task_fts", SubTask: "tasks_subtask_fts"}  # см. миграцию 0009_fts5_search
+
+_fts_ready = {}
+
+
+def fts_available(model, using="default"):
+    """Есть ли FTS5-индекс модели в этой БД (проверяется один раз на алиас)."""
+    table = FTS_TABLES.get(model)
+    if table is None:
+        return False
+    key = (using, table)
+    if key not in _fts_ready:
+        connection = connections[using]
+        if connection.vendor != "sqlite":
+            _fts_ready[key] = False
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [table])
+                _fts_ready[key] = cursor.fetchone() is not None
+    return _fts_ready[key]
+
+
+async def afts_available(model, using="default"):
+    """fts_available() для async-вьюх: проверка sqlite_master — один раз, дальше из памяти."""
+    if (using, FTS_TABLES.get(model)) in _fts_ready:
+        return _fts_ready[(using, FTS_TABLES[model])]
+    return await sync_to_async(fts_available)(model, using)
+
+
+def fts_match_query(terms):
+    """['api', 'док'] → '"api"* "док"*': все слова обязательны, каждое — как префикс."""
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    ?search= через FTS5 вместо LIKE '%...%' по search_fields.
+    - каждое слово ищется как префикс («док» найдёт «документация»), все слова обязательны
+    - найденные строки получают аннотацию rank (bm25: меньше — релевантнее),
+      по ней сортирует RankOrderingFilter
+    - на СУБД без FTS5 — обычный SearchFilter (icontains)
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or not fts_available(queryset.model, queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        fts = FTS_TABLES[queryset.model]
+        table = queryset.model._meta.db_table
+        match = fts_match_query(terms)
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [match])
+        ).annotate(
+            rank=RawSQL(
+                f"SELECT bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND {fts}.rowid = {table}.id",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+
+class RankOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter, знающий про rank из FullTextSearchFilter:
+    при поиске без ?ordering строки идут по релевантности, ?ordering=rank без поиска игнорируется.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        has_rank = "rank" in queryset.query.annotations
+        if has_rank and not request.query_params.get(self.ordering_param):
+            return ["rank"]
+        ordering = super().get_ordering(request, queryset, view)
+        if not has_rank and ordering:
+            ordering = [field for field in ordering if field.lstrip("-") != "rank"] or self.get_default_ordering(view)
+        return ordering
@@ -0,0 +1,45 @@
+# tasks/fts.py
+"""
+Триггеры синхронизации FTS5-индексов поиска (созданы миграцией 0009_fts5_search, только SQLite).
+
+Триггеры живут на самих таблицах задач: SQLite-миграции, которые пересоздают таблицу
+(AddField, AlterField и т.п.), удаляют их вместе со старой таблицей. Такие миграции
+должны вызвать restore_triggers(schema_editor) в RunPython после своих операций.
+"""
+
+FTS_TABLES = (
+    ('tasks_task', 'tasks_task_fts'),
+    ('tasks_subtask', 'tasks_subtask_fts'),
+)
+
+
+def create_triggers(cursor, table, fts):
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF title, description ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO {fts}(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """)
+
+
+def restore_triggers(schema_editor):
+    """Заново создаёт триггеры существующих FTS-таблиц (после пересоздания tasks_task/tasks_subtask)."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, fts in FTS_TABLES:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [fts])
+            if cursor.fetchone() is not None:
+                create_triggers(cursor, table, fts)
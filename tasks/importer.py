@@ -0,0 +1,184 @@
+# tasks/importer.py
+"""
+Потоковый импорт задач из NDJSON (формат выгрузки tasks/export.py: задача на строку,
+подзадачи в "subtasks"; id из файла не используются — создаются новые строки).
+
+Файл читается построчно, записи проверяются и копятся в пачку; пачка пишется через
+bulk_create_objects (tasks/bulk.py) — задачи, затем их подзадачи — в одной транзакции.
+Статусы разрешаются по имени через таблицу, построенную один раз из реестра статусов.
+
+После каждой транзакции позиция в файле (байт после последней записанной строки)
+сохраняется в файл контрольной точки — после падения импорт продолжается с неё
+(--resume или --offset). Пачка, упавшая между COMMIT и записью точки, при продолжении
+будет вставлена повторно: окно — одна пачка.
+"""
+import gzip
+import json
+import os
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .bulk import bulk_create_objects
+from .models import SubTask, Task
+from .status_registry import status_registry
+
+IMPORT_BATCH_SIZE = 1000
+TITLE_MAX_LENGTH = Task._meta.get_field("title").max_length
+
+
+class RecordError(ValueError):
+    pass
+
+
+def open_source(path):
+    """Бинарный поток: смещения — в байтах несжатого содержимого (для .gz тоже)."""
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def _datetime(value, name, required=True):
+    if value in (None, ""):
+        if required:
+            raise RecordError(f"{name}: обязательное поле")
+        return None
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        raise RecordError(f"{name}: некорректная дата {value!r}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class RecordParser:
+    """dict записи → (Task, [SubTask]) без запросов к БД; статусы — из таблицы имя → id."""
+
+    def __init__(self):
+        self.status_ids = {name: pk for pk, name in status_registry.names_by_id().items()}
+        self.default_status_id = None
+
+    def status_id(self, name):
+        if name in (None, ""):
+            if self.default_status_id is None:
+                self.default_status_id = status_registry.default_status().pk
+            return self.default_status_id
+        try:
+            return self.status_ids[name]
+        except KeyError:
+            raise RecordError(f"status: неизвестный статус {name!r}")
+
+    def fields(self, data):
+        if not isinstance(data, dict):
+            raise RecordError("ожидается JSON-объект")
+        title = data.get("title")
+        if not isinstance(title, str) or not title.strip():
+            raise RecordError("title: обязательное поле")
+        if len(title) > TITLE_MAX_LENGTH:
+            raise RecordError(f"title: не длиннее {TITLE_MAX_LENGTH} символов")
+        description = data.get("description") or ""
+        if not isinstance(description, str):
+            raise RecordError("description: ожидается строка")
+        fields = {
+            "title": title,
+            "description": description,
+            "status_id": self.status_id(data.get("status")),
+            "deadline": _datetime(data.get("deadline"), "deadline"),
+        }
+        created_at = _datetime(data.get("created_at"), "created_at", required=False)
+        if created_at:
+            fields["created_at"] = created_at
+        return fields
+
+    def parse(self, data):
+        task = Task(**self.fields(data))
+        subtasks = data.get("subtasks") or []
+        if not isinstance(subtasks, list):
+            raise RecordError("subtasks: ожидается массив")
+        try:
+            return task, [SubTask(**self.fields(item)) for item in subtasks]
+        except RecordError as exc:
+            raise RecordError(f"subtasks: {exc}")
+
+
+@dataclass
+class ImportStats:
+    tasks: int = 0
+    subtasks: int = 0
+    skipped: int = 0
+    offset: int = 0
+    errors: list = field(default_factory=list)  # [(байтовое смещение строки, сообщение)]
+
+
+def write_checkpoint(path, source, stats):
+    """Атомарная запись: временный файл + os.replace."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"file": os.path.abspath(source), "offset": stats.offset,
+                   "tasks": stats.tasks, "subtasks": stats.subtasks}, f)
+    os.replace(tmp, path)
+
+
+def read_checkpoint(path, source):
+    """Смещение из контрольной точки этого же файла; 0, если точки нет."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return 0
+    if data.get("file") != os.path.abspath(source):
+        raise ValueError(f"Контрольная точка {path} относится к другому файлу: {data.get('file')}")
+    return data["offset"]
+
+
+def _write_batch(batch):
+    """Пачка [(Task, [SubTask])] — одна транзакция: bulk-вставка задач, затем подзадач."""
+    with transaction.atomic():
+        created = bulk_create_objects(Task, [task for task, _ in batch])
+        subtasks = []
+        for task, (_, items) in zip(created, batch):
+            for subtask in items:
+                subtask.task = task
+                subtasks.append(subtask)
+        bulk_create_objects(SubTask, subtasks)
+    return len(created), len(subtasks)
+
+
+def import_ndjson(path, offset=0, batch_size=IMPORT_BATCH_SIZE, checkpoint=None, on_batch=None,
+                  max_errors=100):
+    """
+    Импортирует файл начиная с байта offset. После каждой закоммиченной пачки обновляет
+    checkpoint (если задан) и вызывает on_batch(stats). Возвращает ImportStats.
+    """
+    stats = ImportStats(offset=offset)
+    parser = RecordParser()
+    batch = []
+    with open_source(path) as source:
+        source.seek(offset)
+        position = offset
+        for line in source:
+            line_offset, position = position, position + len(line)
+            if line.strip():
+                try:
+                    batch.append(parser.parse(json.loads(line)))
+                except (RecordError, ValueError) as exc:  # JSONDecodeError — тоже ValueError
+                    stats.skipped += 1
+                    if len(stats.errors) < max_errors:
+                        stats.errors.append((line_offset, str(exc)))
+            if len(batch) >= batch_size:
+                _flush(batch, position, stats, path, checkpoint, on_batch)
+                batch = []
+        _flush(batch, position, stats, path, checkpoint, on_batch)
+    return stats
+
+
+def _flush(batch, position, stats, path, checkpoint, on_batch):
+    if batch:
+        tasks, subtasks = _write_batch(batch)
+        stats.tasks += tasks
+        stats.subtasks += subtasks
+    stats.offset = position
+    if checkpoint:
+        write_checkpoint(checkpoint, path, stats)
+    if batch and on_batch:
+        on_batch(stats)
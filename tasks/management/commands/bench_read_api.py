@@ -0,0 +1,147 @@
+# tasks/management/commands/bench_read_api.py
+import asyncio
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.utils import timezone
+
+from tasks.bulk import bulk_create_objects
+from tasks.models import SubTask, Task
+from tasks.status_registry import status_registry
+
+# эндпоинт → (синхронный путь, async-путь); {task}/{subtask} — id первой задачи/подзадачи
+ENDPOINTS = {
+    "list": ("/api/tasks/?page_size=50", "/api/async/tasks/?page_size=50"),
+    "subtasks": ("/api/subtasks/?page_size=50", "/api/async/subtasks/?page_size=50"),
+    "detail": ("/api/tasks/{task}/", "/api/async/tasks/{task}/"),
+    "stats": ("/api/stats/", "/api/async/stats/"),
+}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает синхронные read-эндпоинты (WSGI, поток на запрос) с async-версиями (ASGI, /api/async/...) '
+        'под конкурентной нагрузкой: запросов в секунду, p50 и p99'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Запросов на эндпоинт и режим')
+        parser.add_argument('--concurrency', type=int, default=20, help='Одновременных запросов')
+        parser.add_argument('--endpoint', choices=[*ENDPOINTS, 'all'], default='all')
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Если задач нет — создать столько задач (по подзадаче на каждую) через bulk-вставку',
+        )
+        parser.add_argument(
+            '--with-cache', action='store_true',
+            help='Не отключать кэш ответов (по умолчанию меряются сами запросы к БД)',
+        )
+        parser.add_argument(
+            '--sync-url', help='Внешний WSGI-сервер (gunicorn), например http://127.0.0.1:8000',
+        )
+        parser.add_argument(
+            '--async-url', help='Внешний ASGI-сервер (uvicorn), например http://127.0.0.1:8001',
+        )
+
+    def handle(self, *args, **options):
+        if options['seed'] and not Task.objects.exists():
+            self.seed(options['seed'])
+        task_id = Task.objects.order_by('id').values_list('id', flat=True).first()
+        subtask_id = SubTask.objects.order_by('id').values_list('id', flat=True).first()
+        if task_id is None:
+            raise CommandError('Нет задач: запустите с --seed 1000 или заполните БД через POST /api/tasks/bulk/')
+        ids = {'task': task_id, 'subtask': subtask_id}
+
+        endpoints = list(ENDPOINTS) if options['endpoint'] == 'all' else [options['endpoint']]
+        overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}
+        if not options['with_cache']:
+            overrides['CACHES'] = {
+                **settings.CACHES,
+                'bench-nocache': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+            }
+            overrides['TASKS_RESPONSE_CACHE'] = 'bench-nocache'
+
+        self.stdout.write(
+            f"{'endpoint':<10} {'mode':<6} {'req/s':>9} {'p50, ms':>9} {'p99, ms':>9} {'errors':>7}"
+        )
+        with override_settings(**overrides):
+            for name in endpoints:
+                sync_path, async_path = (path.format(**ids) for path in ENDPOINTS[name])
+                self.report(name, 'wsgi', self.run_threads(sync_path, options, options['sync_url']))
+                if options['async_url']:
+                    result = self.run_threads(async_path, options, options['async_url'])
+                else:
+                    result = asyncio.run(self.run_async(async_path, options))
+                self.report(name, 'asgi', result)
+
+    def seed(self, count):
+        status = status_registry.default_status()
+        deadline = timezone.now() + timedelta(days=30)
+        tasks = bulk_create_objects(Task, [
+            Task(title=f"Bench task {i}", description="bench" if i % 2 else "", status=status, deadline=deadline)
+            for i in range(count)
+        ])
+        bulk_create_objects(SubTask, [
+            SubTask(title=f"Bench subtask {task.pk}", status=status, deadline=deadline, task=task) for task in tasks
+        ])
+        self.stdout.write(f'Создано задач: {count}')
+
+    # ---------- нагрузка ----------
+
+    def run_threads(self, path, options, base_url=None):
+        """Поток на одновременный запрос — как воркер WSGI-сервера с пулом потоков."""
+        client = None if base_url else Client()
+
+        def request(_):
+            started = time.perf_counter()
+            if base_url:
+                try:
+                    with urllib.request.urlopen(base_url.rstrip('/') + path) as response:
+                        response.read()
+                        code = response.status
+                except urllib.error.HTTPError as exc:
+                    code = exc.code
+            else:
+                code = client.get(path).status_code
+            return time.perf_counter() - started, code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(request, range(options['requests'])))
+        return time.perf_counter() - started, results
+
+    async def run_async(self, path, options):
+        """Все запросы в одном event loop, не больше concurrency одновременно — как ASGI-воркер."""
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(options['concurrency'])
+
+        async def request():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(request() for _ in range(options['requests'])))
+        return time.perf_counter() - started, results
+
+    def report(self, name, mode, result):
+        elapsed, results = result
+        latencies = [latency * 1000 for latency, _ in results]
+        errors = sum(1 for _, code in results if code >= 400)
+        self.stdout.write(
+            f"{name:<10} {mode:<6} {len(results) / elapsed:>9.1f} "
+            f"{statistics.median(latencies):>9.2f} {percentile(latencies, 99):>9.2f} {errors:>7}"
+        )
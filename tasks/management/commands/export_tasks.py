@@ -0,0 +1,49 @@
+# tasks/management/commands/export_tasks.py
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.export import EXPORT_CHUNK_SIZE, FORMATS, export_stream
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает все задачи с подзадачами в NDJSON или CSV из согласованного снимка БД, '
+        'потоково (память не зависит от числа задач); .gz в имени файла или --gzip — сжатие на лету'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', nargs='?', default='-', help='Файл для выгрузки; "-" — stdout')
+        parser.add_argument('--format', choices=list(FORMATS), default=None,
+                            help='По умолчанию — по расширению файла, иначе ndjson')
+        parser.add_argument('--gzip', action='store_true', help='Сжимать gzip (для .gz включается само)')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Задач в одной пачке')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        compress = options['gzip'] or output.endswith('.gz')
+        fmt = options['format'] or ('csv' if output.removesuffix('.gz').endswith('.csv') else 'ndjson')
+
+        stats = {}
+        started = time.perf_counter()
+        try:
+            stream = sys.stdout.buffer if output == '-' else open(output, 'wb')
+        except OSError as exc:
+            raise CommandError(f'Не удалось открыть {output}: {exc}')
+        try:
+            for data in export_stream(fmt, compress=compress, chunk_size=options['chunk_size'], stats=stats):
+                stream.write(data)
+        finally:
+            if output == '-':
+                stream.flush()
+            else:
+                stream.close()
+        elapsed = time.perf_counter() - started
+
+        # при выгрузке в stdout отчёт идёт в stderr, чтобы не смешиваться с данными
+        report = self.stderr if output == '-' else self.stdout
+        report.write(self.style.SUCCESS(
+            f"✅ Задач: {stats['tasks']}, подзадач: {stats['subtasks']}, "
+            f"{stats['tasks'] / elapsed if elapsed else 0:.0f} задач/с ({fmt}{', gzip' if compress else ''})"
+        ))
@@ -0,0 +1,56 @@
+# tasks/management/commands/import_tasks.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.importer import IMPORT_BATCH_SIZE, import_ndjson, read_checkpoint
+
+SHOWN_ERRORS = 10
+
+
+class Command(BaseCommand):
+    help = (
+        'Импорт задач с подзадачами из NDJSON (формат export_tasks, можно .gz): потоковое чтение, '
+        'bulk-вставка пачками в отдельных транзакциях, продолжение с байтового смещения после сбоя'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='NDJSON-файл: задача на строку, подзадачи в "subtasks"')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Задач в одной транзакции')
+        parser.add_argument('--offset', type=int, default=None, help='Начать с этого байта (начало строки)')
+        parser.add_argument('--resume', action='store_true', help='Продолжить с позиции из контрольной точки')
+        parser.add_argument('--checkpoint', help='Файл контрольной точки (по умолчанию <file>.checkpoint)')
+
+    def handle(self, *args, **options):
+        path = options['file']
+        checkpoint = options['checkpoint'] or f'{path}.checkpoint'
+        if options['resume'] and options['offset'] is not None:
+            raise CommandError('Укажите либо --resume, либо --offset')
+        try:
+            offset = read_checkpoint(checkpoint, path) if options['resume'] else options['offset'] or 0
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if offset:
+            self.stdout.write(f'Продолжение с байта {offset}')
+
+        started = time.perf_counter()
+
+        def progress(stats):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'… задач: {stats.tasks}, подзадач: {stats.subtasks}, байт: {stats.offset}')
+
+        try:
+            stats = import_ndjson(path, offset=offset, batch_size=options['batch_size'],
+                                  checkpoint=checkpoint, on_batch=progress)
+        except OSError as exc:
+            raise CommandError(f'Не удалось прочитать {path}: {exc}')
+        elapsed = time.perf_counter() - started
+
+        for line_offset, message in stats.errors[:SHOWN_ERRORS]:
+            self.stderr.write(f'байт {line_offset}: {message}')
+        rows = stats.tasks + stats.subtasks
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Задач: {stats.tasks}, подзадач: {stats.subtasks}, пропущено записей: {stats.skipped}, '
+            f'{rows / elapsed if elapsed else 0:.0f} строк/с'
+        ))
+        self.stdout.write(f'Контрольная точка: {checkpoint} (байт {stats.offset})')
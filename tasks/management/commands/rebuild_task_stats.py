@@ -0,0 +1,29 @@
+# tasks/management/commands/rebuild_task_stats.py
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.stats import compare_snapshot, rebuild_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает счётчики TaskStatsSnapshot с нуля или сверяет их с живыми агрегатами (--check)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Только сверить снапшот с живыми данными; код выхода 1 при расхождении',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            mismatches = compare_snapshot()
+            if mismatches:
+                for line in mismatches:
+                    self.stderr.write(line)
+                raise CommandError(f'Снапшот статистики рассинхронизирован: {len(mismatches)} расхождений')
+            self.stdout.write(self.style.SUCCESS('✅ Снапшот статистики совпадает с живыми данными'))
+            return
+
+        snapshot = rebuild_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Снапшот пересобран: задач {snapshot.tasks_total}, подзадач {snapshot.subtasks_total}'
+        ))
@@ -0,0 +1,44 @@
+# tasks/management/commands/run_deadline_scheduler.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.deadlines import UPDATE_BATCH_SIZE, DeadlineScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        'Воркер дедлайнов: держит ближайшие дедлайны в куче, помечает просроченные задачи/подзадачи '
+        'пачками UPDATE и пишет напоминания/просрочки в outbox DeadlineEvent'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Загрузить дедлайны, обработать всё наступившее и выйти (для cron/тестов)',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'TASKS_DEADLINE_POLL_INTERVAL', 5.0),
+            help='Максимальный сон между проверками журнала изменений, сек.',
+        )
+        parser.add_argument('--batch-size', type=int, default=UPDATE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        scheduler = DeadlineScheduler(batch_size=options['batch_size'])
+        scheduler.load()
+        self.stdout.write(f'Загружено дедлайнов: {len(scheduler.deadlines)}')
+
+        if options['once']:
+            scheduler.poll_changes()
+            self.report(scheduler.run_due())
+            return
+
+        try:
+            scheduler.run_forever(options['poll_interval'], on_batch=self.report)
+        except KeyboardInterrupt:
+            self.stdout.write('Остановлено')
+
+    def report(self, counts):
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Напоминаний: {counts['reminder']}, просрочено: {counts['overdue']}"
+        ))
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_created_at_alter_subtask_created_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['task', 'created_at'], name='subtask_task_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['status', 'deadline'], name='subtask_status_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['deadline'], name='subtask_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['created_at', 'id'], name='subtask_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(condition=models.Q(('description', '')), fields=['deadline'], name='subtask_no_description_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'deadline'], name='task_status_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['deadline'], name='task_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_at', 'id'], name='task_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('description', '')), fields=['deadline'], name='task_no_description_idx'),
+        ),
+    ]
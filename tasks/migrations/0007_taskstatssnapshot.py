@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:21
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def build_snapshot(apps, schema_editor):
+    """Первичное заполнение счётчиков по текущим данным."""
+    TaskStatsSnapshot = apps.get_model('tasks', 'TaskStatsSnapshot')
+    values = {}
+    for prefix, model_name in (('tasks', 'Task'), ('subtasks', 'SubTask')):
+        model = apps.get_model('tasks', model_name)
+        rows = model.objects.values('status_id').annotate(
+            total=Count('id'), without_description=Count('id', filter=Q(description='')),
+        ).order_by()
+        by_status = {str(row['status_id']): row['total'] for row in rows}
+        values[f'{prefix}_total'] = sum(by_status.values())
+        values[f'{prefix}_without_description'] = sum(row['without_description'] for row in rows)
+        values[f'{prefix}_by_status'] = by_status
+    TaskStatsSnapshot.objects.update_or_create(pk=1, defaults=values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_subtask_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tasks_total', models.IntegerField(default=0)),
+                ('tasks_without_description', models.IntegerField(default=0)),
+                ('tasks_by_status', models.JSONField(default=dict)),
+                ('subtasks_total', models.IntegerField(default=0)),
+                ('subtasks_without_description', models.IntegerField(default=0)),
+                ('subtasks_by_status', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(build_snapshot, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Полнотекстовый поиск (?search=) для SQLite: FTS5-индексы по title/description,
+# синхронизируемые триггерами. На других СУБД миграция ничего не делает —
+# tasks.filters.FullTextSearchFilter там откатывается на icontains.
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+FTS_TABLES = (
+    ('tasks_task', 'tasks_task_fts'),
+    ('tasks_subtask', 'tasks_subtask_fts'),
+)
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, fts in FTS_TABLES:
+            try:
+                # external content: FTS хранит только индекс, текст читается из самой таблицы
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {fts} USING fts5("
+                    f"title, description, content='{table}', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2')"
+                )
+            except OperationalError:
+                return  # SQLite собран без FTS5 — поиск останется на icontains
+            cursor.execute(f"""
+                CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts}(rowid, title, description) VALUES (new.id, new.title, new.description);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, title, description)
+                    VALUES ('delete', old.id, old.title, old.description);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER {fts}_au AFTER UPDATE OF title, description ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, title, description)
+                    VALUES ('delete', old.id, old.title, old.description);
+                    INSERT INTO {fts}(rowid, title, description) VALUES (new.id, new.title, new.description);
+                END
+            """)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for _, fts in FTS_TABLES:
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_subtask_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
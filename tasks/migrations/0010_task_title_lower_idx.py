@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:36
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_fts5_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='task_title_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:41
+
+from django.db import migrations, models
+import django.utils.timezone
+
+from tasks import fts
+
+
+def restore_fts_triggers(apps, schema_editor):
+    # AddField на SQLite пересоздаёт таблицы задач вместе с их FTS-триггерами
+    fts.restore_triggers(schema_editor)
+
+
+def mark_overdue(apps, schema_editor):
+    # уже прошедшие дедлайны помечаем сразу, чтобы планировщик при первом запуске
+    # не выдал событие «просрочена» для всей истории
+    now = django.utils.timezone.now()
+    for name in ('Task', 'SubTask'):
+        apps.get_model('tasks', name).objects.filter(deadline__lte=now).update(is_overdue=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_task_title_lower_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeadlineChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('deadline', models.DateTimeField(null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DeadlineEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('reminder', 'Напоминание'), ('overdue', 'Просрочена')], max_length=10)),
+                ('model', models.CharField(max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('deadline', models.DateTimeField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='subtask',
+            name='is_overdue',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='is_overdue',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(condition=models.Q(('is_overdue', False)), fields=['deadline'], name='subtask_pending_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_overdue', False)), fields=['deadline'], name='task_pending_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deadlineevent',
+            index=models.Index(condition=models.Q(('delivered_at__isnull', True)), fields=['id'], name='deadline_event_pending_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='deadlineevent',
+            constraint=models.UniqueConstraint(fields=('kind', 'model', 'object_id', 'deadline'), name='deadline_event_unique'),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+        migrations.RunPython(mark_overdue, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:24
+
+from django.db import migrations, models
+
+from tasks import fts
+
+
+def fill_title_folded(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    batch = []
+    for task in Task.objects.only('id', 'title').iterator(chunk_size=2000):
+        task.title_folded = task.title.casefold()
+        batch.append(task)
+        if len(batch) >= 2000:
+            Task.objects.bulk_update(batch, ['title_folded'])
+            batch = []
+    Task.objects.bulk_update(batch, ['title_folded'])
+
+
+def restore_fts_triggers(apps, schema_editor):
+    # AddField на SQLite пересоздаёт tasks_task вместе с её FTS-триггерами
+    fts.restore_triggers(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_deadline_scheduler'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_title_lower_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='title_folded',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['title_folded', 'id'], name='task_title_folded_idx'),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+        migrations.RunPython(fill_title_folded, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,162 @@
+# tasks/mixins.py
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from . import response_cache
+from .models import Task
+
+
+class LeanListMixin:
+    """
+    Для GET-списков обходит ModelSerializer: фильтры/поиск/сортировка/пагинация
+    применяются как обычно, но строки берутся через .values() и превращаются
+    в dict-ы lean_serializer_class. Запись (POST) идёт через serializer_class.
+    """
+    lean_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.lean_serializer_class is None or request.method not in ("GET", "HEAD"):
+            return super().list(request, *args, **kwargs)
+
+        lean = self.lean_serializer_class()
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = lean.values_fields
+        if "rank" in queryset.query.annotations:
+            fields += ("rank",)  # релевантность ?search= — позиция keyset-курсора
+        queryset = queryset.values(*fields)
+
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else queryset
+        data = [lean.to_representation(row) for row in rows]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class CachedListMixin:
+    """
+    Кэширует GET-списки (tasks/response_cache.py): в кэш кладётся response.data,
+    а не отрендеренные байты, поэтому JSON и browsable API делят одну запись.
+    cache_models — модели, изменение которых должно сбрасывать ответ.
+    Заголовок X-Cache: HIT/MISS.
+    """
+    cache_name = None
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().list(request, *args, **kwargs)
+
+        key = response_cache.make_key(self.cache_name, request, self.cache_models)
+        data = response_cache.lookup(self.cache_name, key)
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response_cache.store(key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class BulkCreateMixin:
+    """
+    POST массива объектов (serializer_class с list_serializer_class=BulkCreateListSerializer).
+    Все task_id из пачки разрешаются одним запросом и кладутся в контекст сериализатора,
+    status_id — через реестр статусов; ошибки валидных элементов не отменяют.
+    Ответ: {"created": [...], "errors": [{"index": i, "errors": {...}}]},
+    201 — всё создано, 207 — часть с ошибками, 400 — ничего не создано.
+    """
+    read_serializer_class = None
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        request = getattr(self, "request", None)
+        if request is not None and request.method == "POST" and isinstance(request.data, list):
+            context.update(self.resolve_references(request.data))
+        return context
+
+    @staticmethod
+    def _collect_ids(items, key):
+        ids = set()
+        for item in items:
+            if isinstance(item, dict):
+                try:
+                    ids.add(int(item[key]))
+                except (KeyError, TypeError, ValueError):
+                    pass
+        return ids
+
+    def resolve_references(self, items):
+        # status_id и статус по умолчанию разрешает реестр статусов — здесь только задачи
+        context = {}
+        task_ids = self._collect_ids(items, "task_id")
+        if task_ids:
+            # для подзадач нужен только сам факт существования задачи — грузим одни id
+            context["tasks"] = Task.objects.only("id").in_bulk(task_ids)
+        return context
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        created = serializer.save()
+        errors = serializer.item_errors
+
+        if not errors:
+            code = status.HTTP_201_CREATED
+        elif created:
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        return Response({
+            "created": self.read_serializer_class(created, many=True).data,
+            "errors": errors,
+        }, status=code)
+
+
+def conditional_etag(model, pk, last_modified):
+    """ETag деталки: модель + pk + updated_at (общий для DRF- и async-вьюх)."""
+    return quote_etag(f"{model._meta.model_name}-{pk}-{last_modified.timestamp():.6f}")
+
+
+class ConditionalRetrieveMixin:
+    """
+    ETag/Last-Modified для GET деталки.
+    Перед сериализацией делается один запрос по первичному ключу за updated_at
+    (conditional_fields); если клиент прислал совпадающий If-None-Match
+    или свежий If-Modified-Since — сразу 304 без загрузки и сериализации объекта.
+    """
+    conditional_fields = ("updated_at",)
+
+    def get_conditional_state(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        values = (
+            self.get_queryset().model.objects
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values_list(*self.conditional_fields)
+            .first()
+        )
+        if values is None:
+            return None, None
+        last_modified = max(values)
+        pk = self.kwargs[lookup_url_kwarg]
+        etag = conditional_etag(self.get_queryset().model, pk, last_modified)
+        return etag, last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_conditional_state()
+        if etag is None:
+            return super().retrieve(request, *args, **kwargs)  # 404 как обычно
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified.timestamp())
+        )
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
@@ -16,9 +17,41 @@ class Task(models.Model):
     status = models.ForeignKey(Status, on_delete=models.CASCADE)
     deadline = models.DateTimeField()
     created_at = models.DateTimeField(default=timezone.now)
+    # Меняется и при изменении подзадач (tasks/signals.py) — основа ETag/Last-Modified деталки
+    updated_at = models.DateTimeField(auto_now=True)
+    # Выставляется при записи (сигнал pre_save) и воркером run_deadline_scheduler, когда дедлайн наступает
+    is_overdue = models.BooleanField(default=False)
+    # title.casefold() для автодополнения (tasks/querysets.py): LOWER() в SQLite меняет регистр только у ASCII
+    title_folded = models.TextField(default="", editable=False)
+
+    class Meta:
+        indexes = [
+            # ?status=..&ordering=deadline, api_task_list(status=...), by_status + overdue
+            models.Index(fields=["status", "deadline"], name="task_status_deadline_idx"),
+            # deadline__lt=now, order_by("-deadline"), admin date_hierarchy
+            models.Index(fields=["deadline"], name="task_deadline_idx"),
+            # keyset-пагинация (created_at, id)
+            models.Index(fields=["created_at", "id"], name="task_created_id_idx"),
+            # частичный индекс для подсчёта задач без описания
+            models.Index(fields=["deadline"], condition=Q(description=""), name="task_no_description_idx"),
+            # автодополнение по началу названия: title_folded BETWEEN q AND q+1 (tasks/querysets.py)
+            models.Index(fields=["title_folded", "id"], name="task_title_folded_idx"),
+            # загрузка ещё не наступивших дедлайнов планировщиком (tasks/deadlines.py)
+            models.Index(fields=["deadline"], condition=Q(is_overdue=False), name="task_pending_deadline_idx"),
+        ]
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # bulk_create_objects (tasks/bulk.py) заполняет title_folded сам — save() там не вызывается
+        if "title" in self.__dict__:
+            self.title_folded = self.title.casefold()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "title" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "title_folded"}
+        super().save(*args, **kwargs)
+
     # def clean(self):
     #     """Валидация данных перед сохранением"""
     #     if self.deadline and self.deadline < timezone.now():
@@ -47,6 +80,20 @@ class SubTask(models.Model):
     deadline = models.DateTimeField()
     task = models.ForeignKey(Task, related_name='subtasks', on_delete=models.CASCADE)
     created_at = models.DateTimeField(default=timezone.now)  # Добавим поле created_at
+    updated_at = models.DateTimeField(auto_now=True)
+    is_overdue = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # подзадачи конкретной задачи в порядке создания
+            models.Index(fields=["task", "created_at"], name="subtask_task_created_idx"),
+            models.Index(fields=["status", "deadline"], name="subtask_status_deadline_idx"),
+            models.Index(fields=["deadline"], name="subtask_deadline_idx"),
+            # keyset-пагинация и admin date_hierarchy по created_at
+            models.Index(fields=["created_at", "id"], name="subtask_created_id_idx"),
+            models.Index(fields=["deadline"], condition=Q(description=""), name="subtask_no_description_idx"),
+            models.Index(fields=["deadline"], condition=Q(is_overdue=False), name="subtask_pending_deadline_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -69,4 +116,68 @@ class SubTask(models.Model):
             return f"{self.title[:10]}..."
         return self.title
 
-    short_title.short_description = "Title"
\ No newline at end of file
+    short_title.short_description = "Title"
+
+class TaskStatsSnapshot(models.Model):
+    """
+    Денормализованные счётчики для /api/stats/ — одна строка (pk=1).
+    Обновляются инкрементально сигналами Task/SubTask (tasks/signals.py),
+    пересобираются командой rebuild_task_stats.
+    by_status хранит {status_id: count}.
+    """
+    tasks_total = models.IntegerField(default=0)
+    tasks_without_description = models.IntegerField(default=0)
+    tasks_by_status = models.JSONField(default=dict)
+    subtasks_total = models.IntegerField(default=0)
+    subtasks_without_description = models.IntegerField(default=0)
+    subtasks_by_status = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats snapshot ({self.updated_at:%Y-%m-%d %H:%M})"
+
+
+class DeadlineChange(models.Model):
+    """
+    Журнал изменений дедлайнов для планировщика (tasks/deadlines.py).
+    Пишется сигналами и bulk-операциями в той же транзакции, что и сама запись;
+    воркер читает его по возрастанию id и удаляет прочитанное. deadline=None — объект удалён.
+    """
+    model = models.CharField(max_length=10)  # "task" / "subtask"
+    object_id = models.PositiveIntegerField()
+    deadline = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} → {self.deadline}"
+
+
+class DeadlineEvent(models.Model):
+    """
+    Outbox событий дедлайнов: напоминание перед дедлайном и переход в просроченные.
+    Отправкой (почта, вебхуки) занимается потребитель — он отмечает строки delivered_at.
+    Уникальность (kind, model, object_id, deadline) делает повторную выдачу после перезапуска воркера безопасной.
+    """
+    REMINDER = "reminder"
+    OVERDUE = "overdue"
+    KIND_CHOICES = [(REMINDER, "Напоминание"), (OVERDUE, "Просрочена")]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    model = models.CharField(max_length=10)
+    object_id = models.PositiveIntegerField()
+    deadline = models.DateTimeField()
+    created_at = models.DateTimeField(default=timezone.now)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "model", "object_id", "deadline"], name="deadline_event_unique",
+            ),
+        ]
+        indexes = [
+            # потребитель outbox: неотправленные по порядку
+            models.Index(fields=["id"], condition=Q(delivered_at__isnull=True), name="deadline_event_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.model} #{self.object_id}"
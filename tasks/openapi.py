@@ -0,0 +1,103 @@
+# tasks/openapi.py
+"""
+Заранее сгенерированная OpenAPI-схема.
+
+drf_yasg на каждый запрос /swagger.json обходит все view и сериализаторы — это сотни
+миллисекунд. Схема собирается один раз при сборке/деплое командой
+`python manage.py generate_openapi_schema` в SWAGGER_SCHEMA_DIR, а PrecomputedSchemaView
+отдаёт файл из памяти с ETag/Last-Modified/Cache-Control. Живая генерация — только при DEBUG.
+"""
+import hashlib
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views import View
+from drf_yasg import openapi
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+API_INFO = openapi.Info(
+    title="Task Manager API",
+    default_version="v1",
+    description="Документация для проекта Менеджер задач",
+    contact=openapi.Contact(email="support@example.com"),
+)
+
+SCHEMA_FORMATS = {
+    "json": (OpenAPICodecJson, "application/json; charset=utf-8"),
+    "yaml": (OpenAPICodecYaml, "application/yaml; charset=utf-8"),
+}
+
+# (путь, mtime) -> (тело, etag); файл перечитывается, только если его перегенерировали
+_loaded = {}
+
+
+def schema_dir():
+    return Path(getattr(settings, "SWAGGER_SCHEMA_DIR", Path(settings.BASE_DIR) / "openapi"))
+
+
+def schema_path(fmt):
+    return schema_dir() / f"swagger.{fmt}"
+
+
+def generate_schema():
+    """
+    Полная схема (public=True) — как её видит анонимный клиент.
+    Запрос подставной (как в drf_yasg generate_swagger --mock-request): без него view не знают
+    HTTP-метод и выбирают не тот сериализатор. url="" — схема без host, UI подставит свой.
+    """
+    request = APIView().initialize_request(APIRequestFactory().get("/swagger.json"))
+    generator = swagger_settings.DEFAULT_GENERATOR_CLASS(API_INFO, url="")
+    return generator.get_schema(request=request, public=True)
+
+
+def encode_schema(schema, fmt):
+    codec_class, _ = SCHEMA_FORMATS[fmt]
+    return codec_class(validators=[]).encode(schema)
+
+
+def load_schema(fmt):
+    """(тело, etag, mtime) из файла или None, если схема ещё не сгенерирована."""
+    path = schema_path(fmt)
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    cached = _loaded.get((path, mtime))
+    if cached is None:
+        body = path.read_bytes()
+        cached = _loaded[(path, mtime)] = (body, quote_etag(hashlib.sha256(body).hexdigest()))
+    return cached + (mtime,)
+
+
+class PrecomputedSchemaView(View):
+    """
+    /swagger.json, /swagger.yaml из файла.
+    Нет файла: при DEBUG — live_view (обычная генерация drf_yasg), иначе 404 с подсказкой.
+    """
+    live_view = None
+
+    def get(self, request, format=".json"):
+        fmt = format.lstrip(".")
+        loaded = load_schema(fmt)
+        if loaded is None:
+            if settings.DEBUG and self.live_view is not None:
+                return self.live_view(request, format=format)
+            return JsonResponse({
+                "error": "OpenAPI schema is not generated. Run: python manage.py generate_openapi_schema",
+            }, status=404, json_dumps_params={"ensure_ascii": False})
+
+        body, etag, mtime = loaded
+        response = get_conditional_response(request, etag=etag, last_modified=int(mtime))
+        if response is None:
+            response = HttpResponse(body, content_type=SCHEMA_FORMATS[fmt][1])
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(mtime)
+        response["Cache-Control"] = f"public, max-age={getattr(settings, 'SWAGGER_SCHEMA_MAX_AGE', 3600)}"
+        return response
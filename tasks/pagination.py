@@ -0,0 +1,129 @@
+# tasks/pagination.py
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Keyset (seek) пагинация по паре (поле сортировки, id).
+
+    - курсор непрозрачный: base64(JSON) с последней позицией и направлением
+    - поле сортировки берётся из OrderingFilter вьюхи (?ordering=-created_at),
+      по умолчанию created_at; id добавляется как tie-breaker
+    - страница выбирается условием WHERE (field, id) > (value, id), без OFFSET
+    - COUNT(*) не выполняется никогда: ответ содержит только next/previous/results
+    """
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = "created_at"
+    tie_breaker = "id"
+    template = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self._page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self._set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """То же для async-вьюх (tasks/views_async.py): страница читается через async ORM."""
+        page_queryset = self._page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self._set_page([row async for row in page_queryset.aiterator()])
+
+    def _page_queryset(self, queryset, request, view):
+        """Срез для текущей страницы (ещё не выполненный) или None, если пагинация выключена."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.field = self.ordering[0].lstrip("-")
+        self.descending = self.ordering[0].startswith("-")
+
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor["r"])
+        self.position = self.cursor["p"] if self.cursor else None
+
+        # Обратный курсор (previous) читает страницу в обратном направлении
+        descending = self.descending != self.reverse
+        sign = "-" if descending else ""
+        queryset = queryset.order_by(f"{sign}{self.field}", f"{sign}{self.tie_breaker}")
+        if self.position is not None:
+            try:
+                queryset = queryset.filter(self._seek_condition(self.position, descending))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # Берём на одну запись больше, чтобы узнать, есть ли следующая страница
+        return queryset[:self.page_size + 1]
+
+    def _set_page(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+
+        if self.reverse:
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        return self.page
+
+    def _seek_condition(self, position, descending):
+        value, pk = position
+        op = "lt" if descending else "gt"
+        return (
+            Q(**{f"{self.field}__{op}": value})
+            | Q(**{self.field: value, f"{self.tie_breaker}__{op}": pk})
+        )
+
+    def _position(self, row):
+        if isinstance(row, dict):
+            value, pk = row[self.field], row[self.tie_breaker]
+        else:
+            value, pk = getattr(row, self.field), getattr(row, self.tie_breaker)
+        value = value.isoformat() if hasattr(value, "isoformat") else value
+        return [value, pk]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor({"p": self._position(self.page[-1]), "r": 0})
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Пустая страница после последней записи — назад ведём на начало списка
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor({"p": self._position(self.page[0]), "r": 1})
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            cursor = json.loads(urlsafe_b64decode(padded.encode("ascii")))
+            value, pk = cursor["p"]
+            return {"p": [value, int(pk)], "r": int(cursor.get("r", 0))}
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, cursor):
+        payload = json.dumps(cursor, separators=(",", ":")).encode("utf-8")
+        encoded = urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
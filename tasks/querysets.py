@@ -0,0 +1,46 @@
+# tasks/querysets.py
+from django.db.models import Prefetch, Q
+
+from .models import Task, SubTask
+
+
+def subtasks_prefetch():
+    """Подзадачи вместе со статусами — один запрос на всю пачку задач."""
+    return Prefetch("subtasks", queryset=SubTask.objects.select_related("status"))
+
+
+def task_detail_queryset():
+    """Для TaskDetailSerializer: статус задачи JOIN-ом, подзадачи со статусами — prefetch."""
+    return Task.objects.select_related("status").prefetch_related(subtasks_prefetch())
+
+
+def subtask_detail_queryset():
+    """Для SubTaskDetailSerializer: статус, задача и статус задачи (TaskShallowSerializer) одним JOIN."""
+    return SubTask.objects.select_related("status", "task__status")
+
+
+def _prefix_upper_bound(prefix):
+    """Наименьшая строка больше всех строк, начинающихся с prefix; None — такой нет."""
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if code == 0xD800:
+            code = 0xE000  # суррогаты не кодируются ни в UTF-8, ни в БД
+        if code <= 0x10FFFF:
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]  # последний символ — U+10FFFF: увеличиваем предыдущий
+    return None
+
+
+def title_prefix_queryset(queryset, prefix):
+    """
+    Задачи, чьё название начинается с prefix (без учёта регистра, в том числе не-ASCII), по алфавиту.
+    Диапазон title_folded >= q AND < q+1 читается по индексу task_title_folded_idx, без LIKE и скана.
+    """
+    if "\x00" in prefix or any("\ud800" <= char <= "\udfff" for char in prefix):
+        return queryset.none()  # такого в названиях нет, а PostgreSQL/драйвер на них падает
+    folded = prefix.casefold()
+    condition = Q(title_folded__gte=folded)
+    upper_bound = _prefix_upper_bound(folded)
+    if upper_bound is not None:
+        condition &= Q(title_folded__lt=upper_bound)
+    return queryset.filter(condition).order_by("title_folded", "id")
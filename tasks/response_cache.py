@@ -0,0 +1,159 @@
+# tasks/response_cache.py
+"""
+Кэш ответов read-эндпоинтов (/api/tasks/, /api/subtasks/, /api/stats/).
+
+Ключ = эндпоинт + хост/путь + нормализованная строка запроса (фильтры, поиск,
+сортировка, cursor) + поколения моделей, от которых зависит ответ.
+Запись в Task/SubTask/Status увеличивает поколение модели (сигналы в tasks/signals.py,
+bulk-операции в tasks/bulk.py) — старые ключи просто перестают совпадать и вытесняются
+по TTL; перебирать ключи не нужно.
+
+Бэкенд — любой Django-кэш (settings.TASKS_RESPONSE_CACHE, по умолчанию locmem).
+Счётчики попаданий/промахов — на процесс (GET /api/cache/stats/).
+"""
+import hashlib
+import threading
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+GENERATION_KEY = "tasks:gen:{}"
+RESPONSE_KEY = "tasks:resp:{name}:{generations}:{digest}"
+
+# Поколение «прошлых» задач: меняется, только когда запись затрагивает дедлайн в прошлом
+# (см. tasks/timeline.py — закрытые интервалы таймлайна кэшируются под ним)
+PAST_TASK_DEADLINES = "tasks.task:past"
+
+_lock = threading.Lock()
+_hits = Counter()
+_misses = Counter()
+
+
+def get_cache():
+    return caches[getattr(settings, "TASKS_RESPONSE_CACHE", "default")]
+
+
+def _label(model):
+    # модель или произвольное имя поколения (PAST_TASK_DEADLINES)
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def generations(models):
+    """Текущие поколения моделей одним обращением к кэшу."""
+    keys = [GENERATION_KEY.format(_label(model)) for model in models]
+    found = get_cache().get_many(keys)
+    return tuple(found.get(key, 0) for key in keys)
+
+
+async def agenerations(models):
+    """generations() для async-вьюх (tasks/views_async.py): cache.aget_many, без блокировки event loop."""
+    keys = [GENERATION_KEY.format(_label(model)) for model in models]
+    found = await get_cache().aget_many(keys)
+    return tuple(found.get(key, 0) for key in keys)
+
+
+def _bump_now(models):
+    cache = get_cache()
+    for model in models:
+        key = GENERATION_KEY.format(_label(model))
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def bump(*models):
+    """
+    O(1)-инвалидация всех кэшированных ответов, зависящих от моделей.
+    Повторно — после коммита: читатель, успевший закэшировать данные до коммита
+    под новым поколением, не переживёт второй бамп.
+    """
+    _bump_now(models)
+    transaction.on_commit(lambda: _bump_now(models))
+
+
+def normalized_query(request):
+    """Параметры в стабильном порядке: ?b=2&a=1 и ?a=1&b=2 дают один ключ."""
+    return urlencode(sorted(request.GET.lists()), doseq=True)
+
+
+def _response_key(name, request, generations):
+    # хост и путь входят в ключ: в пагинированном ответе абсолютные ссылки next/previous
+    raw = f"{request.get_host()}{request.path}?{normalized_query(request)}"
+    return RESPONSE_KEY.format(
+        name=name,
+        generations=".".join(map(str, generations)),
+        digest=hashlib.md5(raw.encode()).hexdigest(),
+    )
+
+
+def make_key(name, request, models):
+    return _response_key(name, request, generations(models))
+
+
+async def amake_key(name, request, models):
+    return _response_key(name, request, await agenerations(models))
+
+
+def _count(name, value):
+    with _lock:
+        (_misses if value is None else _hits)[name] += 1
+    return value
+
+
+def lookup(name, key):
+    return _count(name, get_cache().get(key))
+
+
+async def alookup(name, key):
+    return _count(name, await get_cache().aget(key))
+
+
+def lookup_many(name, keys):
+    """{key: value} для найденных ключей; попадания/промахи считаются по каждому ключу."""
+    found = get_cache().get_many(keys) if keys else {}
+    with _lock:
+        _hits[name] += len(found)
+        _misses[name] += len(keys) - len(found)
+    return found
+
+
+def store_many(values, timeout=None):
+    if timeout is None:
+        timeout = getattr(settings, "TASKS_RESPONSE_CACHE_TIMEOUT", 300)
+    get_cache().set_many(values, timeout)
+
+
+def store(key, value, timeout=None):
+    if timeout is None:
+        timeout = getattr(settings, "TASKS_RESPONSE_CACHE_TIMEOUT", 300)
+    get_cache().set(key, value, timeout)
+
+
+async def astore(key, value, timeout=None):
+    if timeout is None:
+        timeout = getattr(settings, "TASKS_RESPONSE_CACHE_TIMEOUT", 300)
+    await get_cache().aset(key, value, timeout)
+
+
+def counters():
+    with _lock:
+        names = sorted(set(_hits) | set(_misses))
+        endpoints = {name: {"hits": _hits[name], "misses": _misses[name]} for name in names}
+    hits = sum(item["hits"] for item in endpoints.values())
+    misses = sum(item["misses"] for item in endpoints.values())
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        "endpoints": endpoints,
+    }
+
+
+def reset_counters():
+    with _lock:
+        _hits.clear()
+        _misses.clear()
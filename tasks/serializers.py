@@ -1,8 +1,11 @@
 # tasks/serializers.py
 from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
+from .bulk import bulk_create_objects
 from .models import Task, SubTask, Status
+from .status_registry import status_registry
 
 # Category может быть, а может и не быть — подключаем безопасно
 try:
@@ -29,6 +32,32 @@ class TaskShallowSerializer(serializers.ModelSerializer):
         fields = ("id", "title", "description", "status", "deadline")
 
 
+def _parse_pk(field, data):
+    if isinstance(data, bool):
+        field.fail("incorrect_type", data_type=type(data).__name__)
+    try:
+        return int(data)
+    except (TypeError, ValueError):
+        field.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class StatusRegistryField(serializers.PrimaryKeyRelatedField):
+    """
+    status_id → Status через реестр статусов (tasks/status_registry.py),
+    без запроса к БД на каждое значение.
+    """
+    def __init__(self, **kwargs):
+        kwargs.setdefault("queryset", Status.objects.all())
+        kwargs.setdefault("source", "status")
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        status = status_registry.get(_parse_pk(self, data))
+        if status is None:
+            self.fail("does_not_exist", pk_value=data)
+        return status
+
+
 # ---------- ЗАДАНИЕ 4: TaskCreateSerializer (валидация deadline, status не обязателен) ----------
 
 class TaskCreateSerializer(serializers.ModelSerializer):
@@ -39,12 +68,7 @@ class TaskCreateSerializer(serializers.ModelSerializer):
     - запись статуса делаем через write-only поле status_id
     """
     status = StatusSerializer(read_only=True)
-    status_id = serializers.PrimaryKeyRelatedField(
-        queryset=Status.objects.all(),
-        source="status",
-        write_only=True,
-        required=False
-    )
+    status_id = StatusRegistryField(write_only=True, required=False)
 
     class Meta:
         model = Task
@@ -57,8 +81,7 @@ class TaskCreateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         if "status" not in validated_data:
-            todo, _ = Status.objects.get_or_create(name="To Do")
-            validated_data["status"] = todo
+            validated_data["status"] = status_registry.default_status()
         return super().create(validated_data)
 
     def update(self, instance, validated_data):
@@ -77,12 +100,7 @@ class SubTaskCreateSerializer(serializers.ModelSerializer):
     """
     created_at = serializers.DateTimeField(read_only=True)
     status = StatusSerializer(read_only=True)
-    status_id = serializers.PrimaryKeyRelatedField(
-        queryset=Status.objects.all(),
-        source="status",
-        write_only=True,
-        required=False
-    )
+    status_id = StatusRegistryField(write_only=True, required=False)
     task_id = serializers.PrimaryKeyRelatedField(
         queryset=Task.objects.all(),
         source="task",
@@ -103,8 +121,7 @@ class SubTaskCreateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         if "status" not in validated_data:
-            status_obj, _ = Status.objects.get_or_create(name="To Do")
-            validated_data["status"] = status_obj
+            validated_data["status"] = status_registry.default_status()
         return SubTask.objects.create(**validated_data)
 
     def update(self, instance, validated_data):
@@ -184,3 +201,170 @@ if HAS_CATEGORY and Category is not None:
             if self._name_exists(name, exclude_pk=instance.pk):
                 raise serializers.ValidationError({"name": "Категория с таким названием уже существует."})
             return super().update(instance, validated_data)
+
+
+# ---------- Массовое создание: POST /api/tasks/bulk/, /api/subtasks/bulk/ ----------
+
+BULK_MAX_ITEMS = 1000
+
+
+class LookupRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PK-поле, которое берёт объект из заранее загруженной таблицы context[lookup]
+    ({pk: obj}), а не делает запрос на каждый элемент пачки.
+    """
+    def __init__(self, lookup, **kwargs):
+        self.lookup = lookup
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        obj = self.context.get(self.lookup, {}).get(_parse_pk(self, data))
+        if obj is None:
+            self.fail("does_not_exist", pk_value=data)
+        return obj
+
+
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """
+    many=True без отказа всей пачки: ошибки копятся в item_errors по индексам,
+    валидные элементы создаются одним bulk_create в одной транзакции.
+    """
+    default_error_messages = {
+        "empty": "Передан пустой массив.",
+        "max_length": "Не больше {max_length} объектов за запрос.",
+    }
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            message = self.error_messages["not_a_list"].format(input_type=type(data).__name__)
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code="not_a_list")
+        if not data:
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [self.error_messages["empty"]]})
+        if len(data) > BULK_MAX_ITEMS:
+            message = self.error_messages["max_length"].format(max_length=BULK_MAX_ITEMS)
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+
+        self.item_errors = []
+        valid = []
+        for index, item in enumerate(data):
+            try:
+                valid.append(self.child.run_validation(item))
+            except serializers.ValidationError as exc:
+                self.item_errors.append({"index": index, "errors": exc.detail})
+        return valid
+
+    def create(self, validated_data):
+        objs = [self.child.build_instance(attrs) for attrs in validated_data]
+        return bulk_create_objects(self.child.Meta.model, objs)
+
+
+class TaskBulkCreateSerializer(TaskCreateSerializer):
+    """Элемент пачки задач: status_id берётся из реестра статусов."""
+
+    class Meta(TaskCreateSerializer.Meta):
+        list_serializer_class = BulkCreateListSerializer
+
+    def build_instance(self, attrs):
+        attrs.setdefault("status", status_registry.default_status())
+        return Task(**attrs)
+
+
+class SubTaskBulkCreateSerializer(SubTaskCreateSerializer):
+    """Элемент пачки подзадач: status_id — из реестра статусов, task_id — из context["tasks"]."""
+    task_id = LookupRelatedField(
+        "tasks", queryset=Task.objects.all(), source="task", write_only=True, required=True
+    )
+
+    class Meta(SubTaskCreateSerializer.Meta):
+        list_serializer_class = BulkCreateListSerializer
+
+    def build_instance(self, attrs):
+        attrs.setdefault("status", status_registry.default_status())
+        return SubTask(**attrs)
+
+
+# ---------- Массовое обновление/удаление: PATCH/DELETE /api/subtasks/bulk/ ----------
+
+class SubTaskBulkFieldsSerializer(serializers.Serializer):
+    """Поля, которые можно выставить пачке подзадач одним UPDATE."""
+    status_id = StatusRegistryField(required=False)
+    description = serializers.CharField(required=False, allow_blank=True)
+    title = serializers.CharField(required=False, max_length=200)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("Укажите хотя бы одно поле: status_id, description или title.")
+        return attrs
+
+
+class SubTaskBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=BULK_MAX_ITEMS
+    )
+
+
+class SubTaskBulkUpdateSerializer(SubTaskBulkDeleteSerializer):
+    fields = SubTaskBulkFieldsSerializer()
+
+
+# ---------- Быстрый read-only путь для списков (GET) ----------
+
+class LeanRowSerializer:
+    """
+    Строит dict-ы ответа напрямую из строк .values(), без инстансов моделей
+    и без полевого to_representation ModelSerializer-а.
+    Вывод должен байт-в-байт совпадать с соответствующим DRF-сериализатором
+    (см. tasks/tests/test_lean_serializers.py).
+    values_fields — колонки для .values(); id и created_at нужны keyset-пагинации.
+    Имя статуса берётся из реестра статусов, поэтому JOIN со Status не нужен.
+    """
+    values_fields = ()
+
+    def __init__(self, status_names=None):
+        # То же форматирование дат, что у DRF (ISO 8601, текущая таймзона, 'Z' для UTC)
+        self._datetime = serializers.DateTimeField()
+        # async-вьюхи передают имена, уже полученные через status_registry.anames_by_id()
+        self._status_names = status_registry.names_by_id() if status_names is None else status_names
+
+    def datetime(self, value):
+        return self._datetime.to_representation(value)
+
+    def status(self, status_id):
+        name = self._status_names.get(status_id)
+        if name is None:
+            status = status_registry.get(status_id)
+            name = self._status_names[status_id] = status.name if status else None
+        return {"id": status_id, "name": name}
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+
+class TaskLeanSerializer(LeanRowSerializer):
+    """Эквивалент TaskCreateSerializer для чтения."""
+    values_fields = ("id", "title", "description", "status_id", "deadline", "created_at")
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "description": row["description"],
+            "status": self.status(row["status_id"]),
+            "deadline": self.datetime(row["deadline"]),
+        }
+
+
+class SubTaskLeanSerializer(LeanRowSerializer):
+    """Эквивалент SubTaskCreateSerializer для чтения."""
+    values_fields = ("id", "title", "description", "status_id", "deadline", "task_id", "created_at")
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "description": row["description"],
+            "status": self.status(row["status_id"]),
+            "deadline": self.datetime(row["deadline"]),
+            "task": row["task_id"],
+            "created_at": self.datetime(row["created_at"]),
+        }
@@ -0,0 +1,161 @@
+# tasks/signals.py
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Task, SubTask, Status
+from . import response_cache
+from .deadlines import deadline_value, record_changes
+from .stats import apply_delta
+from .status_registry import status_registry
+
+
+def _stats_state(instance):
+    # Берём из __dict__, чтобы не провоцировать запрос для отложенных (.only/.defer) полей
+    status_id = instance.__dict__.get("status_id")
+    description = instance.__dict__.get("description")
+    if status_id is None or description is None:
+        return None
+    return status_id, description == ""
+
+
+@receiver(post_init, sender=Task)
+@receiver(post_init, sender=SubTask)
+def remember_stats_state(sender, instance, **kwargs):
+    """Запоминаем исходные status_id/пустоту описания, чтобы считать дельту при save()."""
+    instance._stats_state = _stats_state(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=SubTask)
+def update_stats_on_save(sender, instance, created, **kwargs):
+    new_state = _stats_state(instance)
+    old_state = None if created else instance._stats_state
+    instance._stats_state = new_state
+    if new_state is None or old_state == new_state:
+        return
+
+    status_deltas = {new_state[0]: 1}
+    description_delta = int(new_state[1])
+    if old_state is not None:
+        status_deltas[old_state[0]] = status_deltas.get(old_state[0], 0) - 1
+        description_delta -= int(old_state[1])
+    apply_delta(sender, status_deltas, description_delta)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=SubTask)
+def update_stats_on_delete(sender, instance, **kwargs):
+    state = _stats_state(instance)
+    if state is not None:
+        apply_delta(sender, {state[0]: -1}, -int(state[1]))
+
+
+# ---------- updated_at: ETag/Last-Modified деталок ----------
+
+def touch_tasks(task_ids):
+    """Детальное представление задачи включает подзадачи — их изменения «трогают» задачу."""
+    Task.objects.filter(pk__in=task_ids).update(updated_at=timezone.now())
+
+
+@receiver(post_init, sender=SubTask)
+def remember_parent_task(sender, instance, **kwargs):
+    """Исходная задача: при переносе подзадачи меняются деталки обеих задач."""
+    instance._task_id_state = instance.__dict__.get("task_id") if instance.pk else None
+
+
+@receiver(post_save, sender=SubTask)
+@receiver(post_delete, sender=SubTask)
+def touch_parent_task(sender, instance, **kwargs):
+    origin = kwargs.get("origin")
+    if isinstance(origin, Task) and origin.pk == instance.task_id:
+        return  # подзадачи удаляются каскадом вместе с задачей — трогать нечего
+    task_ids = {instance.task_id, instance._task_id_state} - {None}
+    instance._task_id_state = instance.task_id
+    touch_tasks(task_ids)
+
+
+@receiver(post_save, sender=Status)
+def touch_on_status_rename(sender, instance, created, **kwargs):
+    # Имя статуса входит в ответы деталок — переименование должно сбрасывать их ETag
+    if created:
+        return
+    now = timezone.now()
+    Task.objects.filter(
+        Q(status=instance) | Q(pk__in=SubTask.objects.filter(status=instance).values("task_id"))
+    ).update(updated_at=now)
+    SubTask.objects.filter(status=instance).update(updated_at=now)
+
+
+# ---------- Реестр статусов ----------
+
+@receiver(post_save, sender=Status)
+@receiver(post_delete, sender=Status)
+def invalidate_status_registry(sender, instance, **kwargs):
+    status_registry.clear()  # этот процесс видит изменение сразу
+    # остальные воркеры — только после коммита, иначе перечитают старые данные с новой версией
+    transaction.on_commit(status_registry.invalidate)
+
+
+# ---------- Кэш ответов списков/статистики ----------
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=SubTask)
+@receiver(post_delete, sender=SubTask)
+@receiver(post_save, sender=Status)
+@receiver(post_delete, sender=Status)
+def bump_response_cache(sender, **kwargs):
+    response_cache.bump(sender)
+
+
+# ---------- Дедлайны: таймлайн и планировщик ----------
+
+@receiver(post_init, sender=Task)
+@receiver(post_init, sender=SubTask)
+def remember_deadline(sender, instance, **kwargs):
+    """Исходный дедлайн: перенос задачи из прошлого в будущее тоже меняет закрытые интервалы."""
+    instance._deadline_state = instance.__dict__.get("deadline") if instance.pk else None
+
+
+def _touches_past(sender, *deadlines):
+    # исходный дедлайн из post_init — тоже присвоенное значение (Task(pk=..., deadline="...")), не из БД
+    now = timezone.now()
+    deadlines = (deadline_value(sender, deadline) for deadline in deadlines)
+    return any(deadline is not None and deadline < now for deadline in deadlines)
+
+
+@receiver(pre_save, sender=Task)
+@receiver(pre_save, sender=SubTask)
+def sync_overdue_flag(sender, instance, **kwargs):
+    # при записи флаг известен сразу; переход «дедлайн наступил» делает run_deadline_scheduler
+    if "deadline" not in instance.__dict__:
+        return  # отложенное поле (.only/.defer) — не меняется
+    # присвоенное значение может быть строкой или naive-временем — приводим до сравнения
+    instance.deadline = deadline_value(sender, instance.deadline)
+    if instance.deadline is not None:
+        instance.is_overdue = instance.deadline <= timezone.now()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=SubTask)
+def on_deadline_save(sender, instance, created, **kwargs):
+    # новый дедлайн уже приведён в sync_overdue_flag; старый приводим здесь
+    old_deadline = deadline_value(sender, instance._deadline_state)
+    instance._deadline_state = instance.__dict__.get("deadline")
+    if instance._deadline_state is not None and (created or old_deadline != instance._deadline_state):
+        record_changes(sender, [(instance.pk, instance._deadline_state)])
+    # закрытые интервалы таймлайна (tasks/timeline.py) меняются, только если старый
+    # или новый дедлайн в прошлом; правки будущих задач их кэш не трогают
+    if sender is Task and _touches_past(sender, old_deadline, instance._deadline_state):
+        response_cache.bump(response_cache.PAST_TASK_DEADLINES)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=SubTask)
+def on_deadline_delete(sender, instance, **kwargs):
+    record_changes(sender, [(instance.pk, None)])
+    if sender is Task and _touches_past(sender, instance.__dict__.get("deadline")):
+        response_cache.bump(response_cache.PAST_TASK_DEADLINES)
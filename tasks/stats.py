@@ -0,0 +1,210 @@
+# tasks/stats.py
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Count, F, Func, Q, Subquery
+from django.utils import timezone
+
+from .models import Task, SubTask, TaskStatsSnapshot
+from .status_registry import status_registry
+
+# Секции ответа /api/stats/, которые можно запросить через ?fields=
+STATS_SECTIONS = ("tasks", "subtasks", "upcoming_deadlines")
+
+SNAPSHOT_PK = 1
+PREFIXES = {Task: "tasks", SubTask: "subtasks"}
+
+
+def parse_sections(raw):
+    """
+    Разбирает ?fields=tasks,subtasks. Пустое значение — все секции.
+    Возвращает (sections, unknown).
+    """
+    if not raw:
+        return list(STATS_SECTIONS), []
+    requested = [part.strip() for part in raw.split(",") if part.strip()]
+    unknown = [part for part in requested if part not in STATS_SECTIONS]
+    sections = [name for name in STATS_SECTIONS if name in requested]
+    return sections, unknown
+
+
+# ---------- Инкрементальные счётчики ----------
+
+def apply_delta(model, status_deltas, without_description_delta=0):
+    """
+    O(1)-обновление снапшота: status_deltas = {status_id: +n/-n}.
+    Вызывается из сигналов и из bulk-операций, которые сигналы обходят.
+    """
+    status_deltas = {str(k): v for k, v in status_deltas.items() if v}
+    if not status_deltas and not without_description_delta:
+        return
+    prefix = PREFIXES[model]
+    with transaction.atomic():
+        snapshot, _ = TaskStatsSnapshot.objects.select_for_update().get_or_create(pk=SNAPSHOT_PK)
+        by_status = getattr(snapshot, f"{prefix}_by_status")
+        for status_id, delta in status_deltas.items():
+            count = by_status.get(status_id, 0) + delta
+            if count:
+                by_status[status_id] = count
+            else:
+                by_status.pop(status_id, None)
+        total_field = f"{prefix}_total"
+        description_field = f"{prefix}_without_description"
+        setattr(snapshot, total_field, getattr(snapshot, total_field) + sum(status_deltas.values()))
+        setattr(snapshot, description_field, getattr(snapshot, description_field) + without_description_delta)
+        snapshot.save()
+
+
+def live_counters(model):
+    """Счётчики модели по живым данным — в том же формате, что и снапшот."""
+    rows = model.objects.values("status_id").annotate(
+        total=Count("id"),
+        without_description=Count("id", filter=Q(description="")),
+    ).order_by()
+    by_status = {str(row["status_id"]): row["total"] for row in rows}
+    return {
+        "total": sum(by_status.values()),
+        "without_description": sum(row["without_description"] for row in rows),
+        "by_status": by_status,
+    }
+
+
+def snapshot_counters(snapshot, model):
+    prefix = PREFIXES[model]
+    return {
+        "total": getattr(snapshot, f"{prefix}_total"),
+        "without_description": getattr(snapshot, f"{prefix}_without_description"),
+        "by_status": getattr(snapshot, f"{prefix}_by_status"),
+    }
+
+
+def rebuild_snapshot():
+    """Пересчитывает счётчики с нуля (management-команда rebuild_task_stats)."""
+    values = {}
+    with transaction.atomic():
+        for model, prefix in PREFIXES.items():
+            counters = live_counters(model)
+            for key, value in counters.items():
+                values[f"{prefix}_{key}"] = value
+        snapshot, _ = TaskStatsSnapshot.objects.update_or_create(pk=SNAPSHOT_PK, defaults=values)
+    return snapshot
+
+
+def compare_snapshot():
+    """
+    Проверка консистентности: список расхождений снапшота с живыми агрегатами.
+    Пустой список — всё сходится.
+    """
+    snapshot = TaskStatsSnapshot.objects.filter(pk=SNAPSHOT_PK).first() or TaskStatsSnapshot()
+    mismatches = []
+    for model, prefix in PREFIXES.items():
+        stored = snapshot_counters(snapshot, model)
+        live = live_counters(model)
+        for key in ("total", "without_description", "by_status"):
+            if stored[key] != live[key]:
+                mismatches.append(f"{prefix}.{key}: snapshot={stored[key]!r} live={live[key]!r}")
+    return mismatches
+
+
+# ---------- Чтение для /api/stats/ ----------
+
+def _overdue_count(model, now):
+    # Индексированный range-count по deadline, встраивается подзапросом в чтение снапшота
+    return Subquery(
+        model.objects.filter(deadline__lt=now).order_by()
+        .annotate(count=Func(F("id"), function="COUNT")).values("count")
+    )
+
+
+def _snapshot_queryset(now, models):
+    annotations = {f"{PREFIXES[model]}_overdue": _overdue_count(model, now) for model in models}
+    return TaskStatsSnapshot.objects.filter(pk=SNAPSHOT_PK).annotate(**annotations)
+
+
+def read_snapshot(now, models=(Task, SubTask)):
+    """Снапшот + просроченные (зависят от времени, поэтому живые) одним запросом."""
+    snapshot = _snapshot_queryset(now, models).first()
+    if snapshot is None:
+        rebuild_snapshot()
+        snapshot = _snapshot_queryset(now, models).get()
+    return snapshot
+
+
+async def aread_snapshot(now, models=(Task, SubTask)):
+    snapshot = await _snapshot_queryset(now, models).afirst()
+    if snapshot is None:
+        await sync_to_async(rebuild_snapshot)()  # один раз за жизнь БД, транзакция — синхронная
+        snapshot = await _snapshot_queryset(now, models).aget()
+    return snapshot
+
+
+def model_stats(snapshot, model, status_names):
+    prefix = PREFIXES[model]
+    counters = snapshot_counters(snapshot, model)
+    by_status = {
+        status_names.get(int(status_id), status_id): count
+        for status_id, count in counters["by_status"].items()
+    }
+    # Заполняем нулевые значения для всех статусов
+    for status in status_names.values():
+        by_status.setdefault(status, 0)
+    return {
+        "total": counters["total"],
+        "by_status": by_status,
+        "overdue": getattr(snapshot, f"{prefix}_overdue"),
+        "without_description": counters["without_description"],
+    }
+
+
+def _upcoming_queryset(now, limit):
+    return Task.objects.filter(deadline__gte=now).order_by("deadline").values("id", "title", "deadline")[:limit]
+
+
+def _upcoming_item(row, now):
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "deadline": row["deadline"].isoformat(),
+        "days_until": (row["deadline"] - now).days,
+    }
+
+
+def upcoming_deadlines(now, limit=3):
+    """Ближайшие дедлайны (по умолчанию 3 ближайшие задачи)"""
+    return [_upcoming_item(row, now) for row in _upcoming_queryset(now, limit)]
+
+
+async def aupcoming_deadlines(now, limit=3):
+    return [_upcoming_item(row, now) async for row in _upcoming_queryset(now, limit).aiterator()]
+
+
+def collect_stats(sections=STATS_SECTIONS, now=None):
+    """
+    Собирает только запрошенные секции статистики.
+    tasks/subtasks читаются из TaskStatsSnapshot (одна строка), а не агрегатами по таблицам.
+    """
+    now = now or timezone.now()
+    stats = {}
+    models = [model for model, prefix in PREFIXES.items() if prefix in sections]
+    if models:
+        snapshot = read_snapshot(now, models)
+        status_names = status_registry.names_by_id()
+        for model in models:
+            stats[PREFIXES[model]] = model_stats(snapshot, model, status_names)
+    if "upcoming_deadlines" in sections:
+        stats["upcoming_deadlines"] = upcoming_deadlines(now)
+    return stats
+
+
+async def acollect_stats(sections=STATS_SECTIONS, now=None):
+    """collect_stats() для async-вьюхи /api/async/stats/ — те же запросы через async ORM."""
+    now = now or timezone.now()
+    stats = {}
+    models = [model for model, prefix in PREFIXES.items() if prefix in sections]
+    if models:
+        snapshot = await aread_snapshot(now, models)
+        status_names = await status_registry.anames_by_id()
+        for model in models:
+            stats[PREFIXES[model]] = model_stats(snapshot, model, status_names)
+    if "upcoming_deadlines" in sections:
+        stats["upcoming_deadlines"] = await aupcoming_deadlines(now)
+    return stats
@@ -0,0 +1,149 @@
+# tasks/status_registry.py
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Status
+
+DEFAULT_STATUS_NAME = "To Do"
+VERSION_KEY = "tasks:status_registry:version"
+
+
+class StatusRegistry:
+    """
+    Процессный кэш маленькой и почти неизменной таблицы Status: name→объект и id→объект.
+
+    - загружается одним запросом при первом обращении
+    - сигналы post_save/post_delete Status (tasks/signals.py) сбрасывают его локально
+      и увеличивают версию в общем кэше (TASKS_STATUS_REGISTRY_CACHE); остальные
+      воркеры сверяют версию не чаще раза в TASKS_STATUS_REGISTRY_CHECK_INTERVAL секунд
+    - промах по id/имени один раз перечитывает таблицу: статус мог появиться в другом
+      воркере раньше, чем мы увидели новую версию
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id = None
+        self._by_name = None
+        self._version = None
+        self._checked_at = 0.0
+
+    @property
+    def _cache(self):
+        return caches[getattr(settings, "TASKS_STATUS_REGISTRY_CACHE", "default")]
+
+    def _shared_version(self):
+        return self._cache.get(VERSION_KEY, 0)
+
+    async def _ashared_version(self):
+        return await self._cache.aget(VERSION_KEY, 0)
+
+    def _store(self, statuses, version):
+        with self._lock:
+            self._by_id = {status.pk: status for status in statuses}
+            self._by_name = {status.name: status for status in statuses}
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def _load(self):
+        version = self._shared_version()
+        self._store(list(Status.objects.order_by("id")), version)
+
+    async def _aload(self):
+        version = await self._ashared_version()
+        self._store([status async for status in Status.objects.order_by("id")], version)
+
+    def _check_due(self):
+        interval = getattr(settings, "TASKS_STATUS_REGISTRY_CHECK_INTERVAL", 1.0)
+        return time.monotonic() - self._checked_at >= interval
+
+    def _version_changed(self, version):
+        if version != self._version:
+            return True
+        self._checked_at = time.monotonic()
+        return False
+
+    def _is_stale(self):
+        if self._by_id is None:
+            return True
+        return self._check_due() and self._version_changed(self._shared_version())
+
+    async def _ais_stale(self):
+        if self._by_id is None:
+            return True
+        return self._check_due() and self._version_changed(await self._ashared_version())
+
+    def _ensure_loaded(self):
+        if self._is_stale():
+            self._load()
+
+    def _lookup(self, table, key):
+        self._ensure_loaded()
+        found = getattr(self, table).get(key)
+        if found is None:
+            self._load()
+            found = getattr(self, table).get(key)
+        return found
+
+    def get(self, pk):
+        """Status по id или None."""
+        return self._lookup("_by_id", pk)
+
+    def get_by_name(self, name):
+        """Status по имени или None."""
+        return self._lookup("_by_name", name)
+
+    def id_for_name(self, name):
+        status = self.get_by_name(name)
+        return status.pk if status else None
+
+    def names_by_id(self):
+        """{id: name} для всех статусов (в порядке id)."""
+        self._ensure_loaded()
+        return {pk: status.name for pk, status in self._by_id.items()}
+
+    async def anames_by_id(self, required_ids=()):
+        """
+        names_by_id() для async-вьюх (tasks/views_async.py): перечитывание — через async ORM.
+        required_ids — id из уже прочитанных строк; если какого-то нет, таблица перечитывается один раз.
+        """
+        if await self._ais_stale():
+            await self._aload()
+        if any(pk not in self._by_id for pk in required_ids):
+            await self._aload()
+        return {pk: status.name for pk, status in self._by_id.items()}
+
+    async def aid_for_name(self, name):
+        if await self._ais_stale() or name not in self._by_name:
+            await self._aload()
+        status = self._by_name.get(name)
+        return status.pk if status else None
+
+    def names(self):
+        return list(self.names_by_id().values())
+
+    def default_status(self):
+        """Статус по умолчанию для новых задач/подзадач ("To Do"), создаётся при отсутствии."""
+        status = self.get_by_name(DEFAULT_STATUS_NAME)
+        if status is None:
+            status, _ = Status.objects.get_or_create(name=DEFAULT_STATUS_NAME)
+        return status
+
+    def clear(self):
+        """Сброс только в этом процессе."""
+        with self._lock:
+            self._by_id = None
+            self._by_name = None
+
+    def invalidate(self):
+        """Сброс локально + новая версия для остальных воркеров."""
+        self.clear()
+        try:
+            self._cache.incr(VERSION_KEY)
+        except ValueError:
+            self._cache.set(VERSION_KEY, 1, timeout=None)
+
+
+status_registry = StatusRegistry()
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tasks.models import Task, SubTask, Status
+
+
+class AdminChangelistQueryCountTest(TestCase):
+    """
+    Число запросов страницы списка в админке не должно расти с числом строк.
+    """
+    MAX_QUERIES = 10
+
+    def setUp(self):
+        admin = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass12345")
+        self.client.force_login(admin)
+        self.statuses = [Status.objects.create(name=name) for name in ("To Do", "In Progress", "Done")]
+        self.deadline = timezone.now() + timedelta(days=1)
+
+    def add_rows(self, n):
+        for i in range(n):
+            task = Task.objects.create(
+                title=f"Task {i}", status=self.statuses[i % 3], deadline=self.deadline
+            )
+            for j in range(2):
+                SubTask.objects.create(
+                    title=f"Sub {i}.{j}", status=self.statuses[j], deadline=self.deadline, task=task
+                )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_changelists_run_constant_queries(self):
+        for url in ("/admin/tasks/task/", "/admin/tasks/subtask/"):
+            self.add_rows(2)
+            small = self.count_queries(url)
+            self.add_rows(20)
+            large = self.count_queries(url)
+            self.assertEqual(small, large, url)
+            self.assertLessEqual(large, self.MAX_QUERIES, url)
+
+    def test_subtasks_count_column_is_annotated_and_sortable(self):
+        self.add_rows(1)
+        Task.objects.create(title="Empty", status=self.statuses[0], deadline=self.deadline)
+        # порядок по аннотации: list_display = [short_title, status, deadline, is_overdue_badge, subtasks_count]
+        resp = self.client.get("/admin/tasks/task/?o=-5")
+        self.assertEqual(resp.status_code, 200)
+        results = list(resp.context["cl"].result_list)
+        self.assertEqual([t.subtasks_total for t in results], [2, 0])
@@ -0,0 +1,141 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from accounts.tests.utils import without_throttling
+from tasks import response_cache
+from tasks.models import Task, SubTask, Status
+from tasks.status_registry import status_registry
+
+
+@without_throttling
+class AsyncReadApiTest(TestCase):
+    """Async-вьюхи отдают то же, что синхронные DRF-вьюхи, и не делают синхронных запросов к БД."""
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        status_registry.clear()
+        now = timezone.now()
+        self.todo = Status.objects.create(name="To Do")
+        self.done = Status.objects.create(name="Done")
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {i}", description="deploy" if i % 2 else "", deadline=now + timedelta(days=i + 1),
+                status=self.done if i % 3 == 0 else self.todo,
+            )
+            for i in range(7)
+        ]
+        self.subtask = SubTask.objects.create(
+            title="Sub", status=self.done, deadline=now + timedelta(days=1), task=self.tasks[0],
+        )
+
+    def assertSameAsSync(self, sync_url, async_resp, **params):
+        sync_resp = self.client.get(sync_url, params)
+        self.assertEqual(async_resp.status_code, sync_resp.status_code)
+        sync_data, async_data = sync_resp.json(), async_resp.json()
+        if "results" in sync_data:
+            self.assertEqual(async_data["results"], sync_data["results"])
+            self.assertEqual(bool(async_data["next"]), bool(sync_data["next"]))
+        else:
+            self.assertEqual(async_data, sync_data)
+        return async_data
+
+    async def sync_check(self, sync_url, resp, params):
+        await sync_to_async(self.assertSameAsSync)(sync_url, resp, **params)
+
+    async def sync_get(self, url):
+        return await sync_to_async(self.client.get)(url)
+
+    async def test_task_list_matches_sync(self):
+        for params in ({}, {"status": self.done.id}, {"status__name": "Done"}, {"search": "deploy"},
+                       {"ordering": "-created_at", "page_size": 3}):
+            resp = await self.async_client.get("/api/async/tasks/", params)
+            self.assertEqual(resp["X-Cache"], "MISS")
+            await self.sync_check("/api/tasks/", resp, params)
+
+    async def test_keyset_cursor_walks_all_pages(self):
+        titles, url = [], "/api/async/tasks/?page_size=3"
+        while url:
+            data = (await self.async_client.get(url)).json()
+            titles += [row["title"] for row in data["results"]]
+            url = data["next"]
+        self.assertEqual(titles, [f"Task {i}" for i in range(7)])
+
+    async def test_bad_cursor_and_filter(self):
+        self.assertEqual((await self.async_client.get("/api/async/tasks/", {"cursor": "zzz"})).status_code, 404)
+        self.assertEqual((await self.async_client.get("/api/async/tasks/", {"status": "x"})).status_code, 400)
+
+    async def test_subtask_list_and_details_match_sync(self):
+        resp = await self.async_client.get("/api/async/subtasks/", {"task_id": self.tasks[0].id})
+        await self.sync_check("/api/subtasks/", resp, {"task_id": self.tasks[0].id})
+
+        resp = await self.async_client.get(f"/api/async/tasks/{self.tasks[0].id}/")
+        await self.sync_check(f"/api/tasks/{self.tasks[0].id}/", resp, {})
+        resp = await self.async_client.get(f"/api/async/subtasks/{self.subtask.id}/")
+        await self.sync_check(f"/api/subtasks/{self.subtask.id}/", resp, {})
+        self.assertEqual((await self.async_client.get("/api/async/tasks/999999/")).status_code, 404)
+
+    async def test_detail_conditional_get(self):
+        resp = await self.async_client.get(f"/api/async/tasks/{self.tasks[1].id}/")
+        sync_resp = await self.sync_get(f"/api/tasks/{self.tasks[1].id}/")
+        self.assertEqual(resp["ETag"], sync_resp["ETag"])
+        resp = await self.async_client.get(
+            f"/api/async/tasks/{self.tasks[1].id}/", headers={"If-None-Match": resp["ETag"]}
+        )
+        self.assertEqual(resp.status_code, 304)
+
+    async def test_subtask_etag_follows_parent_like_sync(self):
+        url = f"/api/async/subtasks/{self.subtask.id}/"
+        etag = (await self.async_client.get(url))["ETag"]
+        self.tasks[0].title = "Parent renamed"
+        await sync_to_async(self.tasks[0].save)()
+
+        resp = await self.async_client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 200)
+        sync_resp = await self.sync_get(f"/api/subtasks/{self.subtask.id}/")
+        self.assertEqual(resp["ETag"], sync_resp["ETag"])
+        self.assertEqual(resp["Last-Modified"], sync_resp["Last-Modified"])
+
+    async def test_cache_is_used_through_async_api(self):
+        sync_calls = mock.Mock(side_effect=AssertionError("sync cache call in async view"))
+        with mock.patch.multiple(response_cache, make_key=sync_calls, lookup=sync_calls, store=sync_calls), \
+                mock.patch.object(status_registry, "_shared_version", sync_calls):
+            for url in ("/api/async/tasks/", "/api/async/subtasks/", "/api/async/stats/"):
+                self.assertEqual((await self.async_client.get(url)).status_code, 200)
+                self.assertEqual((await self.async_client.get(url))["X-Cache"], "HIT")
+
+    async def test_stats_match_sync(self):
+        resp = await self.async_client.get("/api/async/stats/", {"fields": "tasks,subtasks"})
+        data = resp.json()
+        sync_data = (await self.sync_get("/api/stats/?fields=tasks,subtasks")).json()
+        self.assertEqual(data["stats"], sync_data["stats"])
+        self.assertEqual((await self.async_client.get("/api/async/stats/", {"fields": "nope"})).status_code, 400)
+        self.assertEqual((await self.async_client.post("/api/async/stats/")).status_code, 405)
+
+    async def test_writes_still_go_through_sync_views(self):
+        resp = await self.async_client.post(
+            "/api/tasks/",
+            {"title": "New", "deadline": (timezone.now() + timedelta(days=3)).isoformat()},
+            content_type="application/json",
+        )
+        self.assertEqual(resp.status_code, 201)
+        data = (await self.async_client.get("/api/async/tasks/", {"search": "new"})).json()
+        self.assertEqual([row["title"] for row in data["results"]], ["New"])
+
+
+class BenchReadApiCommandTest(TransactionTestCase):
+    # нагрузка идёт из других потоков — им нужны закоммиченные данные
+
+    def test_reports_both_modes(self):
+        Task.objects.create(
+            title="T", status=Status.objects.create(name="To Do"), deadline=timezone.now() + timedelta(days=1),
+        )
+        out = StringIO()
+        call_command("bench_read_api", "--endpoint", "stats", "--requests", "4", "--concurrency", "1", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual([line.split()[:2] for line in lines[1:]], [["stats", "wsgi"], ["stats", "asgi"]])
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks.bulk import bulk_create_objects
+from tasks.models import Task, SubTask, Status
+from tasks.querysets import _prefix_upper_bound
+
+
+class TaskAutocompleteTest(TestCase):
+
+    def setUp(self):
+        todo = Status.objects.create(name="To Do")
+        deadline = timezone.now() + timedelta(days=1)
+        for title in ("Deploy backend", "deploy docs", "Design review", "Документация", "Отчёт", "Zebra"):
+            Task.objects.create(title=title, status=todo, deadline=deadline)
+
+    def suggest(self, q, **params):
+        resp = self.client.get("/api/tasks/autocomplete/", {"q": q, **params})
+        self.assertEqual(resp.status_code, 200)
+        return [row["title"] for row in resp.json()["results"]]
+
+    def test_prefix_match_is_case_insensitive_and_sorted(self):
+        self.assertEqual(self.suggest("de"), ["Deploy backend", "deploy docs", "Design review"])
+        self.assertEqual(self.suggest("DEP"), ["Deploy backend", "deploy docs"])
+        self.assertEqual(self.suggest("док"), ["Документация"])
+        self.assertEqual(self.suggest("backend"), [])  # только начало названия
+
+    def test_non_ascii_case_folding(self):
+        for query in ("док", "Док", "ДОК", "доК"):
+            self.assertEqual(self.suggest(query), ["Документация"], query)
+        self.assertEqual(self.suggest("ОТЧЁ"), ["Отчёт"])
+        task = Task.objects.get(title="Отчёт")
+        task.title = "ЁЛКА"
+        task.save(update_fields=["title"])
+        self.assertEqual(self.suggest("ёлк"), ["ЁЛКА"])
+
+    def test_subtask_title_update_fields(self):
+        # title_folded есть только у Task — SubTask.save() сохраняет ровно указанные поля
+        task = Task.objects.get(title="Zebra")
+        subtask = SubTask.objects.create(title="Шаг", status=task.status, deadline=task.deadline, task=task)
+        subtask.title = "ШАГ 2"
+        subtask.save(update_fields=["title"])
+        self.assertEqual(SubTask.objects.get(pk=subtask.pk).title, "ШАГ 2")
+        self.assertNotIn("title_folded", subtask.__dict__)
+
+    def test_bulk_created_titles_are_searchable(self):
+        bulk_create_objects(Task, [
+            Task(title="Стратегия", status=Status.objects.get(), deadline=timezone.now() + timedelta(days=1)),
+        ])
+        self.assertEqual(self.suggest("СТРАТ"), ["Стратегия"])
+
+    def test_highest_code_points_do_not_fail(self):
+        for query in ("z\U0010FFFF", "\U0010FFFF", "z\ud7ff", "a\x00"):
+            self.assertEqual(self.suggest(query), [], repr(query))
+        self.assertEqual(_prefix_upper_bound("a\U0010FFFF"), "b")
+        self.assertEqual(_prefix_upper_bound("a\ud7ff"), "a\ue000")
+        self.assertIsNone(_prefix_upper_bound("\U0010FFFF"))
+
+    def test_limit_and_empty_query(self):
+        self.assertEqual(self.suggest("d", limit=2), ["Deploy backend", "deploy docs"])
+        self.assertEqual(self.suggest("d", limit="x"), ["Deploy backend", "deploy docs", "Design review"])
+        self.assertEqual(self.suggest("   "), [])
+
+    def test_single_query_with_id_and_title_only(self):
+        with self.assertNumQueries(1):
+            resp = self.client.get("/api/tasks/autocomplete/", {"q": "zeb"})
+        self.assertEqual(resp.json()["results"], [{"id": Task.objects.get(title="Zebra").id, "title": "Zebra"}])
+
+
+class SubTaskAdminAutocompleteTest(TestCase):
+
+    def setUp(self):
+        admin = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass12345")
+        self.client.force_login(admin)
+        todo = Status.objects.create(name="To Do")
+        deadline = timezone.now() + timedelta(days=1)
+        self.tasks = [
+            Task.objects.create(title=f"Task {i}", status=todo, deadline=deadline) for i in range(30)
+        ]
+        self.subtask = SubTask.objects.create(title="Sub", status=todo, deadline=deadline, task=self.tasks[0])
+
+    def test_change_form_does_not_list_all_tasks(self):
+        resp = self.client.get(f"/admin/tasks/subtask/{self.subtask.pk}/change/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotContains(resp, "Task 29")
+        self.assertContains(resp, "admin-autocomplete")
+
+    def test_admin_autocomplete_uses_title_prefix(self):
+        resp = self.client.get("/admin/autocomplete/", {
+            "app_label": "tasks", "model_name": "subtask", "field_name": "task", "term": "task 2",
+        })
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            [row["text"] for row in resp.json()["results"]],
+            ["Task 2"] + [f"Task {i}" for i in range(20, 30)],
+        )
+
+    def test_changelist_search_is_unchanged(self):
+        resp = self.client.get("/admin/tasks/task/", {"q": "sk 1"})
+        self.assertContains(resp, "Task 1")
@@ -0,0 +1,83 @@
+import json
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.tests.utils import without_throttling
+from tasks.models import Task, Status
+from tasks.stats import compare_snapshot
+from tasks.status_registry import status_registry
+
+
+@without_throttling
+class BulkCreateApiTest(TestCase):
+
+    def setUp(self):
+        self.todo = Status.objects.create(name="To Do")
+        self.done = Status.objects.create(name="Done")
+        self.deadline = (timezone.now() + timedelta(days=2)).isoformat()
+
+    def post(self, url, payload):
+        return self.client.post(url, data=json.dumps(payload), content_type="application/json")
+
+    def test_create_tasks(self):
+        payload = [
+            {"title": f"Task {i}", "deadline": self.deadline, "status_id": self.done.id} for i in range(5)
+        ] + [{"title": "Default status", "deadline": self.deadline}]
+        resp = self.post("/api/tasks/bulk/", payload)
+        self.assertEqual(resp.status_code, 201, resp.content)
+        self.assertEqual(resp.json()["errors"], [])
+        created = resp.json()["created"]
+        self.assertEqual(len(created), 6)
+        self.assertEqual(created[0]["status"], {"id": self.done.id, "name": "Done"})
+        self.assertEqual(created[-1]["status"]["name"], "To Do")
+        self.assertEqual(Task.objects.count(), 6)
+        self.assertEqual(compare_snapshot(), [])
+
+    def test_per_item_errors_do_not_abort_valid_rows(self):
+        past = (timezone.now() - timedelta(days=1)).isoformat()
+        payload = [
+            {"title": "ok", "deadline": self.deadline},
+            {"title": "bad status", "deadline": self.deadline, "status_id": 9999},
+            {"title": "past", "deadline": past},
+            "not an object",
+            {"title": "ok 2", "deadline": self.deadline},
+        ]
+        resp = self.post("/api/tasks/bulk/", payload)
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual([e["index"] for e in resp.json()["errors"]], [1, 2, 3])
+        self.assertIn("status_id", resp.json()["errors"][0]["errors"])
+        self.assertEqual(list(Task.objects.values_list("title", flat=True).order_by("id")), ["ok", "ok 2"])
+
+    def test_all_invalid_is_400(self):
+        resp = self.post("/api/tasks/bulk/", [{"title": "no deadline"}])
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(Task.objects.count(), 0)
+
+    def test_payload_must_be_non_empty_list(self):
+        self.assertEqual(self.post("/api/tasks/bulk/", {"title": "x"}).status_code, 400)
+        self.assertEqual(self.post("/api/tasks/bulk/", []).status_code, 400)
+
+    def test_create_subtasks_with_constant_queries(self):
+        task = Task.objects.create(title="Parent", status=self.todo, deadline=timezone.now() + timedelta(days=3))
+
+        def payload(n):
+            return [
+                {"title": f"Sub {i}", "deadline": self.deadline, "task_id": task.id, "status_id": self.done.id}
+                for i in range(n)
+            ] + [{"title": "orphan", "deadline": self.deadline, "task_id": 424242}]
+
+        # задачи, INSERT, журнал дедлайнов, снапшот, updated_at задачи (+ savepoint-ы) — не зависит от размера пачки;
+        # статусы берутся из прогретого реестра
+        status_registry.names_by_id()
+        with self.assertNumQueries(10):
+            resp = self.post("/api/subtasks/bulk/", payload(2))
+        self.assertEqual(resp.status_code, 207)
+        with self.assertNumQueries(10):
+            resp = self.post("/api/subtasks/bulk/", payload(20))
+        self.assertEqual(resp.json()["errors"][0]["index"], 20)
+        self.assertIn("task_id", resp.json()["errors"][0]["errors"])
+        self.assertEqual(resp.json()["created"][0]["task"], task.id)
+        self.assertEqual(task.subtasks.count(), 22)
+        self.assertEqual(compare_snapshot(), [])
@@ -0,0 +1,78 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.tests.utils import without_throttling
+from tasks.models import Task, SubTask, Status
+from tasks.stats import compare_snapshot
+
+
+@without_throttling
+class SubTaskBulkUpdateDeleteTest(TestCase):
+
+    def setUp(self):
+        self.todo = Status.objects.create(name="To Do")
+        self.done = Status.objects.create(name="Done")
+        deadline = timezone.now() + timedelta(days=1)
+        self.task = Task.objects.create(title="Parent", status=self.todo, deadline=deadline)
+        self.subtasks = [
+            SubTask.objects.create(
+                title=f"Sub {i}", description="" if i % 2 else "text", status=self.todo,
+                deadline=deadline, task=self.task,
+            )
+            for i in range(6)
+        ]
+        self.ids = [s.id for s in self.subtasks]
+
+    def send(self, method, payload):
+        return getattr(self.client, method)(
+            "/api/subtasks/bulk/", data=json.dumps(payload), content_type="application/json"
+        )
+
+    def statements(self, ctx, verb):
+        return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith(verb)]
+
+    def test_patch_runs_single_update(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.send("patch", {"ids": self.ids[:4], "fields": {"status_id": self.done.id, "description": ""}})
+        self.assertEqual(resp.status_code, 200, resp.content)
+        self.assertEqual(resp.json(), {"updated": 4})
+        self.assertEqual(len(self.statements(ctx, 'UPDATE "tasks_subtask"')), 1)
+        self.assertEqual(SubTask.objects.filter(status=self.done, description="").count(), 4)
+        self.assertEqual(compare_snapshot(), [])
+
+    def test_patch_validation(self):
+        self.assertEqual(self.send("patch", {"ids": self.ids, "fields": {}}).status_code, 400)
+        self.assertEqual(self.send("patch", {"ids": [], "fields": {"title": "x"}}).status_code, 400)
+        resp = self.send("patch", {"ids": self.ids, "fields": {"status_id": 9999}})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(SubTask.objects.filter(status=self.todo).count(), 6)
+
+    def test_delete_runs_single_delete(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.send("delete", {"ids": self.ids[:5] + [999999]})
+        self.assertEqual(resp.json(), {"deleted": 5})
+        self.assertEqual(len(self.statements(ctx, 'DELETE FROM "tasks_subtask"')), 1)
+        self.assertEqual(list(SubTask.objects.values_list("id", flat=True)), self.ids[5:])
+        self.assertEqual(compare_snapshot(), [])
+
+    def test_admin_actions_use_bulk_statements(self):
+        admin = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass12345")
+        self.client.force_login(admin)
+        url = "/admin/tasks/subtask/"
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(url, {"action": "cbv_smoke_test_patch", "_selected_action": self.ids})
+        self.assertEqual(len(self.statements(ctx, 'UPDATE "tasks_subtask"')), 1)
+        self.assertEqual(SubTask.objects.filter(description="Обновлено через admin CBV-smoke").count(), 6)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(url, {"action": "cbv_delete_via_api", "_selected_action": self.ids})
+        self.assertEqual(len(self.statements(ctx, 'DELETE FROM "tasks_subtask"')), 1)
+        self.assertFalse(SubTask.objects.exists())
+        self.assertEqual(compare_snapshot(), [])
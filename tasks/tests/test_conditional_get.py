@@ -0,0 +1,93 @@
+import json
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.tests.utils import without_throttling
+from tasks.models import Task, SubTask, Status
+
+
+@without_throttling
+class ConditionalDetailGetTest(TestCase):
+
+    def setUp(self):
+        self.todo = Status.objects.create(name="To Do")
+        deadline = timezone.now() + timedelta(days=1)
+        self.task = Task.objects.create(title="Task", status=self.todo, deadline=deadline)
+        self.subtask = SubTask.objects.create(title="Sub", status=self.todo, deadline=deadline, task=self.task)
+        self.task_url = f"/api/tasks/{self.task.pk}/"
+        self.subtask_url = f"/api/subtasks/{self.subtask.pk}/"
+
+    def etag(self, url):
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("Last-Modified", resp)
+        return resp["ETag"]
+
+    def test_if_none_match_returns_304_with_single_query(self):
+        for url in (self.task_url, self.subtask_url):
+            etag = self.etag(url)
+            with self.assertNumQueries(1):
+                resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(resp["ETag"], etag)
+            self.assertEqual(resp.content, b"")
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.task_url)["Last-Modified"]
+        resp = self.client.get(self.task_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(resp.status_code, 304)
+
+    def test_task_etag_changes_with_task_and_subtasks(self):
+        etag = self.etag(self.task_url)
+        self.subtask.title = "Renamed"
+        self.subtask.save()
+        etag2 = self.etag(self.task_url)
+        self.assertNotEqual(etag, etag2)
+
+        self.client.patch("/api/subtasks/bulk/", data=json.dumps({"ids": [self.subtask.pk], "fields": {"title": "x"}}),
+                          content_type="application/json")
+        etag3 = self.etag(self.task_url)
+        self.assertNotEqual(etag2, etag3)
+
+        self.subtask.delete()
+        self.assertNotEqual(etag3, self.etag(self.task_url))
+
+    def test_moving_subtask_changes_both_parents(self):
+        other = Task.objects.create(title="Other", status=self.todo, deadline=self.task.deadline)
+        old_etag, other_etag = self.etag(self.task_url), self.etag(f"/api/tasks/{other.pk}/")
+        self.subtask.task = other
+        self.subtask.save()
+
+        resp = self.client.get(self.task_url, HTTP_IF_NONE_MATCH=old_etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["subtasks"], [])
+        self.assertNotEqual(other_etag, self.etag(f"/api/tasks/{other.pk}/"))
+
+        # следующий перенос трогает уже other, а не исходную задачу
+        moved_etag = self.etag(f"/api/tasks/{other.pk}/")
+        self.subtask.task = self.task
+        self.subtask.save()
+        self.assertNotEqual(moved_etag, self.etag(f"/api/tasks/{other.pk}/"))
+
+    def test_subtask_etag_follows_parent_task_and_status_rename(self):
+        etag = self.etag(self.subtask_url)
+        self.task.title = "Parent renamed"
+        self.task.save()
+        etag2 = self.etag(self.subtask_url)
+        self.assertNotEqual(etag, etag2)
+
+        task_etag = self.etag(self.task_url)
+        self.todo.name = "Backlog"
+        self.todo.save()
+        self.assertNotEqual(etag2, self.etag(self.subtask_url))
+        self.assertNotEqual(task_etag, self.etag(self.task_url))
+
+    def test_stale_etag_gets_full_response(self):
+        resp = self.client.get(self.task_url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["id"], self.task.pk)
+
+    def test_missing_object_is_404(self):
+        self.assertEqual(self.client.get("/api/tasks/999999/").status_code, 404)
@@ -0,0 +1,155 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from tasks.bulk import bulk_create_objects
+from tasks.deadlines import DeadlineScheduler
+from tasks.models import DeadlineChange, DeadlineEvent, Task, SubTask, Status
+
+
+@override_settings(TASKS_DEADLINE_REMINDER_LEAD=3600)
+class DeadlineSchedulerTest(TestCase):
+
+    def setUp(self):
+        self.todo = Status.objects.create(name="To Do")
+        self.now = timezone.now()
+
+    def add_task(self, hours, **fields):
+        return Task.objects.create(title="T", status=self.todo, deadline=self.now + timedelta(hours=hours), **fields)
+
+    def events(self):
+        return sorted(DeadlineEvent.objects.values_list("kind", "model", "object_id"))
+
+    def test_flag_is_set_on_write(self):
+        past, future = self.add_task(-1), self.add_task(2)
+        self.assertTrue(past.is_overdue)
+        self.assertFalse(future.is_overdue)
+        past.deadline = self.now + timedelta(days=1)
+        past.save()
+        past.refresh_from_db()
+        self.assertFalse(past.is_overdue)
+
+    def test_string_and_naive_deadlines_are_converted(self):
+        past = Task.objects.create(title="T", status=self.todo, deadline="2000-01-01T10:00:00Z")
+        naive = (self.now + timedelta(days=1)).replace(tzinfo=None)
+        future = Task.objects.create(title="T", status=self.todo, deadline=naive)
+        self.assertTrue(past.is_overdue)
+        self.assertFalse(future.is_overdue)
+        self.assertTrue(timezone.is_aware(future.deadline))
+        self.assertEqual(Task.objects.get(pk=past.pk).deadline.year, 2000)
+
+    def test_bulk_create_converts_deadlines(self):
+        created = bulk_create_objects(Task, [
+            Task(title="Past", status=self.todo, deadline="2000-01-01 10:00"),
+            Task(title="Future", status=self.todo, deadline=(self.now + timedelta(days=1)).replace(tzinfo=None)),
+        ])
+        self.assertEqual([obj.is_overdue for obj in created], [True, False])
+        self.assertTrue(all(timezone.is_aware(obj.deadline) for obj in created))
+
+    def test_due_events_mark_overdue_and_fill_outbox(self):
+        soon, later = self.add_task(0.5), self.add_task(5)
+        subtask = SubTask.objects.create(
+            title="S", status=self.todo, deadline=self.now + timedelta(hours=2), task=later,
+        )
+        scheduler = DeadlineScheduler()
+        scheduler.load()
+
+        # через час: у soon наступил дедлайн, у подзадачи — время напоминания
+        counts = scheduler.run_due(self.now + timedelta(hours=1))
+        self.assertEqual(counts, {"reminder": 1, "overdue": 1})
+        self.assertEqual(self.events(), [("overdue", "task", soon.id), ("reminder", "subtask", subtask.id)])
+        self.assertTrue(Task.objects.get(pk=soon.pk).is_overdue)
+        self.assertFalse(SubTask.objects.get(pk=subtask.pk).is_overdue)
+        self.assertEqual(scheduler.next_run_at(), subtask.deadline)
+
+    def test_changes_reach_heap_through_journal(self):
+        scheduler = DeadlineScheduler()
+        scheduler.load()
+        task = self.add_task(3)
+        task.deadline = self.now + timedelta(hours=0.5)
+        task.save()
+        deleted = self.add_task(0.5)
+        deleted.delete()
+
+        self.assertEqual(scheduler.poll_changes(), 4)
+        self.assertFalse(DeadlineChange.objects.exists())  # прочитанное удаляется
+        self.assertEqual(scheduler.run_due(self.now + timedelta(hours=1)), {"reminder": 0, "overdue": 1})
+        # старая запись кучи (дедлайн через 3 часа) устарела и пропускается
+        self.assertEqual(scheduler.run_due(self.now + timedelta(hours=4)), {"reminder": 0, "overdue": 0})
+        self.assertEqual(self.events(), [("overdue", "task", task.id)])
+
+    def test_poll_reads_late_committed_rows(self):
+        scheduler = DeadlineScheduler()
+        early, task = self.add_task(3), self.add_task(0.5)
+        # строка early «ещё не закоммичена», когда воркер читает журнал
+        late = DeadlineChange.objects.get(object_id=early.pk)
+        DeadlineChange.objects.filter(pk=late.pk).delete()
+        self.assertEqual(scheduler.poll_changes(), 1)
+
+        late.save(force_insert=True)  # коммит с меньшим id, чем уже прочитанный
+        self.assertEqual(scheduler.poll_changes(), 1)
+        self.assertFalse(DeadlineChange.objects.exists())
+        self.assertEqual(scheduler.run_due(self.now + timedelta(hours=4)), {"reminder": 0, "overdue": 2})
+        self.assertEqual(self.events(), sorted([("overdue", "task", early.id), ("overdue", "task", task.id)]))
+
+    @override_settings(TASKS_DEADLINE_JOURNAL_MAX_ROWS=10)
+    def test_journal_is_capped_without_worker(self):
+        bulk_create_objects(Task, [
+            Task(title=f"T{i}", status=self.todo, deadline=self.now + timedelta(days=1)) for i in range(1000)
+        ])
+        self.assertEqual(DeadlineChange.objects.count(), 10)
+        self.assertEqual(
+            DeadlineChange.objects.order_by("-id").first().object_id, Task.objects.order_by("-id").first().id,
+        )
+
+    def test_overdue_updates_are_batched(self):
+        tasks = [self.add_task(0.5) for _ in range(5)]
+        scheduler = DeadlineScheduler(batch_size=2)
+        scheduler.load()
+        # 3 пачки: SELECT дедлайнов + UPDATE + INSERT в outbox (+ savepoint-ы) на пачку, не на задачу
+        with self.assertNumQueries(15):
+            scheduler.run_due(self.now + timedelta(hours=1))
+        self.assertEqual(Task.objects.filter(is_overdue=True).count(), len(tasks))
+
+    def test_no_events_for_rows_changed_behind_the_journal(self):
+        moved, deleted, kept = self.add_task(0.5), self.add_task(0.5), self.add_task(0.5)
+        scheduler = DeadlineScheduler()
+        scheduler.load()
+        # правки в обход сигналов (и журнала): перенос дедлайна и удаление
+        Task.objects.filter(pk=moved.pk).update(deadline=self.now + timedelta(days=1))
+        Task.objects.filter(pk=deleted.pk).delete()
+
+        counts = scheduler.run_due(self.now + timedelta(hours=1))
+        self.assertEqual(counts, {"reminder": 0, "overdue": 1})
+        self.assertEqual(self.events(), [("overdue", "task", kept.id)])
+        self.assertFalse(Task.objects.get(pk=moved.pk).is_overdue)
+
+    def test_restart_does_not_duplicate_events(self):
+        task = self.add_task(2)
+        for _ in range(2):
+            scheduler = DeadlineScheduler()
+            scheduler.load()
+            scheduler.run_due(self.now + timedelta(hours=1.5))
+        self.assertEqual(self.events(), [("reminder", "task", task.id)])
+
+    def test_bulk_create_sets_flag_and_journals(self):
+        created = bulk_create_objects(Task, [
+            Task(title="Past", status=self.todo, deadline=self.now - timedelta(hours=1)),
+            Task(title="Future", status=self.todo, deadline=self.now + timedelta(hours=1)),
+        ])
+        self.assertEqual(
+            list(Task.objects.order_by("id").values_list("is_overdue", flat=True)), [True, False]
+        )
+        self.assertEqual(
+            sorted(DeadlineChange.objects.values_list("object_id", flat=True)), [obj.id for obj in created]
+        )
+
+    def test_command_once(self):
+        task = self.add_task(-1)
+        out = StringIO()
+        call_command("run_deadline_scheduler", "--once", stdout=out)
+        self.assertIn("просрочено: 1", out.getvalue())
+        self.assertEqual(self.events(), [("overdue", "task", task.id)])
@@ -0,0 +1,148 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from accounts.tests.utils import without_throttling
+from accounts.tokens import VersionedRefreshToken
+from tasks.export import CSV_COLUMNS, export_stream
+from tasks.models import Task, SubTask, Status
+
+
+def bearer(username):
+    user = get_user_model().objects.create_user(username=username, password="pass12345")
+    return {"Authorization": f"Bearer {VersionedRefreshToken.for_user(user).access_token}"}
+
+
+@without_throttling
+class ExportTest(TestCase):
+
+    def setUp(self):
+        self.auth = bearer("exporter")
+        now = timezone.now()
+        self.todo = Status.objects.create(name="To Do")
+        self.done = Status.objects.create(name="Done")
+        self.tasks = [
+            Task.objects.create(title=f"Task {i}", description="Описание" if i == 0 else "",
+                                status=self.todo, deadline=now + timedelta(days=i + 1))
+            for i in range(5)
+        ]
+        for task in self.tasks[:2]:
+            for j in range(2):
+                SubTask.objects.create(title=f"{task.title}.{j}", status=self.done,
+                                       deadline=now + timedelta(days=1), task=task)
+
+    def read(self, **params):
+        resp = self.client.get("/api/export/", params, headers=self.auth)
+        self.assertEqual(resp.status_code, 200)
+        return resp, b"".join(resp.streaming_content)
+
+    def test_ndjson_embeds_subtasks(self):
+        resp, body = self.read()
+        self.assertTrue(resp["Content-Type"].startswith("application/x-ndjson"))
+        self.assertIn('.ndjson"', resp["Content-Disposition"])
+        records = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([r["title"] for r in records], [f"Task {i}" for i in range(5)])
+        self.assertEqual(records[0]["description"], "Описание")
+        self.assertEqual(records[0]["status"], "To Do")
+        self.assertEqual([s["title"] for s in records[0]["subtasks"]], ["Task 0.0", "Task 0.1"])
+        self.assertEqual(records[0]["subtasks"][0]["status"], "Done")
+        self.assertEqual(records[4]["subtasks"], [])
+        detail = self.client.get(f"/api/tasks/{self.tasks[0].id}/").json()
+        self.assertEqual(records[0]["deadline"], detail["deadline"])  # даты в формате API
+
+    def test_csv_has_row_per_subtask(self):
+        resp, body = self.read(format="csv")
+        self.assertTrue(resp["Content-Type"].startswith("text/csv"))
+        rows = list(csv.reader(io.StringIO(body.decode())))
+        self.assertEqual(rows[0], CSV_COLUMNS)
+        self.assertEqual(len(rows), 1 + 4 + 3)  # 2 задачи × 2 подзадачи + 3 задачи без подзадач
+        self.assertEqual(rows[1][CSV_COLUMNS.index("subtask_title")], "Task 0.0")
+        self.assertEqual(rows[-1][CSV_COLUMNS.index("task_title")], "Task 4")
+        self.assertEqual(rows[-1][CSV_COLUMNS.index("subtask_id")], "")
+
+    def test_gzip_on_the_fly(self):
+        _, plain = self.read()
+        resp, compressed = self.read(gzip=1)
+        self.assertEqual(resp["Content-Type"], "application/gzip")
+        self.assertIn('.ndjson.gz"', resp["Content-Disposition"])
+        self.assertEqual(gzip.decompress(compressed), plain)
+
+    def test_unknown_format(self):
+        resp = self.client.get("/api/export/", {"format": "xml"}, headers=self.auth)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json()["allowed"], ["ndjson", "csv"])
+
+    def test_requires_authentication(self):
+        self.assertEqual(self.client.get("/api/export/").status_code, 401)
+
+    async def test_asgi_streams_async_iterator(self):
+        _, plain = await self.async_read()
+        resp, body = await self.async_read(gzip=1)
+        self.assertEqual(gzip.decompress(body), plain)
+        self.assertEqual(len(plain.splitlines()), 5)
+
+    async def async_read(self, **params):
+        resp = await self.async_client.get("/api/export/", params, headers=self.auth)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.is_async)  # иначе Django под ASGI читает весь поток в память
+        return resp, b"".join([chunk async for chunk in resp.streaming_content])
+
+    def test_queries_per_chunk_not_per_task(self):
+        stats = {}
+        # savepoint-ы снимка + статусы + задачи одним курсором + подзадачи по запросу на пачку из 2 задач
+        with self.assertNumQueries(2 + 1 + 1 + 3):
+            chunks = list(export_stream(chunk_size=2, stats=stats))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(stats, {"tasks": 5, "subtasks": 4})
+
+    def test_command_writes_file(self):
+        path = os.path.join(tempfile.mkdtemp(), "tasks.csv.gz")
+        self.addCleanup(os.remove, path)
+        out = StringIO()
+        call_command("export_tasks", path, stdout=out)
+        self.assertIn("Задач: 5, подзадач: 4", out.getvalue())
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self.assertEqual(next(csv.reader(f)), CSV_COLUMNS)
+
+
+@without_throttling
+class ExportSnapshotTest(TransactionTestCase):
+
+    def test_download_does_not_hold_the_snapshot_transaction(self):
+        status = Status.objects.create(name="To Do")
+        Task.objects.create(title="Before", status=status, deadline=timezone.now())
+        resp = self.client.get("/api/export/", headers=bearer("exporter"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(connection.in_atomic_block)
+
+        # клиент ещё не начал качать — запись из другого соединения не ждёт конца выгрузки
+        errors = []
+
+        def write():
+            try:
+                Task.objects.create(title="During", status=status, deadline=timezone.now())
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        thread.join()
+        self.assertEqual(errors, [])
+
+        titles = [json.loads(line)["title"] for line in b"".join(resp.streaming_content).splitlines()]
+        self.assertEqual(titles, ["Before"])  # снимок — на момент запроса
+        self.assertEqual(Task.objects.count(), 2)
@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks.export import export_stream
+from tasks.importer import import_ndjson, read_checkpoint
+from tasks.models import Task, SubTask, Status
+from tasks.status_registry import status_registry
+
+
+class ImportTasksTest(TestCase):
+
+    def setUp(self):
+        status_registry.clear()
+        self.todo = Status.objects.create(name="To Do")
+        self.done = Status.objects.create(name="Done")
+        self.deadline = (timezone.now() + timedelta(days=2)).isoformat()
+        self.dir = tempfile.mkdtemp()
+
+    def write(self, records, name="tasks.ndjson"):
+        path = os.path.join(self.dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(record if isinstance(record, str) else json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+        return path
+
+    def record(self, title, subtasks=0, **fields):
+        return {
+            "title": title, "status": "Done", "deadline": self.deadline, **fields,
+            "subtasks": [{"title": f"{title}.{i}", "deadline": self.deadline} for i in range(subtasks)],
+        }
+
+    def test_export_import_round_trip(self):
+        task = Task.objects.create(title="Задача", description="d", status=self.done,
+                                   deadline=timezone.now() + timedelta(days=1))
+        SubTask.objects.create(title="Sub", status=self.todo, deadline=task.deadline, task=task)
+        path = os.path.join(self.dir, "export.ndjson.gz")
+        with open(path, "wb") as f:
+            f.writelines(export_stream(compress=True))
+        Task.objects.all().delete()
+
+        stats = import_ndjson(path)
+        self.assertEqual((stats.tasks, stats.subtasks, stats.skipped), (1, 1, 0))
+        imported = Task.objects.get()
+        self.assertEqual((imported.title, imported.description, imported.status_id), ("Задача", "d", self.done.id))
+        self.assertEqual((imported.deadline, imported.created_at), (task.deadline, task.created_at))
+        self.assertEqual(list(imported.subtasks.values_list("title", "status_id")), [("Sub", self.todo.id)])
+
+    def test_invalid_records_are_skipped(self):
+        path = self.write([
+            self.record("ok", subtasks=2),
+            "{not json",
+            self.record("", subtasks=0),
+            self.record("bad status", status="Nope"),
+            self.record("bad sub", subtasks=0) | {"subtasks": [{"title": "s", "deadline": "вчера"}]},
+            self.record("default status", status=None, deadline="2020-01-01T10:00:00Z"),
+        ])
+        stats = import_ndjson(path)
+        self.assertEqual((stats.tasks, stats.subtasks, stats.skipped), (2, 2, 4))
+        self.assertIn("status: неизвестный статус 'Nope'", [message for _, message in stats.errors])
+        past = Task.objects.get(title="default status")
+        self.assertEqual(past.status_id, self.todo.id)
+        self.assertTrue(past.is_overdue)  # как при bulk-вставке: флаг по дедлайну
+
+    def test_batches_are_separate_transactions(self):
+        path = self.write([self.record(f"T{i}", subtasks=1) for i in range(5)])
+        seen = []
+        import_ndjson(path, batch_size=2, on_batch=lambda stats: seen.append((stats.tasks, stats.offset)))
+        self.assertEqual([tasks for tasks, _ in seen], [2, 4, 5])
+        self.assertEqual(seen[-1][1], os.path.getsize(path))
+
+    def test_resume_after_crash(self):
+        path = self.write([self.record(f"T{i}", subtasks=1) for i in range(5)])
+        checkpoint = path + ".checkpoint"
+
+        def crash(stats):
+            if stats.tasks >= 4:
+                raise RuntimeError("crash")
+
+        with self.assertRaises(RuntimeError):
+            import_ndjson(path, batch_size=2, checkpoint=checkpoint, on_batch=crash)
+        self.assertEqual(Task.objects.count(), 4)
+        offset = read_checkpoint(checkpoint, path)
+
+        out = StringIO()
+        call_command("import_tasks", path, "--resume", stdout=out)
+        self.assertIn(f"Продолжение с байта {offset}", out.getvalue())
+        self.assertIn("Задач: 1, подзадач: 1", out.getvalue())
+        self.assertEqual(sorted(Task.objects.values_list("title", flat=True)), [f"T{i}" for i in range(5)])
+        self.assertEqual(SubTask.objects.count(), 5)
+
+    def test_command_reports_rate_and_validates_options(self):
+        path = self.write([self.record("T", subtasks=3)])
+        out = StringIO()
+        call_command("import_tasks", path, "--offset", "0", stdout=out, stderr=StringIO())
+        self.assertIn("строк/с", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("import_tasks", path, "--offset", "0", "--resume")
+        other = self.write([{"file": "/elsewhere.ndjson", "offset": 10}], "other.checkpoint")
+        with self.assertRaises(CommandError):  # точка от другого файла
+            call_command("import_tasks", path, "--resume", "--checkpoint", other)
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from tasks import response_cache
+from tasks.models import Task, SubTask, Status
+from tasks.serializers import (
+    SubTaskCreateSerializer,
+    SubTaskLeanSerializer,
+    TaskCreateSerializer,
+    TaskLeanSerializer,
+)
+from tasks.status_registry import status_registry
+
+
+class LeanSerializerEquivalenceTest(TestCase):
+    """
+    Быстрый путь списков должен давать тот же JSON, что и DRF-сериализаторы.
+    """
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        todo = Status.objects.create(name="To Do")
+        done = Status.objects.create(name="Готово")
+        base = timezone.now().replace(microsecond=123456)
+        task = Task.objects.create(
+            title="Задача «кавычки» \"и\" \\слэши", description="", status=todo,
+            deadline=base + timedelta(days=1),
+        )
+        Task.objects.create(
+            title="Second", description="многострочное\nописание", status=done,
+            deadline=(base + timedelta(days=2)).replace(microsecond=0),
+        )
+        SubTask.objects.create(title="Sub", status=done, deadline=base + timedelta(hours=5), task=task)
+        SubTask.objects.create(
+            title="Sub 2", description="d", status=todo, deadline=base, task=task,
+            created_at=base - timedelta(days=3),
+        )
+
+    def assertSameJson(self, model, drf_serializer_class, lean_serializer_class):
+        drf_data = drf_serializer_class(model.objects.order_by("id"), many=True).data
+        lean = lean_serializer_class()
+        lean_data = [
+            lean.to_representation(row)
+            for row in model.objects.order_by("id").values(*lean.values_fields)
+        ]
+        self.assertEqual(JSONRenderer().render(lean_data), JSONRenderer().render(drf_data))
+
+    def test_task_equivalence(self):
+        self.assertSameJson(Task, TaskCreateSerializer, TaskLeanSerializer)
+
+    def test_subtask_equivalence(self):
+        self.assertSameJson(SubTask, SubTaskCreateSerializer, SubTaskLeanSerializer)
+
+    def test_equivalence_in_non_utc_timezone(self):
+        with timezone.override("Europe/Moscow"):
+            self.assertSameJson(Task, TaskCreateSerializer, TaskLeanSerializer)
+            self.assertSameJson(SubTask, SubTaskCreateSerializer, SubTaskLeanSerializer)
+
+    def test_list_endpoints_use_lean_path(self):
+        for url, model, serializer_class in (
+            ("/api/tasks/", Task, TaskCreateSerializer),
+            ("/api/subtasks/", SubTask, SubTaskCreateSerializer),
+        ):
+            # один SELECT, без сборки инстансов и без запросов на связанные объекты
+            # (имена статусов — из прогретого реестра)
+            status_registry.names_by_id()
+            with self.assertNumQueries(1):
+                resp = self.client.get(url)
+            expected = serializer_class(model.objects.order_by("created_at", "id"), many=True).data
+            self.assertEqual(resp.content, JSONRenderer().render({
+                "next": None, "previous": None, "results": expected,
+            }))
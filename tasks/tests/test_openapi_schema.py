@@ -0,0 +1,65 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from tasks.openapi import schema_path
+
+
+class PrecomputedSchemaTest(TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.schema_dir = Path(tmp.name)
+        settings_override = override_settings(SWAGGER_SCHEMA_DIR=self.schema_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def generate(self):
+        call_command("generate_openapi_schema", stdout=StringIO())
+
+    def test_command_writes_json_and_yaml(self):
+        self.generate()
+        schema = json.loads(schema_path("json").read_text())
+        self.assertEqual(schema["info"]["title"], "Task Manager API")
+        self.assertEqual(schema["basePath"], "/api")
+        self.assertIn("/tasks/", schema["paths"])
+        self.assertNotIn("host", schema)
+        # сериализатор PATCH выбирается по методу подставного запроса
+        self.assertIn("SubTaskBulkUpdate", json.dumps(schema["paths"]["/subtasks/bulk/"]["patch"]))
+        self.assertTrue(schema_path("yaml").read_text().startswith("swagger:"))
+
+    def test_served_from_disk_with_caching_headers(self):
+        self.generate()
+        resp = self.client.get("/swagger.json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content, schema_path("json").read_bytes())
+        self.assertIn("max-age=", resp["Cache-Control"])
+        self.assertIn("Last-Modified", resp)
+
+        resp = self.client.get("/swagger.json", HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(self.client.get("/swagger.yaml")["Content-Type"], "application/yaml; charset=utf-8")
+
+    def test_regenerated_file_is_picked_up(self):
+        self.generate()
+        etag = self.client.get("/swagger.json")["ETag"]
+        schema_path("json").write_text('{"swagger": "2.0"}')
+        resp = self.client.get("/swagger.json")
+        self.assertNotEqual(resp["ETag"], etag)
+        self.assertEqual(resp.json(), {"swagger": "2.0"})
+
+    def test_missing_schema_without_debug_is_404(self):
+        resp = self.client.get("/swagger.json")
+        self.assertEqual(resp.status_code, 404)
+        self.assertIn("generate_openapi_schema", resp.json()["error"])
+
+    @override_settings(DEBUG=True)
+    def test_missing_schema_falls_back_to_live_generation_in_debug(self):
+        resp = self.client.get("/swagger.json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("/tasks/", json.loads(resp.content)["paths"])
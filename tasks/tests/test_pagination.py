@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tasks import response_cache
+from tasks.models import Task, SubTask, Status
+
+
+class KeysetPaginationTest(TestCase):
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.client = APIClient()
+        self.todo = Status.objects.create(name="To Do")
+        self.done = Status.objects.create(name="Done")
+        base = timezone.now() - timedelta(days=1)
+        deadline = timezone.now() + timedelta(days=5)
+        # Два объекта с одинаковым created_at — проверяем tie-breaker по id
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {i}",
+                status=self.todo if i % 2 else self.done,
+                deadline=deadline,
+                created_at=base + timedelta(minutes=min(i, 3)),
+            )
+            for i in range(6)
+        ]
+        for i, task in enumerate(self.tasks[:3]):
+            SubTask.objects.create(
+                title=f"Sub {i}", status=self.todo, deadline=deadline, task=task,
+                created_at=base + timedelta(minutes=i),
+            )
+
+    def _walk(self, url):
+        ids, pages = [], 0
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            ids.extend(item["id"] for item in resp.data["results"])
+            url = resp.data["next"]
+            pages += 1
+        return ids, pages
+
+    def test_forward_walk_returns_every_row_once(self):
+        ids, pages = self._walk("/api/tasks/?page_size=2")
+        expected = [t.id for t in sorted(self.tasks, key=lambda t: (t.created_at, t.id))]
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_descending_ordering(self):
+        ids, _ = self._walk("/api/tasks/?page_size=4&ordering=-created_at")
+        expected = [t.id for t in sorted(self.tasks, key=lambda t: (t.created_at, t.id), reverse=True)]
+        self.assertEqual(ids, expected)
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get("/api/tasks/?page_size=2")
+        self.assertIsNone(first.data["previous"])
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(
+            [item["id"] for item in back.data["results"]],
+            [item["id"] for item in first.data["results"]],
+        )
+
+    def test_works_with_filters_and_search(self):
+        ids, _ = self._walk(f"/api/tasks/?page_size=1&status={self.todo.id}&search=Task")
+        self.assertEqual(ids, [t.id for t in self.tasks if t.status_id == self.todo.id])
+
+    def test_subtasks_are_paginated(self):
+        ids, pages = self._walk("/api/subtasks/?page_size=2")
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(pages, 2)
+
+    def test_no_count_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/tasks/?page_size=2")
+        self.assertNotIn("count", resp.data)
+        self.assertFalse(any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries))
+
+    def test_invalid_cursor_is_404(self):
+        resp = self.client.get("/api/tasks/?cursor=not-a-cursor")
+        self.assertEqual(resp.status_code, 404)
@@ -0,0 +1,70 @@
+import json
+from datetime import timedelta
+
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from accounts.tests.utils import without_throttling
+from tasks import views
+from tasks.models import Task, SubTask, Status
+
+
+@without_throttling
+class NestedSerializationQueryCountTest(TestCase):
+    """
+    Число запросов вложенных read-эндпоинтов не должно зависеть от числа подзадач.
+    """
+
+    def setUp(self):
+        self.statuses = [Status.objects.create(name=name) for name in ("To Do", "In Progress", "Done")]
+        deadline = timezone.now() + timedelta(days=3)
+        self.small = Task.objects.create(title="Small", status=self.statuses[0], deadline=deadline)
+        self.large = Task.objects.create(title="Large", status=self.statuses[1], deadline=deadline)
+        SubTask.objects.create(title="Only", status=self.statuses[2], deadline=deadline, task=self.small)
+        for i in range(6):
+            SubTask.objects.create(
+                title=f"Sub {i}", status=self.statuses[i % 3], deadline=deadline, task=self.large
+            )
+        self.factory = RequestFactory()
+
+    def test_task_detail_view(self):
+        for task in (self.small, self.large):
+            # updated_at для ETag, задача + статус, подзадачи + статусы
+            with self.assertNumQueries(3):
+                resp = self.client.get(f"/api/tasks/{task.pk}/")
+            self.assertEqual(len(resp.data["subtasks"]), task.subtasks.count())
+
+    def test_task_detail_update(self):
+        for task in (self.small, self.large):
+            # SELECT задачи, prefetch подзадач, UPDATE, повторный prefetch подзадач
+            with self.assertNumQueries(4):
+                resp = self.client.patch(
+                    f"/api/tasks/{task.pk}/", data=json.dumps({"title": "Renamed"}),
+                    content_type="application/json",
+                )
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.data["subtasks"][0]["status"]["name"], task.subtasks.first().status.name)
+
+    def test_subtask_detail_view(self):
+        for subtask in SubTask.objects.all():
+            # updated_at для ETag, подзадача + статус + задача + статус задачи
+            with self.assertNumQueries(2):
+                resp = self.client.get(f"/api/subtasks/{subtask.pk}/")
+            self.assertEqual(resp.data["task"]["status"]["id"], subtask.task.status_id)
+
+    def test_api_task_subtasks(self):
+        for task in (self.small, self.large):
+            request = self.factory.get(f"/api/tasks/{task.pk}/subtasks/")
+            with self.assertNumQueries(2):
+                resp = views.api_task_subtasks(request, task.pk)
+            data = json.loads(resp.content)
+            self.assertEqual(len(data["subtasks"]), task.subtasks.count())
+            self.assertEqual(data["subtasks"][0]["task"]["status"]["id"], task.status_id)
+
+    def test_function_based_detail_views(self):
+        for task in (self.small, self.large):
+            with self.assertNumQueries(2):
+                views.api_task_detail(self.factory.get("/"), task.pk)
+        subtask_id = SubTask.objects.first().pk
+        with self.assertNumQueries(1):
+            views.api_subtask_detail(self.factory.get("/"), subtask_id)
@@ -0,0 +1,87 @@
+import re
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models import Count
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+
+from tasks.filters import FullTextSearchFilter
+from tasks.models import Task, SubTask, Status
+from tasks.querysets import title_prefix_queryset
+from tasks.views_subtasks import SubTaskListCreateView
+from tasks.views_tasks import TaskListCreateView
+
+# "SCAN tasks_task" без "USING ... INDEX" — полный проход по таблице
+FULL_SCAN = re.compile(r"\bSCAN (tasks_task|tasks_subtask)\b(?!.*USING (COVERING )?INDEX)")
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN есть только в SQLite")
+class QueryPlanRegressionTest(TestCase):
+    """
+    Горячие запросы Task/SubTask не должны скатываться в полный скан таблицы.
+    Если тест упал — посмотрите план в сообщении и проверьте Meta.indexes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.todo = Status.objects.create(name="To Do")
+        cls.task = Task.objects.create(
+            title="Task", status=cls.todo, deadline=timezone.now() + timedelta(days=1)
+        )
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        self.assertIsNone(FULL_SCAN.search(plan), f"Полный скан таблицы:\n{plan}")
+
+    def test_task_list_view(self):
+        qs = Task.objects.select_related("status")
+        self.assertUsesIndex(qs.order_by("created_at", "id"))
+        self.assertUsesIndex(qs.order_by("-created_at", "-id"))
+        self.assertUsesIndex(qs.filter(status=self.todo).order_by("created_at", "id"))
+        self.assertUsesIndex(qs.filter(deadline__gte=timezone.now()).order_by("created_at", "id"))
+
+    def test_subtask_list_view(self):
+        qs = SubTask.objects.select_related("task", "status")
+        self.assertUsesIndex(qs.order_by("created_at", "id"))
+        self.assertUsesIndex(qs.filter(task_id=self.task.id).order_by("created_at"))
+        self.assertUsesIndex(qs.filter(status__name="To Do").order_by("created_at", "id"))
+
+    def test_api_task_list(self):
+        qs = Task.objects.order_by("-deadline")
+        self.assertUsesIndex(qs)
+        self.assertUsesIndex(qs.filter(status__name="To Do"))
+        self.assertUsesIndex(qs.filter(deadline__lt=timezone.now()))
+
+    def test_api_task_stats(self):
+        now = timezone.now()
+        for model in (Task, SubTask):
+            self.assertUsesIndex(model.objects.filter(deadline__lt=now))
+            self.assertUsesIndex(model.objects.filter(description=""))
+            self.assertUsesIndex(model.objects.values("status__name").annotate(count=Count("id")))
+        self.assertUsesIndex(Task.objects.filter(deadline__gte=now).order_by("deadline")[:3])
+
+    def test_search(self):
+        # ?search= идёт через FTS5-индекс (миграция 0009), а не LIKE по title/description
+        request = RequestFactory().get("/", {"search": "Task"})
+        for view_class, model in ((TaskListCreateView, Task), (SubTaskListCreateView, SubTask)):
+            view = view_class()
+            queryset = FullTextSearchFilter().filter_queryset(Request(request), model.objects.all(), view)
+            self.assertUsesIndex(queryset.order_by("rank", "id"))
+
+    def test_title_autocomplete(self):
+        self.assertUsesIndex(title_prefix_queryset(Task.objects.all(), "ta")[:10])
+        self.assertUsesIndex(title_prefix_queryset(Task.objects.all(), "док")[:10])
+
+    def test_admin_date_hierarchy(self):
+        now = timezone.now()
+        self.assertUsesIndex(Task.objects.filter(deadline__gte=now, deadline__lt=now + timedelta(days=31)))
+        self.assertUsesIndex(Task.objects.dates("deadline", "year"))
+        self.assertUsesIndex(SubTask.objects.dates("created_at", "month"))
+
+    def test_detector_flags_full_scan(self):
+        # title не индексирован — убеждаемся, что сам детектор работает
+        plan = Task.objects.filter(title="Task").explain()
+        self.assertIsNotNone(FULL_SCAN.search(plan), plan)
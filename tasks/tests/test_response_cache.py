@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.tests.utils import without_throttling
+from tasks import response_cache
+from tasks.bulk import bulk_update_subtasks
+from tasks.models import Task, SubTask, Status
+
+
+@without_throttling
+class ResponseCacheTest(TestCase):
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        response_cache.reset_counters()
+        self.todo = Status.objects.create(name="To Do")
+        self.done = Status.objects.create(name="Done")
+        deadline = timezone.now() + timedelta(days=2)
+        self.task = Task.objects.create(title="First", status=self.todo, deadline=deadline)
+        self.subtask = SubTask.objects.create(title="Sub", status=self.todo, deadline=deadline, task=self.task)
+        self.deadline = deadline.isoformat()
+
+    def test_repeated_list_is_served_from_cache(self):
+        first = self.client.get("/api/tasks/?search=First&ordering=created_at")
+        self.assertEqual(first["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            # порядок параметров не важен
+            second = self.client.get("/api/tasks/?ordering=created_at&search=First")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(self.client.get("/api/tasks/?search=Other")["X-Cache"], "MISS")
+
+    def test_writes_invalidate_list(self):
+        self.client.get("/api/tasks/")
+        self.client.post(
+            "/api/tasks/", {"title": "Second", "deadline": self.deadline}, content_type="application/json"
+        )
+        resp = self.client.get("/api/tasks/")
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual([row["title"] for row in resp.json()["results"]], ["First", "Second"])
+
+    def test_status_rename_invalidates_dependent_lists(self):
+        self.client.get("/api/subtasks/")
+        self.todo.name = "Backlog"
+        self.todo.save()
+        resp = self.client.get("/api/subtasks/")
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual(resp.json()["results"][0]["status"]["name"], "Backlog")
+
+    def test_bulk_operations_invalidate(self):
+        self.client.get("/api/subtasks/")
+        self.client.get("/api/tasks/")
+        bulk_update_subtasks([self.subtask.id], {"status": self.done})
+        resp = self.client.get("/api/subtasks/")
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual(resp.json()["results"][0]["status"]["id"], self.done.id)
+        # список задач от подзадач не зависит
+        self.assertEqual(self.client.get("/api/tasks/")["X-Cache"], "HIT")
+
+    def test_stats_cached_until_write(self):
+        self.assertEqual(self.client.get("/api/stats/?fields=tasks")["X-Cache"], "MISS")
+        self.assertEqual(self.client.get("/api/stats/?fields=tasks")["X-Cache"], "HIT")
+        Task.objects.create(title="More", status=self.done, deadline=timezone.now())
+        resp = self.client.get("/api/stats/?fields=tasks")
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual(resp.json()["stats"]["tasks"]["total"], 2)
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            self.assertEqual(self.client.get("/api/tasks/?cursor=bogus").status_code, 404)
+        self.assertEqual(response_cache.counters()["hits"], 0)
+
+    def test_counters_endpoint(self):
+        self.client.get("/api/tasks/")
+        self.client.get("/api/tasks/")
+        self.client.get("/api/stats/")
+        data = self.client.get("/api/cache/stats/").json()
+        self.assertEqual(data["cache"]["hits"], 1)
+        self.assertEqual(data["cache"]["misses"], 2)
+        self.assertEqual(data["cache"]["endpoints"]["tasks"], {"hits": 1, "misses": 1})
+        self.assertEqual(data["backend"], "responses")
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks import response_cache
+from tasks.bulk import bulk_delete_subtasks, bulk_update_subtasks
+from tasks.filters import fts_available
+from tasks.models import Task, SubTask, Status
+
+
+@skipUnless(connection.vendor == "sqlite", "FTS5-индекс создаётся только в SQLite")
+class FullTextSearchTest(TestCase):
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.todo = Status.objects.create(name="To Do")
+        self.deadline = timezone.now() + timedelta(days=3)
+
+    def task(self, title, description=""):
+        return Task.objects.create(title=title, description=description, status=self.todo, deadline=self.deadline)
+
+    def search(self, url, query, **params):
+        resp = self.client.get(url, {"search": query, **params})
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def titles(self, query, **params):
+        return [row["title"] for row in self.search("/api/tasks/", query, **params)["results"]]
+
+    def test_index_exists(self):
+        self.assertTrue(fts_available(Task))
+        self.assertTrue(fts_available(SubTask))
+
+    def test_prefix_and_case_insensitive_match(self):
+        self.task("Документация API")
+        self.task("Отчёт", "черновик документа")
+        self.task("Релиз")
+        self.assertCountEqual(self.titles("док"), ["Документация API", "Отчёт"])
+        self.assertEqual(self.titles("ДОКУМЕНТАЦ api"), ["Документация API"])
+        self.assertEqual(self.titles("нет-такого"), [])
+
+    def test_results_ordered_by_relevance(self):
+        self.task("Старый", "в длинном описании один раз встречается слово deploy среди прочего текста")
+        self.task("deploy deploy deploy")
+        self.assertEqual(self.titles("deploy"), ["deploy deploy deploy", "Старый"])
+        # явная сортировка побеждает релевантность
+        self.assertEqual(self.titles("deploy", ordering="created_at"), ["Старый", "deploy deploy deploy"])
+
+    def test_keyset_pagination_by_rank(self):
+        for i in range(5):
+            self.task(f"alpha {i}", "alpha " * i)
+        self.task("beta")
+        seen = []
+        data = self.search("/api/tasks/", "alpha", page_size=2)
+        while True:
+            seen += [row["title"] for row in data["results"]]
+            if not data["next"]:
+                break
+            data = self.client.get(data["next"]).json()
+        self.assertCountEqual(seen, [f"alpha {i}" for i in range(5)])
+        self.assertEqual(seen, self.titles("alpha", page_size=10))
+
+    def test_index_follows_writes(self):
+        task = self.task("Первое имя")
+        task.title = "Второе имя"
+        task.save()
+        self.assertEqual(self.titles("Первое"), [])
+        self.assertEqual(self.titles("Второе"), ["Второе имя"])
+
+        subtask = SubTask.objects.create(title="sub", description="find me", status=self.todo,
+                                         deadline=self.deadline, task=task)
+        bulk_update_subtasks([subtask.id], {"description": "changed"})
+        self.assertEqual(self.search("/api/subtasks/", "find")["results"], [])
+        self.assertEqual(len(self.search("/api/subtasks/", "chang")["results"]), 1)
+        bulk_delete_subtasks([subtask.id])
+        self.assertEqual(self.search("/api/subtasks/", "chang")["results"], [])
+
+    def test_fts_syntax_in_query_is_escaped(self):
+        self.task('say "hello" NEAR(world)')
+        self.assertEqual(self.titles('"hello" NEAR('), ['say "hello" NEAR(world)'])
+        self.assertEqual(self.titles("*"), [])
+
+    def test_rank_ordering_without_search_is_ignored(self):
+        self.task("a")
+        resp = self.client.get("/api/tasks/", {"ordering": "rank"})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_fallback_to_icontains_without_fts(self):
+        self.task("Документация API")
+        self.task("Прочее")
+        with mock.patch("tasks.filters.fts_available", return_value=False):
+            # icontains ищет подстроку, а не префикс слова
+            self.assertEqual(self.titles("ментац"), ["Документация API"])
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks import response_cache
+from tasks.models import Task, SubTask, Status
+from tasks.status_registry import status_registry
+
+
+class TaskStatsApiTest(TestCase):
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        now = timezone.now()
+        self.todo = Status.objects.create(name="To Do")
+        self.done = Status.objects.create(name="Done")
+        self.review = Status.objects.create(name="Review")
+        self.future = Task.objects.create(
+            title="Future", description="desc", status=self.todo, deadline=now + timedelta(days=2)
+        )
+        self.past = Task.objects.create(
+            title="Past", status=self.done, deadline=now - timedelta(days=1)
+        )
+        Task.objects.create(title="Review", status=self.review, deadline=now + timedelta(days=5))
+        SubTask.objects.create(
+            title="Sub", status=self.todo, deadline=now - timedelta(hours=1), task=self.future
+        )
+        SubTask.objects.create(
+            title="Sub 2", description="x", status=self.done, deadline=now + timedelta(days=1), task=self.future
+        )
+
+    def test_response_shape_and_values(self):
+        resp = self.client.get("/api/stats/")
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertTrue(data["success"])
+        self.assertEqual(data["stats"]["tasks"], {
+            "total": 3,
+            "by_status": {"To Do": 1, "Done": 1, "Review": 1},
+            "overdue": 1,
+            "without_description": 2,
+        })
+        self.assertEqual(data["stats"]["subtasks"], {
+            "total": 2,
+            "by_status": {"To Do": 1, "Done": 1, "Review": 0},
+            "overdue": 1,
+            "without_description": 1,
+        })
+        self.assertEqual(
+            [item["id"] for item in data["stats"]["upcoming_deadlines"]],
+            [self.future.id, Task.objects.get(title="Review").id],
+        )
+        self.assertEqual(
+            set(data["stats"]["upcoming_deadlines"][0]), {"id", "title", "deadline", "days_until"}
+        )
+
+    def test_query_count_does_not_depend_on_table_size(self):
+        # снапшот (+ просроченные подзапросами), ближайшие дедлайны; имена статусов — из реестра
+        status_registry.names_by_id()
+        with self.assertNumQueries(2):
+            self.client.get("/api/stats/")
+
+    def test_fields_selector(self):
+        status_registry.names_by_id()
+        with self.assertNumQueries(1):
+            resp = self.client.get("/api/stats/?fields=subtasks")
+        self.assertEqual(list(resp.json()["stats"]), ["subtasks"])
+
+        resp = self.client.get("/api/stats/?fields=upcoming_deadlines,tasks")
+        self.assertEqual(set(resp.json()["stats"]), {"tasks", "upcoming_deadlines"})
+
+    def test_unknown_field_is_400(self):
+        resp = self.client.get("/api/stats/?fields=tasks,bogus")
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("bogus", resp.json()["error"])
@@ -0,0 +1,73 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks.models import Task, SubTask, Status, TaskStatsSnapshot
+from tasks.stats import compare_snapshot
+
+
+class TaskStatsSnapshotTest(TestCase):
+
+    def setUp(self):
+        self.todo = Status.objects.create(name="To Do")
+        self.done = Status.objects.create(name="Done")
+        self.deadline = timezone.now() + timedelta(days=1)
+
+    def snapshot(self):
+        return TaskStatsSnapshot.objects.get(pk=1)
+
+    def test_counters_follow_writes(self):
+        task = Task.objects.create(title="A", status=self.todo, deadline=self.deadline)
+        sub = SubTask.objects.create(title="S", description="x", status=self.todo, deadline=self.deadline, task=task)
+        snap = self.snapshot()
+        self.assertEqual(snap.tasks_total, 1)
+        self.assertEqual(snap.tasks_without_description, 1)
+        self.assertEqual(snap.tasks_by_status, {str(self.todo.id): 1})
+        self.assertEqual(snap.subtasks_without_description, 0)
+
+        task.status = self.done
+        task.description = "filled"
+        task.save()
+        sub.description = ""
+        sub.save()
+        snap = self.snapshot()
+        self.assertEqual(snap.tasks_by_status, {str(self.done.id): 1})
+        self.assertEqual(snap.tasks_without_description, 0)
+        self.assertEqual(snap.subtasks_without_description, 1)
+        self.assertEqual(compare_snapshot(), [])
+
+        # удаление задачи каскадно удаляет подзадачи — счётчики тоже
+        task.delete()
+        snap = self.snapshot()
+        self.assertEqual((snap.tasks_total, snap.subtasks_total), (0, 0))
+        self.assertEqual(compare_snapshot(), [])
+
+    def test_status_delete_cascades_into_counters(self):
+        task = Task.objects.create(title="A", status=self.todo, deadline=self.deadline)
+        SubTask.objects.create(title="S", status=self.done, deadline=self.deadline, task=task)
+        self.done.delete()
+        self.assertEqual(self.snapshot().subtasks_total, 0)
+        self.assertEqual(compare_snapshot(), [])
+
+    def test_unchanged_save_does_not_write_snapshot(self):
+        task = Task.objects.create(title="A", status=self.todo, deadline=self.deadline)
+        task = Task.objects.get(pk=task.pk)
+        task.title = "B"
+        # SELECT задачи не нужен, UPDATE задачи — единственный запрос
+        with self.assertNumQueries(1):
+            task.save()
+
+    def test_check_and_rebuild_command(self):
+        Task.objects.create(title="A", status=self.todo, deadline=self.deadline)
+        # bulk-операции обходят сигналы — снапшот расходится
+        Task.objects.filter(status=self.todo).update(status=self.done)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_task_stats", "--check", stdout=StringIO(), stderr=StringIO())
+
+        call_command("rebuild_task_stats", stdout=StringIO())
+        self.assertEqual(self.snapshot().tasks_by_status, {str(self.done.id): 1})
+        call_command("rebuild_task_stats", "--check", stdout=StringIO())
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.tests.utils import without_throttling
+from tasks import response_cache
+from tasks.models import Task, SubTask, Status
+from tasks.status_registry import StatusRegistry, status_registry
+
+
+@without_throttling
+class StatusRegistryTest(TestCase):
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.todo = Status.objects.create(name="To Do")
+        self.done = Status.objects.create(name="Done")
+        self.deadline = (timezone.now() + timedelta(days=2)).isoformat()
+
+    def test_lookups_hit_database_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(status_registry.get(self.done.id), self.done)
+            self.assertEqual(status_registry.id_for_name("To Do"), self.todo.id)
+            self.assertEqual(status_registry.names(), ["To Do", "Done"])
+            self.assertEqual(status_registry.default_status(), self.todo)
+
+    def test_write_signals_invalidate_local_registry(self):
+        status_registry.names_by_id()
+        self.done.name = "Готово"
+        self.done.save()
+        self.assertEqual(status_registry.get(self.done.id).name, "Готово")
+        self.done.delete()
+        self.assertIsNone(status_registry.get_by_name("Готово"))
+
+    @override_settings(TASKS_STATUS_REGISTRY_CHECK_INTERVAL=0)
+    def test_other_workers_reload_after_version_bump(self):
+        other_worker = StatusRegistry()
+        self.assertEqual(other_worker.get(self.done.id).name, "Done")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.done.name = "Closed"
+            self.done.save()
+        self.assertEqual(other_worker.get(self.done.id).name, "Closed")
+
+    def test_unknown_id_is_reloaded_once_then_missing(self):
+        status_registry.names_by_id()
+        with self.assertNumQueries(1):
+            self.assertIsNone(status_registry.get(424242))
+
+    def test_create_uses_registry_for_status(self):
+        status_registry.names_by_id()
+        # только INSERT задачи, запись в журнал дедлайнов и обновление снапшота статистики (+ savepoint-ы)
+        with self.assertNumQueries(6):
+            resp = self.client.post(
+                "/api/tasks/", {"title": "T", "deadline": self.deadline}, content_type="application/json"
+            )
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.json()["status"], {"id": self.todo.id, "name": "To Do"})
+
+        task_id = resp.json()["id"]
+        resp = self.client.post(
+            "/api/subtasks/",
+            {"title": "S", "deadline": self.deadline, "task_id": task_id, "status_id": self.done.id},
+            content_type="application/json",
+        )
+        self.assertEqual(resp.json()["status"]["name"], "Done")
+
+        resp = self.client.post(
+            "/api/tasks/", {"title": "T", "deadline": self.deadline, "status_id": 424242},
+            content_type="application/json",
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("status_id", resp.json())
+
+    def test_status_name_filters(self):
+        task = Task.objects.create(title="A", status=self.todo, deadline=timezone.now())
+        Task.objects.create(title="B", status=self.done, deadline=timezone.now())
+        SubTask.objects.create(title="S", status=self.done, deadline=timezone.now(), task=task)
+
+        resp = self.client.get("/api/tasks/", {"status__name": "To Do"})
+        self.assertEqual([row["title"] for row in resp.json()["results"]], ["A"])
+        resp = self.client.get("/api/subtasks/", {"status__name": "Done"})
+        self.assertEqual([row["title"] for row in resp.json()["results"]], ["S"])
+        resp = self.client.get("/api/tasks/", {"status__name": "Nope"})
+        self.assertEqual(resp.json()["results"], [])
@@ -0,0 +1,62 @@
+import json
+from datetime import timedelta
+
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from tasks import views
+from tasks.models import Task, Status
+from tasks.status_registry import status_registry
+
+
+class TaskListStreamingTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        todo = Status.objects.create(name="To Do")
+        done = Status.objects.create(name="Done")
+        now = timezone.now()
+        for i in range(7):
+            Task.objects.create(
+                title=f"Задача {i}", status=todo if i % 2 else done,
+                deadline=now + timedelta(days=i - 3),
+            )
+
+    def get(self, query):
+        return views.api_task_list(self.factory.get("/", query))
+
+    def test_stream_matches_regular_response(self):
+        for query in ({}, {"status": "Done"}, {"overdue": "true"}, {"status": "To Do", "overdue": "true"}):
+            regular = json.loads(self.get(query).content)
+            resp = self.get({**query, "stream": "1"})
+            self.assertIsInstance(resp, StreamingHttpResponse)
+            self.assertEqual(resp["Content-Type"], "application/json")
+            streamed = json.loads(b"".join(resp.streaming_content))
+            # is_overdue считается от разных "now" — сверяем всё остальное
+            self.assertEqual(streamed["count"], regular["count"])
+            self.assertEqual(streamed["filters"], regular["filters"])
+            self.assertEqual(
+                [{k: v for k, v in t.items() if k != "is_overdue"} for t in streamed["tasks"]],
+                [{k: v for k, v in t.items() if k != "is_overdue"} for t in regular["tasks"]],
+            )
+
+    def test_stream_chunks_and_empty_result(self):
+        chunks = list(views._stream_task_list(
+            Task.objects.order_by("id").values("id", "title", "description", "status_id", "deadline"),
+            timezone.now(), {"status": None, "overdue": None}, status_registry.names_by_id(), chunk_size=3,
+        ))
+        data = json.loads("".join(chunks))
+        self.assertEqual(data["count"], 7)
+        self.assertEqual(len(chunks), 5)  # начало, 3 куска по ≤3 задачи, хвост
+
+        empty = json.loads(b"".join(self.get({"status": "Nope", "stream": "1"}).streaming_content))
+        self.assertEqual(empty, {"tasks": [], "count": 0, "filters": {"status": "Nope", "overdue": None}})
+
+    def test_single_query(self):
+        status_registry.names_by_id()  # имена статусов — из прогретого реестра
+        with self.assertNumQueries(1):
+            self.get({})
+        resp = self.get({"stream": "1"})
+        with self.assertNumQueries(1):
+            b"".join(resp.streaming_content)
@@ -0,0 +1,161 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks import response_cache
+from tasks.bulk import bulk_create_objects
+from tasks.models import Task, Status
+from tasks.status_registry import status_registry
+from tasks.timeline import MAX_BUCKETS, bucket_count, bucket_starts
+
+
+def at_noon(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time(12)))
+
+
+class TaskTimelineTest(TestCase):
+
+    def setUp(self):
+        response_cache.get_cache().clear()
+        self.todo = Status.objects.create(name="To Do")
+        self.done = Status.objects.create(name="Done")
+        self.today = timezone.localdate()
+
+    def add_task(self, day, status=None):
+        return Task.objects.create(title=f"Task {day}", status=status or self.todo, deadline=at_noon(day))
+
+    def timeline(self, date_from, date_to, bucket="day"):
+        resp = self.client.get("/api/tasks/timeline/", {
+            "from": date_from.isoformat(), "to": date_to.isoformat(), "bucket": bucket,
+        })
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def test_day_buckets_count_by_status_and_overdue(self):
+        day = datetime.timedelta(days=1)
+        self.add_task(self.today - 2 * day)
+        self.add_task(self.today - 2 * day, self.done)
+        self.add_task(self.today + day)
+
+        data = self.timeline(self.today - 3 * day, self.today + day)
+        self.assertEqual(data["bucket"], "day")
+        self.assertEqual(len(data["timeline"]), 5)
+        first, past, _, _, future = data["timeline"]
+        self.assertEqual((first["total"], first["by_status"], first["closed"]), (0, {}, True))
+        self.assertEqual(past["start"], (self.today - 2 * day).isoformat())
+        self.assertEqual(past["by_status"], {"To Do": 1, "Done": 1})
+        self.assertEqual((past["total"], past["overdue"]), (2, 2))
+        self.assertEqual((future["total"], future["overdue"], future["closed"]), (1, 0, False))
+
+    def test_week_and_month_buckets_are_aligned(self):
+        self.add_task(self.today)
+        week = self.timeline(self.today, self.today, "week")
+        monday = self.today - datetime.timedelta(days=self.today.weekday())
+        self.assertEqual(week["from"], monday.isoformat())
+        self.assertEqual(week["to"], (monday + datetime.timedelta(days=6)).isoformat())
+        self.assertEqual(week["timeline"][0]["total"], 1)
+
+        month = self.timeline(datetime.date(2026, 1, 15), datetime.date(2026, 3, 2), "month")
+        self.assertEqual(
+            [(item["start"], item["end"]) for item in month["timeline"]],
+            [("2026-01-01", "2026-01-31"), ("2026-02-01", "2026-02-28"), ("2026-03-01", "2026-03-31")],
+        )
+
+    def test_closed_buckets_are_served_from_cache(self):
+        date_from, date_to = self.today - datetime.timedelta(days=10), self.today - datetime.timedelta(days=3)
+        self.add_task(self.today - datetime.timedelta(days=5))
+        status_registry.names_by_id()
+
+        first = self.timeline(date_from, date_to)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.timeline(date_from, date_to), first)
+        # смешанный диапазон: живым запросом считается только открытая часть
+        self.timeline(date_from, self.today + datetime.timedelta(days=3))
+        with self.assertNumQueries(1):
+            self.timeline(date_from, self.today + datetime.timedelta(days=3))
+
+    def test_past_deadline_write_invalidates_closed_buckets(self):
+        date_from, date_to = self.today - datetime.timedelta(days=10), self.today - datetime.timedelta(days=3)
+        status_registry.names_by_id()
+        self.assertEqual(sum(item["total"] for item in self.timeline(date_from, date_to)["timeline"]), 0)
+
+        task = self.add_task(self.today - datetime.timedelta(days=4))
+        self.assertEqual(sum(item["total"] for item in self.timeline(date_from, date_to)["timeline"]), 1)
+
+        # перенос в будущее тоже убирает задачу из закрытого интервала
+        task.deadline = at_noon(self.today + datetime.timedelta(days=4))
+        task.save()
+        self.assertEqual(sum(item["total"] for item in self.timeline(date_from, date_to)["timeline"]), 0)
+
+    def test_string_and_naive_deadlines_invalidate_closed_buckets(self):
+        date_from, date_to = self.today - datetime.timedelta(days=10), self.today - datetime.timedelta(days=3)
+        self.timeline(date_from, date_to)
+
+        past = (self.today - datetime.timedelta(days=5)).isoformat()
+        task = Task.objects.create(title="Str", status=self.todo, deadline=f"{past}T12:00:00")
+        self.assertEqual(sum(item["total"] for item in self.timeline(date_from, date_to)["timeline"]), 1)
+
+        # исходное значение тоже может быть строкой, а не значением из БД
+        moved = Task(pk=task.pk, title="Str", status=self.todo, deadline=f"{past}T12:00:00")
+        moved.deadline = datetime.datetime.combine(self.today + datetime.timedelta(days=4), datetime.time(12))
+        moved.save()
+        self.assertEqual(sum(item["total"] for item in self.timeline(date_from, date_to)["timeline"]), 0)
+
+    def test_future_deadline_write_keeps_closed_buckets_cached(self):
+        date_from, date_to = self.today - datetime.timedelta(days=10), self.today - datetime.timedelta(days=3)
+        status_registry.names_by_id()
+        self.timeline(date_from, date_to)
+
+        task = self.add_task(self.today + datetime.timedelta(days=2))
+        task.title = "Renamed"
+        task.save()
+        with self.assertNumQueries(0):
+            self.timeline(date_from, date_to)
+
+    def test_bulk_create_with_past_deadline_invalidates(self):
+        date_from, date_to = self.today - datetime.timedelta(days=10), self.today - datetime.timedelta(days=3)
+        self.timeline(date_from, date_to)
+        # bulk_create не шлёт сигналов — поколение сбрасывает сам bulk_create_objects (импорт, фикстуры)
+        bulk_create_objects(Task, [
+            Task(title="Bulk", status=self.todo, deadline=at_noon(self.today - datetime.timedelta(days=6))),
+        ])
+        self.assertEqual(sum(item["total"] for item in self.timeline(date_from, date_to)["timeline"]), 1)
+
+    def test_invalid_params(self):
+        for params in (
+            {"bucket": "year"},
+            {"from": "2026-13-01"},
+            {"from": "2026-03-01", "to": "2026-01-01"},
+            {"from": "2020-01-01", "to": "2026-01-01", "bucket": "day"},
+            {"from": "0001-01-01", "to": "9998-12-31"},
+            {"from": "9999-12-31", "to": "9999-12-31"},
+            {"from": "9999-12-01", "to": "9999-12-01", "bucket": "month"},
+        ):
+            resp = self.client.get("/api/tasks/timeline/", params)
+            self.assertEqual(resp.status_code, 400, params)
+            self.assertIn("error", resp.json())
+
+    def test_defaults_cover_a_window_around_today(self):
+        resp = self.client.get("/api/tasks/timeline/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.json()["timeline"]), 61)
+
+    def test_extreme_dates(self):
+        resp = self.client.get("/api/tasks/timeline/", {"from": "9999-12-25", "to": "9999-12-30"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["timeline"][-1]["end"], "9999-12-30")
+        resp = self.client.get("/api/tasks/timeline/", {"from": "0001-01-01", "to": "0001-02-01", "bucket": "week"})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_bucket_count_matches_bucket_starts(self):
+        date_from = datetime.date(2025, 12, 17)
+        for bucket in ("day", "week", "month"):
+            for days in (0, 1, 6, 7, 30, 45, 400):
+                date_to = date_from + datetime.timedelta(days=days)
+                self.assertEqual(
+                    bucket_count(date_from, date_to, bucket), len(bucket_starts(date_from, date_to, bucket)),
+                    (bucket, days),
+                )
+        # огромный диапазон не строит список интервалов
+        self.assertGreater(bucket_count(datetime.date.min, datetime.date(9998, 12, 31), "day"), MAX_BUCKETS)
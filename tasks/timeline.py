@@ -0,0 +1,160 @@
+# tasks/timeline.py
+"""
+Таймлайн дедлайнов для календаря: /api/tasks/timeline/?from=&to=&bucket=day|week|month.
+
+Агрегация — в БД: Trunc по индексированному deadline + GROUP BY (интервал, статус).
+Закрытые интервалы (целиком в прошлом) уже не меняются со временем: все их задачи
+просрочены, и поменять их может только запись, которая затрагивает дедлайн в прошлом.
+Поэтому они кэшируются поинтервально под поколением PAST_TASK_DEADLINES
+(tasks/response_cache.py), а живым запросом считается только открытая часть диапазона.
+"""
+import datetime
+
+from django.conf import settings
+from django.db.models import Count, DateField, Q
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from . import response_cache
+from .models import Task
+from .status_registry import status_registry
+
+BUCKETS = ("day", "week", "month")
+MAX_BUCKETS = 400
+DEFAULT_RANGE_DAYS = 30
+
+TIMELINE_KEY = "tasks:timeline:{bucket}:{start}:{generation}"
+
+
+def bucket_start(day, bucket):
+    if bucket == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start, bucket):
+    if bucket == "week":
+        return start + datetime.timedelta(days=7)
+    if bucket == "month":
+        return (start.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    return start + datetime.timedelta(days=1)
+
+
+def bucket_starts(date_from, date_to, bucket):
+    """Начала интервалов, покрывающих [date_from, date_to] (границы выравниваются по интервалу)."""
+    starts = []
+    current = bucket_start(date_from, bucket)
+    while current <= date_to:
+        starts.append(current)
+        current = next_bucket(current, bucket)
+    return starts
+
+
+def bucket_count(date_from, date_to, bucket):
+    """Число интервалов bucket_starts(date_from, date_to, bucket) — арифметикой, без построения списка."""
+    first, last = bucket_start(date_from, bucket), bucket_start(date_to, bucket)
+    if bucket == "month":
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    return (last - first).days // (7 if bucket == "week" else 1) + 1
+
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def aggregate(start, end, bucket, now):
+    """
+    {начало интервала: {"by_status": {status_id: n}, "overdue": n}} для дедлайнов в [start, end) —
+    один GROUP BY по (интервал, статус).
+    """
+    rows = (
+        Task.objects
+        .filter(deadline__gte=_local_midnight(start), deadline__lt=_local_midnight(end))
+        .annotate(bucket=Trunc("deadline", bucket, output_field=DateField()))
+        .values("bucket", "status_id")
+        .annotate(count=Count("id"), overdue=Count("id", filter=Q(deadline__lt=now)))
+        .order_by()
+    )
+    result = {}
+    for row in rows:
+        item = result.setdefault(row["bucket"], {"by_status": {}, "overdue": 0})
+        item["by_status"][row["status_id"]] = row["count"]
+        item["overdue"] += row["overdue"]
+    return result
+
+
+def parse_params(params, today):
+    """
+    (date_from, date_to, bucket) из ?from=&to=&bucket= или ValueError с текстом ошибки.
+    По умолчанию — DEFAULT_RANGE_DAYS дней назад и вперёд от сегодня, bucket=day.
+    """
+    bucket = params.get("bucket") or "day"
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket: {bucket}. Allowed: {', '.join(BUCKETS)}")
+    try:
+        date_from = datetime.date.fromisoformat(params["from"]) if params.get("from") else (
+            today - datetime.timedelta(days=DEFAULT_RANGE_DAYS))
+        date_to = datetime.date.fromisoformat(params["to"]) if params.get("to") else (
+            today + datetime.timedelta(days=DEFAULT_RANGE_DAYS))
+    except ValueError:
+        raise ValueError("from/to must be dates in YYYY-MM-DD format")
+    if date_from > date_to:
+        raise ValueError("from must not be later than to")
+    try:
+        # границы запроса к БД — полночь начала первого и конца последнего интервала
+        for day in (bucket_start(date_from, bucket), next_bucket(bucket_start(date_to, bucket), bucket)):
+            _local_midnight(day).astimezone(datetime.timezone.utc)
+    except OverflowError:
+        raise ValueError("from/to are out of the supported date range")
+    if bucket_count(date_from, date_to, bucket) > MAX_BUCKETS:
+        raise ValueError(f"Too many buckets: at most {MAX_BUCKETS} per request")
+    return date_from, date_to, bucket
+
+
+def collect_timeline(date_from, date_to, bucket, now=None):
+    """Список интервалов [{start, end, closed, total, overdue, by_status}] по порядку."""
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    starts = bucket_starts(date_from, date_to, bucket)
+    closed = [start for start in starts if next_bucket(start, bucket) <= today]
+    open_starts = starts[len(closed):]
+
+    data = {}
+    if closed:
+        generation = response_cache.generations([response_cache.PAST_TASK_DEADLINES])[0]
+        keys = {
+            TIMELINE_KEY.format(bucket=bucket, start=start.isoformat(), generation=generation): start
+            for start in closed
+        }
+        cached = response_cache.lookup_many("timeline", list(keys))
+        data.update({keys[key]: value for key, value in cached.items()})
+        missing = [start for start in closed if start not in data]
+        if missing:
+            # одним запросом от первого до последнего недостающего интервала
+            fresh = aggregate(missing[0], next_bucket(missing[-1], bucket), bucket, now)
+            values = {}
+            for start in missing:
+                data[start] = fresh.get(start, {"by_status": {}, "overdue": 0})
+                values[TIMELINE_KEY.format(bucket=bucket, start=start.isoformat(), generation=generation)] = data[start]
+            response_cache.store_many(values, timeout=getattr(settings, "TASKS_TIMELINE_CACHE_TIMEOUT", 86400))
+    if open_starts:
+        data.update(aggregate(open_starts[0], next_bucket(open_starts[-1], bucket), bucket, now))
+
+    status_names = status_registry.names_by_id()
+    timeline = []
+    for index, start in enumerate(starts):
+        item = data.get(start, {"by_status": {}, "overdue": 0})
+        timeline.append({
+            "start": start.isoformat(),
+            "end": (next_bucket(start, bucket) - datetime.timedelta(days=1)).isoformat(),
+            "closed": index < len(closed),
+            "total": sum(item["by_status"].values()),
+            "overdue": item["overdue"],
+            "by_status": {
+                status_names.get(status_id, str(status_id)): count
+                for status_id, count in item["by_status"].items()
+            },
+        })
+    return timeline
@@ -1,7 +1,10 @@
 from django.urls import path
-from .views_tasks import TaskListCreateView, TaskDetailUpdateDeleteView
-from .views_subtasks import SubTaskListCreateView, SubTaskDetailUpdateDeleteView
+from .views_tasks import TaskListCreateView, TaskDetailUpdateDeleteView, TaskBulkCreateView, TaskAutocompleteView, TaskTimelineView, TaskExportView
+from .views_subtasks import SubTaskListCreateView, SubTaskDetailUpdateDeleteView, SubTaskBulkView
 from . import views
+from .views_async import (
+    AsyncSubTaskDetailView, AsyncSubTaskListView, AsyncTaskDetailView, AsyncTaskListView, api_task_stats_async,
+)
 
 urlpatterns = [
     # HTML для списка задач (оставляем для удобства)
@@ -9,12 +12,25 @@ urlpatterns = [
 
     # --- Tasks (Generic Views) ---
     path("api/tasks/", TaskListCreateView.as_view(), name="task-list-create"),
+    path("api/tasks/bulk/", TaskBulkCreateView.as_view(), name="task-bulk-create"),
+    path("api/tasks/autocomplete/", TaskAutocompleteView.as_view(), name="task-autocomplete"),
+    path("api/tasks/timeline/", TaskTimelineView.as_view(), name="task-timeline"),
     path("api/tasks/<int:pk>/", TaskDetailUpdateDeleteView.as_view(), name="task-detail-update-delete"),
 
     # --- SubTasks (Generic Views) ---
     path("api/subtasks/", SubTaskListCreateView.as_view(), name="subtask-list-create"),
+    path("api/subtasks/bulk/", SubTaskBulkView.as_view(), name="subtask-bulk"),
     path("api/subtasks/<int:pk>/", SubTaskDetailUpdateDeleteView.as_view(), name="subtask-detail-update-delete"),
 
     # --- Stats (оставляем FBV как в задании) ---
     path("api/stats/", views.api_task_stats, name="api_task_stats"),
+    path("api/cache/stats/", views.api_cache_stats, name="api_cache_stats"),
+    path("api/export/", TaskExportView.as_view(), name="api_export"),
+
+    # --- Async read API (под ASGI не занимает поток на время запросов к БД) ---
+    path("api/async/tasks/", AsyncTaskListView.as_view(), name="async-task-list"),
+    path("api/async/tasks/<int:pk>/", AsyncTaskDetailView.as_view(), name="async-task-detail"),
+    path("api/async/subtasks/", AsyncSubTaskListView.as_view(), name="async-subtask-list"),
+    path("api/async/subtasks/<int:pk>/", AsyncSubTaskDetailView.as_view(), name="async-subtask-detail"),
+    path("api/async/stats/", api_task_stats_async, name="async-task-stats"),
 ]
@@ -1,5 +1,6 @@
+from django.conf import settings
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
@@ -7,9 +8,15 @@ import json
 import datetime
 from .models import Task, Status, SubTask  # <— SubTask нужен
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q
 from .serializers import (TaskCreateSerializer, SubTaskCreateSerializer, SubTaskDetailSerializer,
                           TaskDetailSerializer,)
+from .querysets import subtask_detail_queryset, task_detail_queryset
+from .status_registry import status_registry
+from .stats import STATS_SECTIONS, collect_stats, parse_sections
+from . import response_cache
+
+# От этих моделей зависит ответ /api/stats/
+STATS_CACHE_MODELS = (Task, SubTask, Status)
 
 
 def task_list_html(request):
@@ -106,7 +113,7 @@ def api_task_detail(request, task_id):
     """
     Детали задачи: используем TaskDetailSerializer (задание 3).
     """
-    task = get_object_or_404(Task, id=task_id)
+    task = get_object_or_404(task_detail_queryset(), id=task_id)
     serializer = TaskDetailSerializer(task)
     return JsonResponse(serializer.data, json_dumps_params={'ensure_ascii': False})
 
@@ -130,7 +137,7 @@ def api_task_detail(request, task_id):
 @require_http_methods(["GET"])
 def api_task_detail(request, task_id):
     """API для получения деталей конкретной задачи по ID"""
-    task = get_object_or_404(Task, id=task_id)
+    task = get_object_or_404(task_detail_queryset(), id=task_id)
     serializer = TaskDetailSerializer(task)
     return JsonResponse(serializer.data, json_dumps_params={'ensure_ascii': False})
     # task_data = {
@@ -155,102 +162,122 @@ def api_task_detail(request, task_id):
     # return JsonResponse(task_data, json_dumps_params={'ensure_ascii': False})
 
 
+# Сколько строк читать из БД за раз и отдавать клиенту одним куском в режиме ?stream=1
+TASK_LIST_STREAM_CHUNK_SIZE = 2000
+
+
+def _task_list_item(row, now, status_names):
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'description': row['description'],
+        'status': status_names.get(row['status_id']),
+        'deadline': row['deadline'].isoformat() if row['deadline'] else None,
+        'is_overdue': row['deadline'] < now if row['deadline'] else False
+    }
+
+
+def _stream_task_list(tasks, now, filters, status_names, chunk_size=TASK_LIST_STREAM_CHUNK_SIZE):
+    """
+    Пишет тот же JSON, что и обычный режим, но по кускам: память не зависит от размера таблицы.
+    Разделители совпадают с JsonResponse (json.dumps по умолчанию).
+    """
+    yield '{"tasks": ['
+    count = 0
+    buffer = []
+    for row in tasks.iterator(chunk_size=chunk_size):
+        buffer.append(json.dumps(_task_list_item(row, now, status_names), ensure_ascii=False))
+        count += 1
+        if len(buffer) >= chunk_size:
+            yield ('' if count == len(buffer) else ', ') + ', '.join(buffer)
+            buffer = []
+    if buffer:
+        yield ('' if count == len(buffer) else ', ') + ', '.join(buffer)
+    yield '], "count": %d, "filters": %s}' % (count, json.dumps(filters, ensure_ascii=False))
+
+
 @require_http_methods(["GET"])
 def api_task_list(request):
-    """API для получения списка задач с возможностью фильтрации"""
+    """
+    API для получения списка задач с возможностью фильтрации.
+    ?stream=1 — потоковая выдача (StreamingHttpResponse + iterator) для больших выгрузок.
+    """
+    now = timezone.now()
     tasks = Task.objects.all().order_by('-deadline')
 
-    # Фильтрация по статусу (если передан параметр status)
+    # Фильтрация по статусу (если передан параметр status): имя → id через реестр, без JOIN
     status_filter = request.GET.get('status')
     if status_filter:
-        tasks = tasks.filter(status__name=status_filter)
+        status_id = status_registry.id_for_name(status_filter)
+        tasks = tasks.filter(status_id=status_id) if status_id is not None else tasks.none()
 
     # Фильтрация по просроченным задачам
     overdue = request.GET.get('overdue')
     if overdue and overdue.lower() == 'true':
-        tasks = tasks.filter(deadline__lt=timezone.now())
-
-    tasks_data = []
-    for task in tasks:
-        tasks_data.append({
-            'id': task.id,
-            'title': task.title,
-            'description': task.description,
-            'status': task.status.name,
-            'deadline': task.deadline.isoformat() if task.deadline else None,
-            'is_overdue': task.deadline < timezone.now() if task.deadline else False
-        })
+        tasks = tasks.filter(deadline__lt=now)
+
+    # Имя статуса берём из реестра статусов, а не JOIN-ом или запросом на каждую задачу
+    tasks = tasks.values('id', 'title', 'description', 'status_id', 'deadline')
+    status_names = status_registry.names_by_id()
+    filters = {
+        'status': status_filter,
+        'overdue': overdue
+    }
+
+    if request.GET.get('stream') in ('1', 'true'):
+        return StreamingHttpResponse(
+            _stream_task_list(tasks, now, filters, status_names),
+            content_type='application/json',
+        )
+
+    tasks_data = [_task_list_item(row, now, status_names) for row in tasks]
 
     return JsonResponse({
         'tasks': tasks_data,
         'count': len(tasks_data),
-        'filters': {
-            'status': status_filter,
-            'overdue': overdue
-        }
+        'filters': filters
     }, json_dumps_params={'ensure_ascii': False})
 
 
 @require_http_methods(["GET"])
 def api_task_stats(request):
-    """API для получения расширенной статистики по задачам"""
-    # Базовые метрики
-    total_tasks = Task.objects.count()
-    total_subtasks = SubTask.objects.count()
-
-    # Статистика по статусам задач
-    tasks_by_status = Task.objects.values('status__name').annotate(count=Count('id'))
-    status_stats = {item['status__name']: item['count'] for item in tasks_by_status}
-
-    # Статистика по статусам подзадач
-    subtasks_by_status = SubTask.objects.values('status__name').annotate(count=Count('id'))
-    subtask_status_stats = {item['status__name']: item['count'] for item in subtasks_by_status}
-
-    # Просроченные задачи
-    overdue_tasks = Task.objects.filter(deadline__lt=timezone.now()).count()
-    overdue_subtasks = SubTask.objects.filter(deadline__lt=timezone.now()).count()
-
-    # Задачи без описания
-    tasks_without_description = Task.objects.filter(description='').count()
-    subtasks_without_description = SubTask.objects.filter(description='').count()
-
-    # Ближайшие дедлайны (3 ближайшие задачи)
-    upcoming_tasks = Task.objects.filter(deadline__gte=timezone.now()).order_by('deadline')[:3]
-    upcoming_tasks_data = [
-        {
-            'id': task.id,
-            'title': task.title,
-            'deadline': task.deadline.isoformat(),
-            'days_until': (task.deadline - timezone.now()).days
+    """
+    API для получения расширенной статистики по задачам.
+    Счётчики читаются из TaskStatsSnapshot (одна строка, просроченные — подзапросом по индексу)
+    + запрос ближайших дедлайнов. ?fields=tasks,subtasks,upcoming_deadlines — только нужные секции.
+    """
+    sections, unknown = parse_sections(request.GET.get('fields'))
+    if unknown:
+        return JsonResponse({
+            'error': f"Unknown fields: {', '.join(unknown)}",
+            'allowed': list(STATS_SECTIONS),
+        }, status=400, json_dumps_params={'ensure_ascii': False})
+
+    # Ответ кэшируется до записи в Task/SubTask/Status, но не дольше TASKS_STATS_CACHE_TIMEOUT:
+    # просроченные и days_until зависят от текущего времени (timestamp — время расчёта)
+    key = response_cache.make_key('stats', request, STATS_CACHE_MODELS)
+    payload = response_cache.lookup('stats', key)
+    cache_status = 'HIT'
+    if payload is None:
+        payload = {
+            'stats': collect_stats(sections),
+            'timestamp': timezone.now().isoformat(),
+            'success': True
         }
-        for task in upcoming_tasks
-    ]
+        response_cache.store(key, payload, timeout=getattr(settings, 'TASKS_STATS_CACHE_TIMEOUT', 30))
+        cache_status = 'MISS'
 
-    # Заполняем нулевые значения для всех статусов
-    all_statuses = ['To Do', 'In Progress', 'Done']
-    for status in all_statuses:
-        if status not in status_stats:
-            status_stats[status] = 0
-        if status not in subtask_status_stats:
-            subtask_status_stats[status] = 0
+    response = JsonResponse(payload, json_dumps_params={'ensure_ascii': False})
+    response['X-Cache'] = cache_status
+    return response
 
+
+@require_http_methods(["GET"])
+def api_cache_stats(request):
+    """Попадания/промахи кэша ответов в этом процессе (по эндпоинтам)."""
     return JsonResponse({
-        'stats': {
-            'tasks': {
-                'total': total_tasks,
-                'by_status': status_stats,
-                'overdue': overdue_tasks,
-                'without_description': tasks_without_description,
-            },
-            'subtasks': {
-                'total': total_subtasks,
-                'by_status': subtask_status_stats,
-                'overdue': overdue_subtasks,
-                'without_description': subtasks_without_description,
-            },
-            'upcoming_deadlines': upcoming_tasks_data,
-        },
-        'timestamp': timezone.now().isoformat(),
+        'cache': response_cache.counters(),
+        'backend': getattr(settings, 'TASKS_RESPONSE_CACHE', 'default'),
         'success': True
     }, json_dumps_params={'ensure_ascii': False})
 
@@ -302,7 +329,7 @@ def api_create_subtask(request):
 @require_http_methods(["GET"])
 def api_subtask_detail(request, subtask_id):
     """API для получения деталей подзадачи по ID"""
-    subtask = get_object_or_404(SubTask, id=subtask_id)
+    subtask = get_object_or_404(subtask_detail_queryset(), id=subtask_id)
     serializer = SubTaskDetailSerializer(subtask)
     return JsonResponse(serializer.data, json_dumps_params={'ensure_ascii': False})
 
@@ -310,8 +337,9 @@ def api_subtask_detail(request, subtask_id):
 @require_http_methods(["GET"])
 def api_task_subtasks(request, task_id):
     """API для получения всех подзадач конкретной задачи"""
-    task = get_object_or_404(Task, id=task_id)
-    subtasks = task.subtasks.all()
+    task = get_object_or_404(Task.objects.select_related("status"), id=task_id)
+    # subtask.task берётся из уже загруженной task (related manager), статусы — JOIN-ом
+    subtasks = task.subtasks.select_related("status")
 
     serializer = SubTaskDetailSerializer(subtasks, many=True)
     return JsonResponse({'subtasks': serializer.data, 'task_id': task_id},
@@ -0,0 +1,210 @@
+# tasks/views_async.py
+"""
+Async-версии read-эндпоинтов для запуска под ASGI (uvicorn/daphne): пока запрос ждёт БД,
+он не держит поток из пула — ORM вызывается через async-API (aiterator, afirst, aget),
+кэш ответов и версия реестра статусов — через async-методы кэша (aget, aset).
+
+Формат ответов тот же, что у синхронных /api/tasks/, /api/subtasks/, /api/stats/
+(keyset-пагинация, кэш ответов, ETag деталок). Запись (POST/PATCH/DELETE)
+остаётся на синхронных DRF-вьюхах — под ASGI Django запускает их в пуле потоков.
+"""
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import HttpResponseNotAllowed, JsonResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from . import response_cache
+from .filters import FullTextSearchFilter, RankOrderingFilter, afts_available
+from .mixins import ConditionalRetrieveMixin, conditional_etag
+from .models import Status, SubTask, Task
+from .pagination import KeysetCursorPagination
+from .querysets import subtask_detail_queryset, task_detail_queryset
+from .serializers import SubTaskDetailSerializer, SubTaskLeanSerializer, TaskDetailSerializer, TaskLeanSerializer
+from .stats import STATS_SECTIONS, acollect_stats, parse_sections
+from .status_registry import status_registry
+from .views import STATS_CACHE_MODELS
+from .views_subtasks import SubTaskDetailUpdateDeleteView
+from .views_tasks import TaskDetailUpdateDeleteView
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params={'ensure_ascii': False})
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncLeanListView(View):
+    """
+    GET-список через .values() + lean-сериализатор, как LeanListMixin, но целиком async.
+    filter_fields — {параметр запроса: lookup}; ?status__name= разрешается реестром статусов;
+    ?search= (FTS5) и ?ordering= работают теми же фильтрами, что и в DRF-вьюхах.
+    """
+    model = None
+    lean_serializer_class = None
+    cache_name = None
+    cache_models = ()
+    filter_fields = {}
+    pagination_class = KeysetCursorPagination
+
+    # атрибуты, которые читают FullTextSearchFilter/RankOrderingFilter и пагинация
+    filter_backends = [RankOrderingFilter]
+    search_fields = ["title", "description"]
+    ordering_fields = ["created_at", "rank"]
+    ordering = ["created_at"]
+
+    async def get(self, request, *args, **kwargs):
+        key = await response_cache.amake_key(self.cache_name, request, self.cache_models)
+        data = await response_cache.alookup(self.cache_name, key)
+        cache_status = "HIT"
+        if data is None:
+            try:
+                data = await self.list(Request(request))
+            except NotFound as exc:
+                return _json({"detail": str(exc.detail)}, status=404)
+            except (ValidationError, ValueError, TypeError):
+                return _json({"detail": "Некорректное значение фильтра."}, status=400)
+            await response_cache.astore(key, data)
+            cache_status = "MISS"
+        response = _json(data)
+        response["X-Cache"] = cache_status
+        return response
+
+    async def filter_queryset(self, request, queryset):
+        params = request.query_params
+        for param, lookup in self.filter_fields.items():
+            if params.get(param):
+                queryset = queryset.filter(**{lookup: params[param]})
+        if params.get("status__name"):
+            status_id = await status_registry.aid_for_name(params["status__name"])
+            queryset = queryset.filter(status_id=status_id) if status_id is not None else queryset.none()
+        if params.get("search"):
+            await afts_available(self.model, queryset.db)  # дальше фильтр только строит запрос
+            queryset = FullTextSearchFilter().filter_queryset(request, queryset, self)
+        return queryset
+
+    async def list(self, request):
+        queryset = await self.filter_queryset(request, self.model.objects.all())
+        fields = self.lean_serializer_class.values_fields
+        if "rank" in queryset.query.annotations:
+            fields += ("rank",)  # релевантность ?search= — позиция keyset-курсора
+        paginator = self.pagination_class()
+        rows = await paginator.apaginate_queryset(queryset.values(*fields), request, view=self)
+        status_names = await status_registry.anames_by_id({row["status_id"] for row in rows})
+        lean = self.lean_serializer_class(status_names=status_names)
+        return {
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+            "results": [lean.to_representation(row) for row in rows],
+        }
+
+
+class AsyncTaskListView(AsyncLeanListView):
+    """GET /api/async/tasks/ — как GET /api/tasks/ (?status=, ?status__name=, ?deadline__gte/lte=, ?search=)."""
+    model = Task
+    lean_serializer_class = TaskLeanSerializer
+    cache_name = "tasks"
+    cache_models = (Task, Status)
+    filter_fields = {
+        "status": "status_id",
+        "deadline": "deadline",
+        "deadline__lte": "deadline__lte",
+        "deadline__gte": "deadline__gte",
+    }
+
+
+class AsyncSubTaskListView(AsyncLeanListView):
+    """GET /api/async/subtasks/ — как GET /api/subtasks/ (?status_id=, ?task_id=, ?status__name=, ?search=)."""
+    model = SubTask
+    lean_serializer_class = SubTaskLeanSerializer
+    cache_name = "subtasks"
+    cache_models = (SubTask, Status)
+    filter_fields = {"status_id": "status_id", "deadline": "deadline", "task_id": "task_id"}
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncDetailView(View):
+    """
+    GET деталки с ETag/Last-Modified, как ConditionalRetrieveMixin:
+    сначала afirst() за conditional_fields (304 без загрузки объекта), затем aget() с JOIN/prefetch.
+    conditional_fields берутся у синхронной вьюхи — ETag-и у них совпадают.
+    """
+    model = None
+    serializer_class = None
+    conditional_fields = ConditionalRetrieveMixin.conditional_fields
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    async def get(self, request, pk):
+        values = await self.model.objects.filter(pk=pk).values_list(*self.conditional_fields).afirst()
+        if values is None:
+            return self.not_found()
+        last_modified = max(values)
+        etag = conditional_etag(self.model, pk, last_modified)
+        response = get_conditional_response(request, etag=etag, last_modified=int(last_modified.timestamp()))
+        if response is None:
+            try:
+                instance = await self.get_queryset().aget(pk=pk)
+            except self.model.DoesNotExist:
+                return self.not_found()
+            response = _json(self.serializer_class(instance).data)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    def not_found(self):
+        return _json({"detail": f"No {self.model._meta.object_name} matches the given query."}, status=404)
+
+
+class AsyncTaskDetailView(AsyncDetailView):
+    """GET /api/async/tasks/{id}/ — задача с подзадачами (статусы JOIN-ом, подзадачи prefetch-ем)."""
+    model = Task
+    serializer_class = TaskDetailSerializer
+    conditional_fields = TaskDetailUpdateDeleteView.conditional_fields
+
+    def get_queryset(self):
+        return task_detail_queryset()
+
+
+class AsyncSubTaskDetailView(AsyncDetailView):
+    """GET /api/async/subtasks/{id}/"""
+    model = SubTask
+    serializer_class = SubTaskDetailSerializer
+    conditional_fields = SubTaskDetailUpdateDeleteView.conditional_fields  # + updated_at родительской задачи
+
+    def get_queryset(self):
+        return subtask_detail_queryset()
+
+
+async def api_task_stats_async(request):
+    """GET /api/async/stats/ — то же, что api_task_stats, через acollect_stats()."""
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET"])
+    sections, unknown = parse_sections(request.GET.get('fields'))
+    if unknown:
+        return _json({
+            'error': f"Unknown fields: {', '.join(unknown)}",
+            'allowed': list(STATS_SECTIONS),
+        }, status=400)
+
+    key = await response_cache.amake_key('stats', request, STATS_CACHE_MODELS)
+    payload = await response_cache.alookup('stats', key)
+    cache_status = 'HIT'
+    if payload is None:
+        payload = {
+            'stats': await acollect_stats(sections),
+            'timestamp': timezone.now().isoformat(),
+            'success': True
+        }
+        await response_cache.astore(key, payload, timeout=getattr(settings, 'TASKS_STATS_CACHE_TIMEOUT', 30))
+        cache_status = 'MISS'
+
+    response = _json(payload)
+    response['X-Cache'] = cache_status
+    return response
@@ -2,42 +2,95 @@
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 
-from rest_framework import generics, filters
+from rest_framework import generics, status
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import SubTask
+from .bulk import bulk_delete_subtasks, bulk_update_subtasks
+from .filters import FullTextSearchFilter, RankOrderingFilter, SubTaskFilter
+from .mixins import BulkCreateMixin, CachedListMixin, ConditionalRetrieveMixin, LeanListMixin
+from .models import Status, SubTask
+from .querysets import subtask_detail_queryset
 from .serializers import (
+    SubTaskBulkCreateSerializer,
+    SubTaskBulkDeleteSerializer,
+    SubTaskBulkUpdateSerializer,
     SubTaskCreateSerializer,
+    SubTaskLeanSerializer,
     SubTaskDetailSerializer,
 )
 
 
 @method_decorator(csrf_exempt, name="dispatch")
-class SubTaskListCreateView(generics.ListCreateAPIView):
+class SubTaskListCreateView(CachedListMixin, LeanListMixin, generics.ListCreateAPIView):
     """
     Список подзадач + создание новой подзадачи
     Поддерживает:
     - фильтрацию: ?status_id=2 или ?status__name=Done
-    - поиск: ?search=слово (ищет в title, description)
+    - поиск: ?search=слово (FTS5 по title, description; префиксы, сортировка по релевантности)
     - сортировку: ?ordering=created_at или ?ordering=-created_at
+    - пагинацию: ?cursor=<next/previous из ответа>&page_size=50 (keyset, без COUNT)
     """
     queryset = SubTask.objects.all().select_related("task", "status")
     serializer_class = SubTaskCreateSerializer
+    lean_serializer_class = SubTaskLeanSerializer  # GET-списки: .values() вместо ModelSerializer
+    cache_name = "subtasks"
+    cache_models = (SubTask, Status)  # GET кэшируется до записи в эти модели
     permission_classes = [AllowAny]
+    write_throttle_scope = "tasks_write"  # лимит только на POST/PATCH/DELETE
 
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ["status_id", "status__name", "deadline", "task_id"]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankOrderingFilter]
+    filterset_class = SubTaskFilter  # status_id, status__name (через реестр статусов), deadline, task_id
     search_fields = ["title", "description"]
-    ordering_fields = ["created_at"]
+    ordering_fields = ["created_at", "rank"]  # rank — релевантность при ?search=
     ordering = ["created_at"]
 
 
 @method_decorator(csrf_exempt, name="dispatch")
-class SubTaskDetailUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
+class SubTaskDetailUpdateDeleteView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Детали подзадачи + обновление + удаление
+    GET отдаёт ETag/Last-Modified и отвечает 304 на If-None-Match/If-Modified-Since.
     """
-    queryset = SubTask.objects.all().select_related("task", "status")
+    queryset = subtask_detail_queryset()
+    # в ответ вложена задача (TaskShallowSerializer) — её изменения тоже меняют ETag
+    conditional_fields = ("updated_at", "task__updated_at")
     serializer_class = SubTaskDetailSerializer
     permission_classes = [AllowAny]
+    write_throttle_scope = "tasks_write"
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class SubTaskBulkView(BulkCreateMixin, generics.GenericAPIView):
+    """
+    Массовые операции над подзадачами:
+    - POST   /api/subtasks/bulk/ — создание из массива объектов (формат как у POST /api/subtasks/),
+      валидные элементы вставляются одним bulk_create, ошибки возвращаются по индексам
+    - PATCH  /api/subtasks/bulk/ {"ids": [...], "fields": {"status_id": 2, "description": "..."}} — один UPDATE
+    - DELETE /api/subtasks/bulk/ {"ids": [...]} — один DELETE
+    """
+    queryset = SubTask.objects.all()
+    serializer_class = SubTaskBulkCreateSerializer
+    read_serializer_class = SubTaskCreateSerializer
+    permission_classes = [AllowAny]
+    write_throttle_scope = "tasks_write"
+
+    def get_serializer_class(self):
+        if self.request.method == "PATCH":
+            return SubTaskBulkUpdateSerializer
+        if self.request.method == "DELETE":
+            return SubTaskBulkDeleteSerializer
+        return super().get_serializer_class()
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = bulk_update_subtasks(serializer.validated_data["ids"], serializer.validated_data["fields"])
+        return Response({"updated": updated}, status=status.HTTP_200_OK)
+
+    def delete(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        deleted = bulk_delete_subtasks(serializer.validated_data["ids"])
+        return Response({"deleted": deleted}, status=status.HTTP_200_OK)
@@ -2,47 +2,172 @@
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 
-from rest_framework import generics, filters
-from rest_framework.permissions import AllowAny
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import generics, status
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import Task
+from .export import FORMATS, aiter_file, iter_file, spool_export
+from .filters import FullTextSearchFilter, RankOrderingFilter, TaskFilter
+from .mixins import BulkCreateMixin, CachedListMixin, ConditionalRetrieveMixin, LeanListMixin
+from .models import Status, Task
+from .querysets import subtasks_prefetch, task_detail_queryset, title_prefix_queryset
 from .serializers import (
+    TaskBulkCreateSerializer,
     TaskCreateSerializer,
+    TaskLeanSerializer,
     TaskDetailSerializer,
 )
+from .timeline import collect_timeline, parse_params
 
 
 @method_decorator(csrf_exempt, name="dispatch")
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(CachedListMixin, LeanListMixin, generics.ListCreateAPIView):
     """
     Список задач + создание новой задачи
     Поддерживает:
     - фильтрацию: ?status_id=1 или ?status__name=To Do
-    - поиск: ?search=слово (ищет в title, description)
+    - поиск: ?search=слово (FTS5 по title, description; префиксы, сортировка по релевантности)
     - сортировку: ?ordering=created_at или ?ordering=-created_at
+    - пагинацию: ?cursor=<next/previous из ответа>&page_size=50 (keyset, без COUNT)
     """
     queryset = Task.objects.all().select_related("status")
     serializer_class = TaskCreateSerializer
+    lean_serializer_class = TaskLeanSerializer  # GET-списки: .values() вместо ModelSerializer
+    cache_name = "tasks"
+    cache_models = (Task, Status)  # GET кэшируется до записи в эти модели
     permission_classes = [AllowAny]
+    write_throttle_scope = "tasks_write"  # лимит только на POST/PATCH/DELETE
 
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = {
-        "status": ["exact"],  # фильтр по id (например ?status=1)
-        "status__name": ["exact"],  # фильтр по имени (например ?status__name=To Do)
-        "deadline": ["exact", "lte", "gte"],
-    }
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, RankOrderingFilter]
+    filterset_class = TaskFilter  # ?status=1, ?status__name=To Do (через реестр статусов), ?deadline__gte=...
 
     search_fields = ["title", "description"]
-    ordering_fields = ["created_at"]
+    ordering_fields = ["created_at", "rank"]  # rank — релевантность при ?search=
     ordering = ["created_at"]
 
 
 @method_decorator(csrf_exempt, name="dispatch")
-class TaskDetailUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailUpdateDeleteView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Детали задачи + обновление + удаление
+    Подзадачи и их статусы подгружаются prefetch-ом: число запросов не зависит от их количества.
+    GET отдаёт ETag/Last-Modified и отвечает 304 на If-None-Match/If-Modified-Since.
     """
-    queryset = Task.objects.all().select_related("status")
+    queryset = task_detail_queryset()
     serializer_class = TaskDetailSerializer
     permission_classes = [AllowAny]
+    write_throttle_scope = "tasks_write"
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop("partial", False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        # DRF после сохранения сбрасывает prefetch-кэш, и подзадачи дочитывались бы N+1 —
+        # перечитываем их одним запросом
+        instance._prefetched_objects_cache = {}
+        prefetch_related_objects([instance], subtasks_prefetch())
+        return Response(serializer.data)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class TaskBulkCreateView(BulkCreateMixin, generics.GenericAPIView):
+    """
+    POST /api/tasks/bulk/ — массовое создание задач из массива объектов
+    (формат элемента как у POST /api/tasks/). Валидные элементы вставляются
+    одним bulk_create, ошибки возвращаются по индексам.
+    """
+    queryset = Task.objects.all()
+    serializer_class = TaskBulkCreateSerializer
+    read_serializer_class = TaskCreateSerializer
+    permission_classes = [AllowAny]
+    write_throttle_scope = "tasks_write"
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class TaskAutocompleteView(APIView):
+    """
+    GET /api/tasks/autocomplete/?q=док&limit=10 — type-ahead по началу названия задачи.
+    Отдаёт только id/title первых limit совпадений (по алфавиту); запрос — диапазон
+    по индексу title_folded (title.casefold()), без COUNT и без пагинации.
+    """
+    permission_classes = [AllowAny]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"results": []})
+        try:
+            limit = min(max(int(request.query_params.get("limit", self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+        rows = title_prefix_queryset(Task.objects.all(), query).values("id", "title")[:limit]
+        return Response({"results": list(rows)})
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class TaskTimelineView(APIView):
+    """
+    GET /api/tasks/timeline/?from=2026-10-01&to=2026-12-31&bucket=day|week|month —
+    число задач по интервалам дедлайнов (по статусам + просроченные) для календаря.
+    Границы диапазона выравниваются по интервалам; закрытые (прошедшие) интервалы берутся из кэша.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        now = timezone.now()
+        try:
+            date_from, date_to, bucket = parse_params(request.query_params, timezone.localdate(now))
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        items = collect_timeline(date_from, date_to, bucket, now)
+        return Response({
+            "bucket": bucket,
+            "from": items[0]["start"],
+            "to": items[-1]["end"],
+            "timeline": items,
+        })
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class TaskExportView(APIView):
+    """
+    GET /api/export/?format=ndjson|csv[&gzip=1] — все задачи с подзадачами из согласованного
+    снимка БД (tasks/export.py), файлом для скачивания. Выгрузка читает всю базу, поэтому
+    только для авторизованных и с лимитом "export"; снимок сначала пишется во временный файл —
+    транзакция не висит (и не блокирует запись в SQLite), пока клиент качает.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_scope = "export"
+
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= здесь — формат выгрузки, а не суффикс рендерера DRF
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.query_params.get("format", "ndjson")
+        if fmt not in FORMATS:
+            return Response(
+                {"error": f"Unknown format: {fmt}", "allowed": list(FORMATS)}, status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        compress = request.query_params.get("gzip") in ("1", "true")
+        filename = f"tasks-{timezone.now():%Y%m%d-%H%M%S}.{fmt}" + (".gz" if compress else "")
+        spool = spool_export(fmt, compress=compress)
+        # под ASGI синхронный итератор Django прочитал бы целиком в память — отдаём асинхронный
+        chunks = aiter_file(spool) if isinstance(request._request, ASGIRequest) else iter_file(spool)
+        response = StreamingHttpResponse(
+            chunks, content_type="application/gzip" if compress else f"{FORMATS[fmt]}; charset=utf-8",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
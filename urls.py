@@ -2,25 +2,23 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from django.http import HttpResponse
 
+from tasks.openapi import API_INFO, PrecomputedSchemaView
+
 schema_view = get_schema_view(
-    openapi.Info(
-        title="Task Manager API",
-        default_version="v1",
-        description="Документация для проекта Менеджер задач",
-    ),
+    API_INFO,
     public=True,
     permission_classes=[permissions.AllowAny],
 )
+schema_json_view = PrecomputedSchemaView.as_view(live_view=schema_view.without_ui(cache_timeout=0))
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("tasks.urls")),
 
     # Swagger / ReDoc
-    re_path(r"^swagger(?P<format>\.json|\.yaml)$", schema_view.without_ui(cache_timeout=0), name="schema-json"),
+    re_path(r"^swagger(?P<format>\.json|\.yaml)$", schema_json_view, name="schema-json"),
     path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
     path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
 ]
@@ -34,7 +32,7 @@ urlpatterns = [
 
     path("ping/", ping),   #  тестовый эндпоинт
 
-    re_path(r"^swagger(?P<format>\.json|\.yaml)$", schema_view.without_ui(cache_timeout=0), name="schema-json"),
+    re_path(r"^swagger(?P<format>\.json|\.yaml)$", schema_json_view, name="schema-json"),
     path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
     path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
 ]